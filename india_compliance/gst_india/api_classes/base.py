@@ -1,6 +1,11 @@
-from urllib.parse import urljoin
+import os
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+from urllib.parse import urljoin, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import frappe
 from frappe import _
@@ -12,6 +17,15 @@ from india_compliance.gst_india.utils.api import enqueue_integration_request
 
 BASE_URL = "https://asp.resilient.tech"
 
+# Defaults for pooled connections, can be overridden from site config
+POOL_SIZE = 10
+MAX_RETRIES = 2
+CONNECT_TIMEOUT = 15
+READ_TIMEOUT = 300
+
+_sessions = {}
+_sessions_lock = Lock()
+
 
 class BaseAPI:
     API_NAME = "GST"
@@ -128,7 +142,9 @@ class BaseAPI:
         try:
             self.before_request(request_args)
 
-            response = requests.request(method, **request_args)
+            response = get_session(request_args.url).request(
+                method, timeout=get_timeout(), **request_args
+            )
             if api_request_id := response.headers.get("x-amzn-RequestId"):
                 log.request_id = api_request_id
 
@@ -269,6 +285,62 @@ class BaseAPI:
                 log.data["body"][key] = "*****"
 
 
+def get_session(url):
+    """
+    Returns a pooled session for the base URL of `url`, shared in the current
+    process so that connections to the server are kept alive and reused.
+    """
+    url = urlsplit(url)
+    key = (os.getpid(), url.scheme, url.netloc)
+
+    if session := _sessions.get(key):
+        return session
+
+    with _sessions_lock:
+        if not (session := _sessions.get(key)):
+            session = _sessions[key] = create_session()
+
+    return session
+
+
+def create_session():
+    pool_size = frappe.conf.ic_api_pool_size or POOL_SIZE
+    max_retries = frappe.conf.ic_api_max_retries
+    if max_retries is None:
+        max_retries = MAX_RETRIES
+
+    # retry only when connection could not be established
+    # requests that may have reached the server are never retried
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.5,
+        ),
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # sessions are shared across users and companies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    return session
+
+
+def get_timeout():
+    return (
+        frappe.conf.ic_api_connect_timeout or CONNECT_TIMEOUT,
+        frappe.conf.ic_api_read_timeout or READ_TIMEOUT,
+    )
+
+
 def get_public_ip():
     return requests.get("https://api.ipify.org").text
 
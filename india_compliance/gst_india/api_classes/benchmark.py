@@ -0,0 +1,96 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import requests
+
+import frappe
+
+from india_compliance.gst_india.api_classes.base import get_session, get_timeout
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Responds like the GSP, with a delay for each new connection"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+        # emulate TCP + TLS handshake with a remote server
+        time.sleep(self.server.handshake_delay)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = json.dumps({"success": True, "result": {"Irn": "IRN"}}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer:
+    def __init__(self, handshake_delay=0.05):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.connections = 0
+        self.server.handshake_delay = handshake_delay
+
+        host, port = self.server.server_address
+        self.url = f"http://{host}:{port}/test/ic-api/einvoice/generate"
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    def __enter__(self):
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_benchmark(requests_count=100, handshake_delay=0.05):
+    """
+    Compare per-request latency of pooled sessions with a new connection per
+    request, for a bulk e-Invoice run against a local stand-in server.
+    Not a part of the test suite, as timings depend on the machine.
+
+    bench --site {site} execute
+    india_compliance.gst_india.api_classes.benchmark.run_benchmark
+    """
+
+    def get_latency(make_request):
+        with StandInServer(handshake_delay) as server:
+            start = time.perf_counter()
+            for _ in range(requests_count):
+                make_request(server.url).raise_for_status()
+
+            return frappe._dict(
+                latency_ms=(time.perf_counter() - start) * 1000 / requests_count,
+                connections=server.connections,
+            )
+
+    payload = {"Version": "1.1", "TranDtls": {"TaxSch": "GST"}}
+    unpooled = get_latency(
+        lambda url: requests.post(url, json=payload, timeout=get_timeout())
+    )
+    pooled = get_latency(
+        lambda url: get_session(url).post(url, json=payload, timeout=get_timeout())
+    )
+
+    return frappe._dict(
+        unpooled=unpooled,
+        pooled=pooled,
+        saved_per_request_ms=unpooled.latency_ms - pooled.latency_ms,
+    )
@@ -18,6 +18,8 @@ class EInvoiceAPI(BaseAPI):
         "2283": (
             "IRN details cannot be provided as it is generated more than 2 days ago"
         ),
+        # Get e-Invoice by document details errors
+        "2148": "Requested IRN data is not available",
         # Cancel IRN errors
         "9999": "Invoice is not active",
         "4002": "EwayBill is already generated for this IRN",
@@ -70,6 +72,12 @@ class EInvoiceAPI(BaseAPI):
     def get_e_invoice_by_irn(self, irn):
         return self.get(endpoint="invoice/irn", params={"irn": irn})
 
+    def get_e_invoice_by_doc_details(self, doc_type, doc_number, doc_date):
+        return self.get(
+            endpoint="invoice/irnbydocdetails",
+            params={"doctype": doc_type, "docnum": doc_number, "docdate": doc_date},
+        )
+
     def get_e_waybill_by_irn(self, irn):
         return self.get(endpoint="ewaybill/irn", params={"irn": irn})
 
@@ -6,7 +6,7 @@ from cryptography.hazmat.backends import default_backend
 
 import frappe
 from frappe import _
-from frappe.utils import add_to_date, cint, now_datetime
+from frappe.utils import add_to_date, cint, get_datetime, now_datetime
 
 from india_compliance.gst_india.api_classes.base import BaseAPI, get_public_ip
 from india_compliance.gst_india.utils import merge_dicts, tar_gz_bytes_to_data
@@ -68,6 +68,10 @@ class FilesAPI(BaseAPI):
         return b64decode(data).decode()
 
 
+# Auth token is refreshed when it is about to expire in these many minutes
+REFRESH_BEFORE_MINS = 15
+
+
 class ReturnsAuthenticate(BaseAPI):
     def request_otp(self):
         response = super().post(
@@ -87,17 +91,8 @@ class ReturnsAuthenticate(BaseAPI):
     def autheticate_with_otp(self, otp=None):
         if not otp:
             # reset auth token
-            frappe.db.set_value(
-                "GST Credential",
-                {
-                    "gstin": self.company_gstin,
-                    "username": self.username,
-                    "service": "Returns",
-                },
-                {"auth_token": None},
-            )
-
             self.auth_token = None
+            self.update_session({"auth_token": None})
             return self.request_otp()
 
         return super().post(
@@ -141,18 +136,54 @@ class ReturnsAuthenticate(BaseAPI):
             values["session_key"] = b64encode(session_key).decode()
 
         if values:
-            frappe.db.set_value(
-                "GST Credential",
-                {
-                    "gstin": self.company_gstin,
-                    "username": self.username,
-                    "service": "Returns",
-                },
-                values,
-            )
+            self.update_session(values)
 
         return response
 
+    def update_session(self, values):
+        frappe.db.set_value(
+            "GST Credential",
+            {
+                "gstin": self.company_gstin,
+                "username": self.username,
+                "service": "Returns",
+            },
+            values,
+        )
+
+        self.cache_session()
+
+    def cache_session(self):
+        """
+        Share session with other workers until it expires,
+        so that they don't need to read it from GST Credential.
+        """
+        cache_key = self.get_session_cache_key()
+
+        expires_in_sec = 0
+        if self.auth_token and self.session_expiry:
+            expires_in_sec = int(
+                (get_datetime(self.session_expiry) - now_datetime()).total_seconds()
+            )
+
+        if expires_in_sec <= 0:
+            frappe.cache.delete_value(cache_key)
+            return
+
+        frappe.cache.set_value(
+            cache_key,
+            {
+                "app_key": self.app_key,
+                "auth_token": self.auth_token,
+                "session_key": self.session_key,
+                "session_expiry": self.session_expiry,
+            },
+            expires_in_sec=expires_in_sec,
+        )
+
+    def get_session_cache_key(self):
+        return f"gst_returns_session:{self.company_gstin}:{self.username}"
+
     def encrypt_request(self, json):
         if not json:
             return
@@ -227,10 +258,39 @@ class ReturnsAPI(ReturnsAuthenticate):
         )
 
     def _fetch_credentials(self, row, require_password=True):
-        self.app_key = row.app_key or self.generate_app_key()
-        self.auth_token = row.auth_token
-        self.session_key = b64decode(row.session_key or "")
-        self.session_expiry = row.session_expiry
+        if require_password:
+            super()._fetch_credentials(row, require_password=require_password)
+
+        if session := frappe.cache.get_value(self.get_session_cache_key()):
+            self.set_session(session)
+            return
+
+        # cached settings could be outdated if session was updated by another worker
+        credential = frappe.db.get_value(
+            "GST Credential",
+            row.name,
+            ("app_key", "auth_token", "session_key", "session_expiry"),
+            as_dict=True,
+        )
+
+        if not credential:
+            frappe.throw(
+                _("GST Credential not found for {0}").format(self.company_gstin),
+                frappe.DoesNotExistError,
+            )
+
+        self.app_key = credential.app_key or self.generate_app_key()
+        self.auth_token = credential.auth_token
+        self.session_key = b64decode(credential.session_key or "")
+        self.session_expiry = credential.session_expiry
+
+        self.cache_session()
+
+    def set_session(self, session):
+        self.app_key = session["app_key"]
+        self.auth_token = session["auth_token"]
+        self.session_key = session["session_key"]
+        self.session_expiry = session["session_expiry"]
 
     def _request(
         self,
@@ -343,8 +403,44 @@ class ReturnsAPI(ReturnsAuthenticate):
         if self.session_expiry <= now_datetime():
             return None
 
+        if self.session_expiry <= add_to_date(
+            None, minutes=REFRESH_BEFORE_MINS, as_datetime=True
+        ):
+            self.refresh_session()
+
         return self.auth_token
 
+    def refresh_session(self):
+        """
+        Refresh auth token before it expires.
+
+        Only one worker refreshes the token at a time, others continue to use
+        the current token as it is still valid. Errors while refreshing are
+        raised, so that the request is not made with a token that is about
+        to expire without the user knowing.
+        """
+        cache_key = self.get_session_cache_key()
+        lock = frappe.cache.lock(
+            frappe.cache.make_key(f"{cache_key}:refresh"), timeout=120
+        )
+
+        if not lock.acquire(blocking=False):
+            return
+
+        try:
+            # already refreshed by another worker
+            session = frappe.cache.get_value(cache_key)
+            if session and session["session_expiry"] > add_to_date(
+                None, minutes=REFRESH_BEFORE_MINS, as_datetime=True
+            ):
+                self.set_session(session)
+                return
+
+            self.refresh_auth_token(self.auth_token)
+
+        finally:
+            lock.release()
+
     def download_files(self, return_period, token, otp=None):
         response = self.get(
             "FILEDET",
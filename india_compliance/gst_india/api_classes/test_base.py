@@ -0,0 +1,22 @@
+from frappe.tests.utils import FrappeTestCase
+
+from india_compliance.gst_india.api_classes.base import get_session
+from india_compliance.gst_india.api_classes.benchmark import StandInServer
+
+
+class TestBaseAPI(FrappeTestCase):
+    def test_session_is_shared_per_base_url(self):
+        session = get_session("https://asp.resilient.tech/test/ic-api/einvoice")
+
+        self.assertIs(
+            session, get_session("https://asp.resilient.tech/ic-api/ewaybill")
+        )
+        self.assertIsNot(session, get_session("https://api.ipify.org"))
+
+    def test_connections_are_reused(self):
+        with StandInServer(handshake_delay=0) as server:
+            session = get_session(server.url)
+            for _ in range(5):
+                session.post(server.url, json={}).raise_for_status()
+
+            self.assertEqual(server.connections, 1)
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date
+
+from india_compliance.gst_india.api_classes.returns import ReturnsAPI
+
+
+def get_api(session_expiry_mins=360):
+    # credentials are set directly, without GST Settings
+    api = ReturnsAPI.__new__(ReturnsAPI)
+    api.company_gstin = "24AAQCA8719H1ZC"
+    api.username = "_test_returns_user"
+    api.app_key = "app_key"
+    api.auth_token = "auth_token"
+    api.session_key = b"session_key"
+    api.session_expiry = add_to_date(
+        None, minutes=session_expiry_mins, as_datetime=True
+    )
+
+    return api
+
+
+class TestReturnsSession(FrappeTestCase):
+    def setUp(self):
+        frappe.cache.delete_value(get_api().get_session_cache_key())
+
+    def test_session_is_shared_via_cache(self):
+        api = get_api()
+        api.cache_session()
+
+        other_api = get_api()
+        other_api.auth_token = other_api.session_key = None
+
+        with patch("frappe.db.get_value") as get_value:
+            other_api._fetch_credentials(None, require_password=False)
+
+        # session is not read from GST Credential
+        get_value.assert_not_called()
+        self.assertEqual(other_api.auth_token, api.auth_token)
+        self.assertEqual(other_api.session_key, api.session_key)
+        self.assertEqual(other_api.session_expiry, api.session_expiry)
+
+    def test_refresh_is_skipped_when_locked(self):
+        api = get_api(session_expiry_mins=10)
+        lock = frappe.cache.lock(
+            frappe.cache.make_key(f"{api.get_session_cache_key()}:refresh")
+        )
+
+        with patch.object(api, "refresh_auth_token") as refresh_auth_token:
+            lock.acquire()
+            try:
+                # current token is still valid
+                self.assertEqual(api.get_auth_token(), "auth_token")
+                refresh_auth_token.assert_not_called()
+
+            finally:
+                lock.release()
+
+            api.get_auth_token()
+            refresh_auth_token.assert_called_once_with("auth_token")
+
+    def test_refreshed_session_is_reused(self):
+        api = get_api(session_expiry_mins=10)
+
+        refreshed_api = get_api()
+        refreshed_api.auth_token = "refreshed_auth_token"
+        refreshed_api.cache_session()
+
+        with patch.object(api, "refresh_auth_token") as refresh_auth_token:
+            self.assertEqual(api.get_auth_token(), "refreshed_auth_token")
+
+        refresh_auth_token.assert_not_called()
+
+    def test_refresh_error_is_raised(self):
+        api = get_api(session_expiry_mins=10)
+
+        with patch.object(
+            api, "refresh_auth_token", side_effect=frappe.ValidationError
+        ):
+            self.assertRaises(frappe.ValidationError, api.get_auth_token)
+
+        # lock is released for the next attempt
+        with patch.object(api, "refresh_auth_token") as refresh_auth_token:
+            api.get_auth_token()
+
+        refresh_auth_token.assert_called_once()
+
+    def test_missing_credential_is_raised(self):
+        api = get_api()
+
+        self.assertRaises(
+            frappe.DoesNotExistError,
+            api._fetch_credentials,
+            frappe._dict(name="_Test Missing GST Credential"),
+            require_password=False,
+        )
@@ -37,12 +37,29 @@ frappe.listview_settings[DOCTYPE].onload = function (list_view) {
         );
     }
 
-    if (india_compliance.is_e_invoice_enabled())
+    if (india_compliance.is_e_invoice_enabled()) {
         add_bulk_action_for_invoices(
             list_view,
             __("Enqueue Bulk e-Invoice Generation"),
             enqueue_bulk_e_invoice_generation
         );
+
+        add_bulk_action_for_invoices(
+            list_view,
+            __("Enqueue Bulk e-Invoice Cancellation"),
+            show_bulk_e_invoice_cancellation_dialog,
+            [1, 2]
+        );
+
+        add_bulk_action_for_invoices(
+            list_view,
+            __("Sync e-Invoice Status"),
+            enqueue_bulk_e_invoice_status_sync,
+            [1, 2]
+        );
+
+        setup_bulk_e_invoice_listeners(list_view);
+    }
 };
 
 function add_bulk_action_for_invoices(list_view, label, callback, allowed_status) {
@@ -132,7 +149,84 @@ async function enqueue_bulk_e_invoice_generation(docnames) {
     );
 }
 
-async function enqueue_bulk_generation(method, args) {
+function show_bulk_e_invoice_cancellation_dialog(docnames) {
+    const d = new frappe.ui.Dialog({
+        title: __("Cancel e-Invoices"),
+        fields: [
+            {
+                label: "Reason",
+                fieldname: "reason",
+                fieldtype: "Select",
+                reqd: 1,
+                default: "Data Entry Mistake",
+                options: [
+                    "Duplicate",
+                    "Data Entry Mistake",
+                    "Order Cancelled",
+                    "Others",
+                ],
+            },
+            {
+                label: "Remark",
+                fieldname: "remark",
+                fieldtype: "Data",
+                mandatory_depends_on: "eval: doc.reason == 'Others'",
+            },
+        ],
+        primary_action_label: __("Cancel IRNs"),
+        primary_action(values) {
+            d.hide();
+            enqueue_bulk_generation(
+                "india_compliance.gst_india.utils.e_invoice.enqueue_bulk_e_invoice_cancellation",
+                { docnames, values },
+                __("Bulk Cancellation")
+            );
+        },
+    });
+
+    india_compliance.primary_to_danger_btn(d);
+    d.show();
+}
+
+async function enqueue_bulk_e_invoice_status_sync(docnames) {
+    enqueue_bulk_generation(
+        "india_compliance.gst_india.utils.e_invoice.enqueue_bulk_e_invoice_status_sync",
+        { docnames },
+        __("Status Sync")
+    );
+}
+
+function setup_bulk_e_invoice_listeners(list_view) {
+    frappe.realtime.off("bulk_e_invoice_progress");
+    frappe.realtime.on("bulk_e_invoice_progress", message => {
+        if (message.current_progress >= 100) return frappe.hide_progress();
+
+        frappe.show_progress(
+            __("e-Invoice {0}", [__(message.action)]),
+            message.current_progress,
+            100,
+            __("Please wait while e-Invoices are being processed")
+        );
+    });
+
+    frappe.realtime.off("bulk_e_invoice_summary");
+    frappe.realtime.on("bulk_e_invoice_summary", message => {
+        frappe.hide_progress();
+        list_view.refresh();
+
+        const summary = Object.entries(message.summary).map(
+            ([status, count]) => `${__(status)}: ${count}`
+        );
+
+        frappe.msgprint({
+            title: __("e-Invoice {0} Completed", [__(message.action)]),
+            message: summary.join("<br>") || __("No e-Invoices to process"),
+            indicator: "green",
+        });
+    });
+}
+
+async function enqueue_bulk_generation(method, args, title = __("Bulk Generation")) {
     const job_id = await frappe.xcall(method, args);
 
     const now = frappe.datetime.system_datetime();
@@ -155,11 +249,12 @@ async function enqueue_bulk_generation(method, args) {
 
     frappe.msgprint(
         __(
-            `Bulk Generation has been queued. You can track the
-            <a href='{0}'>Background Job</a>,
-            <a href='{1}'>API Request(s)</a>,
-            and <a href='{2}'>Error Log(s)</a>.`,
+            `{0} has been queued. You can track the
+            <a href='{1}'>Background Job</a>,
+            <a href='{2}'>API Request(s)</a>,
+            and <a href='{3}'>Error Log(s)</a>.`,
             [
+                title,
                 frappe.utils.get_form_link("RQ Job", job_id),
                 api_requests_link,
                 error_logs_link,
@@ -4,24 +4,29 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form
+from frappe.model.naming import set_new_name
+from frappe.query_builder import Case
+from frappe.utils import cint, flt, get_link_to_form, getdate, now
 
 from india_compliance.gst_india.constants import ORIGINAL_VS_AMENDED
 
 
 class GSTInwardSupply(Document):
     def before_save(self):
-        if self.classification.endswith("A"):
-            self.is_amended = True
-
-        if self.gstr_1_filing_date:
-            self.gstr_1_filled = True
+        self.set_check_fields()
 
         if self.match_status != "Amended" and (
             self.other_return_period or self.is_amended
         ):
             update_docs_for_amendment(self)
 
+    def set_check_fields(self):
+        if self.classification.endswith("A"):
+            self.is_amended = True
+
+        if self.gstr_1_filing_date:
+            self.gstr_1_filled = True
+
 
 def create_inward_supply(transaction):
     filters = {
@@ -40,6 +45,342 @@ def create_inward_supply(transaction):
     return gst_inward_supply.save(ignore_permissions=True)
 
 
+def create_inward_supplies(transactions, update_progress=None):
+    """
+    Bulk create or update GST Inward Supply for given transactions.
+
+    :param transactions: list of transactions as used in `create_inward_supply`
+    :param update_progress: callback called with number of transactions processed
+    """
+    BulkInwardSupply(transactions, update_progress).create()
+
+
+class BulkInwardSupply:
+    """
+    - Existing docs are fetched for all transactions in one pass.
+    - New docs (with items) are inserted using multi-row INSERTs.
+    - Only changed docs are updated, in batches.
+    - Transactions involving amendments are saved individually,
+      as these also update the original / amended docs.
+    """
+
+    DOCTYPE = "GST Inward Supply"
+    ITEM_DOCTYPE = "GST Inward Supply Item"
+    KEY_FIELDS = ("bill_no", "bill_date", "classification", "supplier_gstin")
+    ITEM_FIELDS = (
+        "item_number",
+        "rate",
+        "taxable_value",
+        "igst",
+        "cgst",
+        "sgst",
+        "cess",
+    )
+    BATCH_SIZE = 500
+
+    def __init__(self, transactions, update_progress=None):
+        self.transactions = transactions
+        self.update_progress = update_progress
+        self.processed = 0
+
+        self.meta = frappe.get_meta(self.DOCTYPE)
+        self.fields = [
+            df.fieldname
+            for df in self.meta.fields
+            if df.fieldtype != "Table" and df.fieldname in self.meta.get_valid_columns()
+        ]
+
+        self.timestamp = now()
+        self.user = frappe.session.user
+
+    def create(self):
+        if not self.transactions:
+            return
+
+        existing_docs = self.get_existing_docs()
+        new_docs = []
+        updated_docs = []
+        amendments = []
+
+        for transaction in self.get_unique_transactions(existing_docs, amendments):
+            existing_doc = existing_docs.get(self.get_key(transaction))
+
+            if not existing_doc:
+                new_docs.append(self.get_doc(transaction))
+                continue
+
+            doc = self.get_doc(transaction, existing_doc)
+            if self.is_changed(doc, existing_doc):
+                updated_docs.append(doc)
+            else:
+                self.processed += 1
+
+        self.publish_progress()
+
+        for batch in self.get_batches(new_docs):
+            self.insert_docs(batch)
+
+        for batch in self.get_batches(updated_docs):
+            self.update_docs(batch)
+
+        for transaction in amendments:
+            create_inward_supply(transaction)
+            self.processed += 1
+            self.publish_progress()
+
+    def get_unique_transactions(self, existing_docs, amendments):
+        """
+        Returns transactions to be saved in bulk, one for each key.
+        Last transaction for a key is used, as if these were saved one by one.
+
+        :param existing_docs: existing docs as returned by `get_existing_docs`
+        :param amendments: list to which transactions involving amendments are added
+        """
+        transactions = {}
+        for transaction in self.transactions:
+            key = self.get_key(transaction)
+            if self.has_amendment(transaction, existing_docs.get(key)):
+                amendments.append(transaction)
+                continue
+
+            if key in transactions:
+                self.processed += 1
+
+            transactions[key] = transaction
+
+        return transactions.values()
+
+    def get_existing_docs(self):
+        GSTR2 = frappe.qb.DocType(self.DOCTYPE)
+        GSTR2_ITEM = frappe.qb.DocType(self.ITEM_DOCTYPE)
+
+        classifications = {
+            transaction.classification for transaction in self.transactions
+        }
+        company_gstins = {
+            transaction.company_gstin for transaction in self.transactions
+        }
+        gstins = list(
+            {transaction.supplier_gstin or "" for transaction in self.transactions}
+        )
+
+        # amended docs may also be in the original return period
+        return_periods = {
+            transaction.sup_return_period for transaction in self.transactions
+        } | {
+            transaction.other_return_period
+            for transaction in self.transactions
+            if self.has_amendment(transaction)
+        }
+        return_period_condition = GSTR2.sup_return_period.isin(
+            return_periods - {None} or {""}
+        )
+        if None in return_periods:
+            return_period_condition |= GSTR2.sup_return_period.isnull()
+
+        existing_docs = {}
+        for batch in self.get_batches(gstins):
+            docs = (
+                frappe.qb.from_(GSTR2)
+                .select(GSTR2.name, GSTR2.owner, GSTR2.creation, *self.fields)
+                .where(GSTR2.company_gstin.isin(company_gstins))
+                .where(GSTR2.classification.isin(classifications))
+                .where(GSTR2.supplier_gstin.isin(batch) | GSTR2.supplier_gstin.isnull())
+                .where(return_period_condition)
+                .run(as_dict=True)
+            )
+
+            for doc in docs:
+                existing_docs.setdefault(self.get_key(doc), doc)
+
+        docs_by_name = {doc.name: doc for doc in existing_docs.values()}
+        for batch in self.get_batches(list(docs_by_name)):
+            items = (
+                frappe.qb.from_(GSTR2_ITEM)
+                .select(GSTR2_ITEM.parent, *self.ITEM_FIELDS)
+                .where(GSTR2_ITEM.parenttype == self.DOCTYPE)
+                .where(GSTR2_ITEM.parent.isin(batch))
+                .orderby(GSTR2_ITEM.idx)
+                .run(as_dict=True)
+            )
+
+            for item in items:
+                docs_by_name[item.parent].setdefault("items", []).append(item)
+
+        return existing_docs
+
+    def get_doc(self, transaction, existing_doc=None):
+        doc = frappe.new_doc(self.DOCTYPE)
+
+        if existing_doc:
+            doc.update({field: existing_doc.get(field) for field in self.fields})
+            doc.update(
+                {
+                    "name": existing_doc.name,
+                    "owner": existing_doc.owner,
+                    "creation": existing_doc.creation,
+                }
+            )
+
+        else:
+            doc.update({"owner": self.user, "creation": self.timestamp})
+
+        doc.update(transaction)
+        doc.update({"modified": self.timestamp, "modified_by": self.user})
+        doc.set_check_fields()
+
+        if not existing_doc:
+            doc.set_new_name()
+
+        doc.set_parent_in_children()
+        for item in doc.items:
+            set_new_name(item)
+            item.update(
+                {
+                    "owner": doc.owner,
+                    "creation": doc.creation,
+                    "modified": doc.modified,
+                    "modified_by": doc.modified_by,
+                }
+            )
+
+        return doc
+
+    def insert_docs(self, docs):
+        self.bulk_insert(self.DOCTYPE, [doc.get_valid_dict() for doc in docs])
+        self.insert_items(docs)
+
+        self.processed += len(docs)
+        self.publish_progress()
+
+    def update_docs(self, docs):
+        """
+        Update changed fields using CASE expressions and replace items.
+        """
+        GSTR2 = frappe.qb.DocType(self.DOCTYPE)
+        GSTR2_ITEM = frappe.qb.DocType(self.ITEM_DOCTYPE)
+        names = [doc.name for doc in docs]
+
+        values = {doc.name: doc.get_valid_dict() for doc in docs}
+
+        query = frappe.qb.update(GSTR2).where(GSTR2.name.isin(names))
+        for field in (*self.get_changed_fields(docs), "modified", "modified_by"):
+            value = Case()
+            for name in names:
+                value = value.when(GSTR2.name == name, values[name].get(field))
+
+            query = query.set(GSTR2[field], value.else_(GSTR2[field]))
+
+        query.run()
+
+        (
+            frappe.qb.from_(GSTR2_ITEM)
+            .delete()
+            .where(GSTR2_ITEM.parenttype == self.DOCTYPE)
+            .where(GSTR2_ITEM.parent.isin(names))
+            .run()
+        )
+        self.insert_items(docs)
+
+        self.processed += len(docs)
+        self.publish_progress()
+
+    def insert_items(self, docs):
+        self.bulk_insert(
+            self.ITEM_DOCTYPE,
+            [item.get_valid_dict() for doc in docs for item in doc.items],
+        )
+
+    def bulk_insert(self, doctype, rows):
+        if not rows:
+            return
+
+        fields = list(rows[0])
+        frappe.db.bulk_insert(
+            doctype,
+            fields,
+            [[row.get(field) for field in fields] for row in rows],
+            chunk_size=self.BATCH_SIZE,
+        )
+
+    def get_changed_fields(self, docs):
+        return [
+            field
+            for field in self.fields
+            if field not in ("modified", "modified_by")
+            and any(doc.flags.changed_fields.get(field) for doc in docs)
+        ]
+
+    def is_changed(self, doc, existing_doc):
+        doc.flags.changed_fields = {
+            field: True
+            for field in self.fields
+            if self.normalize(field, doc.get(field))
+            != self.normalize(field, existing_doc.get(field))
+            and field not in ("modified", "modified_by")
+        }
+
+        items = [
+            tuple(self.normalize(field, item.get(field)) for field in self.ITEM_FIELDS)
+            for item in doc.items
+        ]
+        existing_items = [
+            tuple(self.normalize(field, item.get(field)) for field in self.ITEM_FIELDS)
+            for item in existing_doc.get("items", [])
+        ]
+
+        return bool(doc.flags.changed_fields) or items != existing_items
+
+    def normalize(self, field, value):
+        if field in self.ITEM_FIELDS:
+            return flt(value)
+
+        fieldtype = self.meta.get_field(field).fieldtype
+
+        if fieldtype in ("Float", "Currency", "Percent"):
+            return flt(value)
+
+        if fieldtype in ("Int", "Check"):
+            return cint(value)
+
+        if fieldtype == "Date":
+            return getdate(value) if value else None
+
+        return value or None
+
+    @staticmethod
+    def has_amendment(transaction, existing_doc=None):
+        """
+        Returns True if the transaction is to be saved individually, as
+        `update_docs_for_amendment` would run for it in `before_save`.
+        """
+        doc = frappe._dict(existing_doc or {})
+        doc.update(transaction)
+
+        return doc.match_status != "Amended" and (
+            doc.classification.endswith("A")
+            or doc.is_amended
+            or doc.other_return_period
+        )
+
+    def get_key(self, doc):
+        return (
+            doc.get("bill_no") or "",
+            getdate(doc.bill_date) if doc.get("bill_date") else None,
+            doc.get("classification") or "",
+            doc.get("supplier_gstin") or "",
+        )
+
+    def get_batches(self, data):
+        return [
+            data[i : i + self.BATCH_SIZE] for i in range(0, len(data), self.BATCH_SIZE)
+        ]
+
+    def publish_progress(self):
+        if self.update_progress:
+            self.update_progress(self.processed)
+
+
 def update_docs_for_amendment(doc):
     fields = [
         "name",
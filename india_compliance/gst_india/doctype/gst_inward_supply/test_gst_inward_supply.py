@@ -1,9 +1,93 @@
 # Copyright (c) 2022, Resilient Tech and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from india_compliance.gst_india.doctype.gst_inward_supply.gst_inward_supply import (
+    create_inward_supplies,
+)
 
 
 class TestGSTInwardSupply(FrappeTestCase):
-    pass
+    SUPPLIER_GSTIN = "24AABCR6898M1ZN"
+
+    def get_transaction(self, bill_no, taxable_value):
+        return frappe._dict(
+            company="_Test Indian Registered Company",
+            company_gstin="24AAQCA8719H1ZC",
+            supplier_gstin=self.SUPPLIER_GSTIN,
+            classification="B2B",
+            doc_type="Invoice",
+            bill_no=bill_no,
+            bill_date=getdate("2023-05-01"),
+            document_value=taxable_value * 1.18,
+            items=[
+                frappe._dict(
+                    item_number=1,
+                    rate=18,
+                    taxable_value=taxable_value,
+                    igst=taxable_value * 0.18,
+                )
+            ],
+        )
+
+    def get_taxable_values(self):
+        docs = frappe.get_all(
+            "GST Inward Supply",
+            filters={
+                "supplier_gstin": self.SUPPLIER_GSTIN,
+                "bill_no": ("like", "BULK-%"),
+            },
+            pluck="name",
+        )
+
+        taxable_values = {}
+        for name in docs:
+            doc = frappe.get_doc("GST Inward Supply", name)
+            taxable_values.setdefault(doc.bill_no, []).extend(
+                item.taxable_value for item in doc.items
+            )
+
+        return taxable_values
+
+    def test_create_inward_supplies_with_duplicates(self):
+        processed = []
+        create_inward_supplies(
+            [
+                self.get_transaction("BULK-1", 100),
+                self.get_transaction("BULK-2", 200),
+                self.get_transaction("BULK-1", 300),
+            ],
+            processed.append,
+        )
+
+        # last transaction for the same key is saved
+        self.assertDictEqual(
+            self.get_taxable_values(), {"BULK-1": [300], "BULK-2": [200]}
+        )
+        self.assertEqual(processed[-1], 3)
+
+        create_inward_supplies(
+            [
+                self.get_transaction("BULK-1", 400),
+                self.get_transaction("BULK-1", 500),
+            ]
+        )
+        self.assertDictEqual(
+            self.get_taxable_values(), {"BULK-1": [500], "BULK-2": [200]}
+        )
+
+    def test_create_inward_supplies_for_amended_doc(self):
+        create_inward_supplies([self.get_transaction("BULK-3", 100)])
+        name = frappe.db.get_value("GST Inward Supply", {"bill_no": "BULK-3"})
+        frappe.db.set_value("GST Inward Supply", name, "other_return_period", "042023")
+
+        # saved individually for existing doc with amended return period
+        create_inward_supplies([self.get_transaction("BULK-3", 200)])
+
+        self.assertDictEqual(self.get_taxable_values(), {"BULK-3": [200]})
+        self.assertEqual(
+            frappe.db.get_value("GST Inward Supply", name, "match_status"), "Amended"
+        )
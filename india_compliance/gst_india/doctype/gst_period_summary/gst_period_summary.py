@@ -0,0 +1,239 @@
+# Copyright (c) 2026, Resilient Tech and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import IfNull, Sum
+from frappe.utils import flt, get_first_day, now
+
+SUMMARY_DOCTYPE = "GST Period Summary"
+
+# transaction type: field with GSTIN of the party
+TRANSACTION_TYPES = {
+    "Sales Invoice": "billing_address_gstin",
+}
+
+KEY_FIELDS = (
+    "company",
+    "company_gstin",
+    "period",
+    "transaction_type",
+    "gst_treatment",
+    "gst_hsn_code",
+    "uom",
+    "gst_rate",
+)
+VALUE_FIELDS = (
+    "qty",
+    "taxable_value",
+    "igst_amount",
+    "cgst_amount",
+    "sgst_amount",
+    "cess_amount",
+    "cess_non_advol_amount",
+)
+
+
+class GSTPeriodSummary(Document):
+    pass
+
+
+def update_gst_period_summary(doc, method=None):
+    """Add values of submitted invoice to (or remove cancelled invoice from) the summary"""
+    if not is_summarised(doc):
+        return
+
+    summary = {}
+    for item in doc.items:
+        add_to_summary(summary, doc.doctype, doc, item)
+
+    sign = -1 if doc.docstatus == 2 else 1
+    for row in summary.values():
+        update_summary_row(row, sign)
+
+
+def is_summarised(doc):
+    # transfers between the same GSTIN are not supplies
+    return doc.company_gstin and doc.company_gstin != doc.get(
+        TRANSACTION_TYPES[doc.doctype]
+    )
+
+
+def add_to_summary(summary, transaction_type, invoice, item):
+    key = (
+        invoice.company,
+        invoice.company_gstin,
+        get_first_day(invoice.posting_date),
+        transaction_type,
+        item.gst_treatment or "",
+        item.gst_hsn_code or "",
+        item.stock_uom or "",
+        flt(item.igst_rate) or flt(item.cgst_rate) + flt(item.sgst_rate),
+    )
+
+    if not (row := summary.get(key)):
+        row = summary[key] = frappe._dict(zip(KEY_FIELDS, key))
+        row.update(dict.fromkeys(VALUE_FIELDS, 0))
+
+    row.qty += flt(item.stock_qty)
+    row.taxable_value += flt(item.taxable_value)
+    row.igst_amount += flt(item.igst_amount)
+    row.cgst_amount += flt(item.cgst_amount)
+    row.sgst_amount += flt(item.sgst_amount)
+    row.cess_amount += flt(item.cess_amount)
+    row.cess_non_advol_amount += flt(item.cess_non_advol_amount)
+
+
+def get_summary_name(row):
+    key = json.dumps([row[field] for field in KEY_FIELDS], default=str)
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def update_summary_row(row, sign=1):
+    """
+    Add values to the summary row, inserting it if missing.
+
+    Single statement without reading the row first. The row is still locked
+    exclusively till commit, so concurrent submissions for the same row wait.
+    """
+    values = {
+        **row,
+        **{field: sign * row[field] for field in VALUE_FIELDS},
+        "name": get_summary_name(row),
+        "timestamp": now(),
+        "user": frappe.session.user,
+    }
+
+    frappe.db.sql(
+        f"""
+        insert into `tab{SUMMARY_DOCTYPE}`
+            (name, creation, modified, owner, modified_by,
+            {", ".join(KEY_FIELDS + VALUE_FIELDS)})
+        values
+            (%(name)s, %(timestamp)s, %(timestamp)s, %(user)s, %(user)s,
+            {", ".join(f"%({field})s" for field in KEY_FIELDS + VALUE_FIELDS)})
+        on duplicate key update
+            modified = values(modified),
+            modified_by = values(modified_by),
+            {", ".join(f"{field} = {field} + values({field})" for field in VALUE_FIELDS)}
+        """,
+        values,
+    )
+
+
+def rebuild_gst_period_summary(company=None):
+    """
+    Rebuild the summary from submitted invoices.
+
+    bench --site {site} execute
+    india_compliance.gst_india.doctype.gst_period_summary.gst_period_summary.rebuild_gst_period_summary
+    """
+    frappe.db.delete(SUMMARY_DOCTYPE, {"company": company} if company else None)
+
+    summary = {}
+    for transaction_type in TRANSACTION_TYPES:
+        for item in get_summary_items(transaction_type, company):
+            add_to_summary(summary, transaction_type, item, item)
+
+    timestamp = now()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        SUMMARY_DOCTYPE,
+        fields=[
+            "name",
+            "creation",
+            "modified",
+            "owner",
+            "modified_by",
+            *KEY_FIELDS,
+            *VALUE_FIELDS,
+        ],
+        values=[
+            (
+                get_summary_name(row),
+                timestamp,
+                timestamp,
+                user,
+                user,
+                *(row[field] for field in KEY_FIELDS),
+                *(row[field] for field in VALUE_FIELDS),
+            )
+            for row in summary.values()
+        ],
+    )
+
+
+def get_summary_items(transaction_type, company=None):
+    """Item values of submitted invoices, grouped by day and summary key"""
+    invoice = frappe.qb.DocType(transaction_type)
+    item = frappe.qb.DocType(f"{transaction_type} Item")
+
+    group_by = (
+        invoice.company,
+        invoice.company_gstin,
+        invoice.posting_date,
+        item.gst_treatment,
+        item.gst_hsn_code,
+        item.stock_uom,
+        item.igst_rate,
+        item.cgst_rate,
+        item.sgst_rate,
+    )
+
+    query = (
+        frappe.qb.from_(item)
+        .join(invoice)
+        .on(invoice.name == item.parent)
+        .select(
+            *group_by,
+            Sum(item.stock_qty).as_("stock_qty"),
+            Sum(item.taxable_value).as_("taxable_value"),
+            Sum(item.igst_amount).as_("igst_amount"),
+            Sum(item.cgst_amount).as_("cgst_amount"),
+            Sum(item.sgst_amount).as_("sgst_amount"),
+            Sum(item.cess_amount).as_("cess_amount"),
+            Sum(item.cess_non_advol_amount).as_("cess_non_advol_amount"),
+        )
+        .where(invoice.docstatus == 1)
+        .where(IfNull(invoice.company_gstin, "") != "")
+        .where(
+            invoice.company_gstin
+            != IfNull(invoice[TRANSACTION_TYPES[transaction_type]], "")
+        )
+        .groupby(*group_by)
+    )
+
+    if company:
+        query = query.where(invoice.company == company)
+
+    return query.run(as_dict=True)
+
+
+def get_period_summary(filters, transaction_type="Sales Invoice"):
+    """Summary rows of the transaction type for whole months between the dates"""
+    summary = frappe.qb.DocType(SUMMARY_DOCTYPE)
+    query = (
+        frappe.qb.from_(summary)
+        .select("*")
+        .where(summary.transaction_type == transaction_type)
+        .where(summary.company == filters.company)
+        .where(
+            summary.period[
+                get_first_day(filters.from_date) : get_first_day(filters.to_date)
+            ]
+        )
+    )
+
+    for field in ("company_gstin", "gst_hsn_code"):
+        if filters.get(field):
+            query = query.where(summary[field] == filters[field])
+
+    # rows left with no values after invoices are cancelled
+    return [
+        row
+        for row in query.run(as_dict=True)
+        if any(flt(row[field], 2) for field in VALUE_FIELDS)
+    ]
@@ -0,0 +1,65 @@
+# Copyright (c) 2026, Resilient Tech and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import get_first_day, get_last_day
+
+from india_compliance.gst_india.doctype.gst_period_summary.gst_period_summary import (
+    get_period_summary,
+    rebuild_gst_period_summary,
+)
+from india_compliance.gst_india.report.hsn_wise_summary_of_outward_supplies.hsn_wise_summary_of_outward_supplies import (
+    get_columns,
+    get_hsn_data_from_invoices,
+    get_hsn_data_from_summary,
+)
+from india_compliance.gst_india.utils import get_gst_accounts_by_type
+from india_compliance.gst_india.utils.tests import append_item, create_sales_invoice
+
+
+class TestGSTPeriodSummary(FrappeTestCase):
+    def setUp(self):
+        self.invoice = create_sales_invoice(do_not_save=1, is_in_state=True)
+        append_item(self.invoice, frappe._dict(gst_hsn_code="61149090"))
+        self.invoice.submit()
+
+        self.filters = frappe._dict(
+            company=self.invoice.company,
+            company_gstin=self.invoice.company_gstin,
+            gst_hsn_code="61149090",
+            from_date=get_first_day(self.invoice.posting_date),
+            to_date=get_last_day(self.invoice.posting_date),
+        )
+
+    def get_summary(self):
+        return {
+            (row.gst_hsn_code, row.gst_rate): (row.qty, row.taxable_value)
+            for row in get_period_summary(self.filters)
+        }
+
+    def test_summary_is_updated_on_submit_and_cancel(self):
+        summary = self.get_summary()
+        self.assertTrue(summary)
+
+        # rebuilt summary matches the incrementally updated one
+        rebuild_gst_period_summary(self.invoice.company)
+        self.assertDictEqual(self.get_summary(), summary)
+
+        qty, taxable_value = summary[("61149090", 18)]
+        self.invoice.cancel()
+        self.assertTupleEqual(
+            self.get_summary()[("61149090", 18)], (qty - 2, taxable_value - 200)
+        )
+
+    def test_hsn_summary_from_period_summary(self):
+        gst_accounts = get_gst_accounts_by_type(self.invoice.company, "Output")
+
+        def get_hsn_data(get_data):
+            data = get_data(self.filters, get_columns(), gst_accounts)
+            return sorted(data, key=lambda row: (row["uqc"], row["tax_rate"]))
+
+        self.assertListEqual(
+            get_hsn_data(get_hsn_data_from_summary),
+            get_hsn_data(get_hsn_data_from_invoices),
+        )
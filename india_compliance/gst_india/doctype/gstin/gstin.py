@@ -1,10 +1,15 @@
 # Copyright (c) 2023, Resilient Tech and contributors
 # For license information, please see license.txt
 
+import pickle
+import time
+
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import date_diff, format_date, get_datetime
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Count, IfNull
+from frappe.utils import add_to_date, cint, date_diff, format_date, get_datetime
 
 from india_compliance.gst_india.api_classes.e_invoice import EInvoiceAPI
 from india_compliance.gst_india.api_classes.public import PublicAPI
@@ -13,6 +18,7 @@ from india_compliance.gst_india.utils import (
     parse_datetime,
     validate_gstin,
 )
+from india_compliance.gst_india.utils.concurrency import run_in_threads
 
 GSTIN_STATUS = {
     "ACT": "Active",
@@ -24,15 +30,38 @@ GSTIN_STATUS = {
 
 GSTIN_BLOCK_STATUS = {"U": 0, "B": 1}
 
+# GSTINs pending status refresh, with transaction date to validate against
+REFRESH_QUEUE = "gstin_status_refresh_queue"
+REFRESH_BATCH_SIZE = 50
+REFRESH_WORKERS = 4
+
+# Removes GSTIN from the queue, unless queued again with another transaction date
+REMOVE_IF_UNCHANGED = """
+if redis.call("hget", KEYS[1], ARGV[1]) == ARGV[2] then
+    return redis.call("hdel", KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+# Maximum API requests per second for refreshing status
+REFRESH_RATE_LIMIT = 10
+
+# Supplier GSTINs used in these many days are refreshed before they get stale
+HOT_GSTIN_DAYS = 30
+HOT_GSTIN_LIMIT = 1000
+
+STATUS_FIELDS = (
+    "status",
+    "is_blocked",
+    "registration_date",
+    "cancelled_date",
+    "last_updated_on",
+)
+
 
 class GSTIN(Document):
     def before_save(self):
-        self.status = GSTIN_STATUS.get(self.status, self.status)
-        self.is_blocked = GSTIN_BLOCK_STATUS.get(self.is_blocked, 0)
-        self.last_updated_on = get_datetime()
-
-        if not self.cancelled_date and self.status == "Cancelled":
-            self.cancelled_date = self.registration_date
+        set_status_fields(self)
 
     @frappe.whitelist()
     def update_gstin_status(self):
@@ -67,14 +96,7 @@ def get_updated_gstin(gstin, transaction_date=None, is_request_from_ui=0):
     if is_request_from_ui:
         return create_or_update_gstin_status(gstin)
 
-    frappe.enqueue(
-        create_or_update_gstin_status,
-        enqueue_after_commit=True,
-        queue="short",
-        gstin=gstin,
-        transaction_date=transaction_date,
-        callback=_validate_gstin_info,
-    )
+    queue_status_refresh({gstin: transaction_date})
 
 
 def create_or_update_gstin_status(
@@ -103,6 +125,218 @@ def create_or_update_gstin_status(
     return doc
 
 
+def queue_status_refresh(gstins):
+    """
+    Queue GSTINs to be refreshed together by a single background job.
+
+    :param gstins: dict of GSTIN and transaction date to validate against
+    """
+    for gstin, transaction_date in gstins.items():
+        frappe.cache.hset(REFRESH_QUEUE, gstin, transaction_date)
+
+    frappe.enqueue(
+        refresh_queued_gstin_status,
+        enqueue_after_commit=True,
+        queue="short",
+        job_id=REFRESH_QUEUE,
+        deduplicate=True,
+    )
+
+
+def refresh_queued_gstin_status():
+    """
+    Refresh GSTINs queued with `queue_status_refresh`.
+
+    GSTINs are removed from the queue only after their batch is refreshed,
+    so that they are picked up again if the job fails.
+    """
+    # GSTINs could be queued while the job is running
+    while queued := frappe.cache.hgetall(REFRESH_QUEUE):
+        gstins = {
+            frappe.safe_decode(gstin): transaction_date
+            for gstin, transaction_date in queued.items()
+        }
+
+        refresh_gstin_status(gstins, on_batch_complete=remove_from_refresh_queue)
+
+
+def remove_from_refresh_queue(gstins):
+    """
+    Remove refreshed GSTINs from the queue.
+
+    A GSTIN queued again while being refreshed is retained, so that it is
+    validated against the new transaction date.
+    """
+    key = frappe.cache.make_key(REFRESH_QUEUE)
+    for gstin, transaction_date in gstins.items():
+        # values are pickled by `frappe.cache.hset`
+        frappe.cache.eval(
+            REMOVE_IF_UNCHANGED, 1, key, gstin, pickle.dumps(transaction_date)
+        )
+
+
+def refresh_gstin_status(gstins, on_batch_complete=None):
+    """
+    Refresh status of GSTINs in rate-limited batches and update them in bulk.
+
+    :param gstins: dict of GSTIN and transaction date to validate against
+    :param on_batch_complete: called with GSTINs of each batch once it is committed
+    """
+    max_workers = cint(frappe.conf.ic_gstin_status_workers) or REFRESH_WORKERS
+    rate_limit = cint(frappe.conf.ic_gstin_status_rate_limit) or REFRESH_RATE_LIMIT
+
+    gstins = list(gstins.items())
+    for i in range(0, len(gstins), REFRESH_BATCH_SIZE):
+        batch = dict(gstins[i : i + REFRESH_BATCH_SIZE])
+        started_at = time.monotonic()
+
+        responses = run_in_threads(
+            _fetch_gstin_info, list(batch), max_workers=max_workers
+        )
+
+        for doc in update_gstin_status_in_bulk(responses):
+            _validate_gstin_info(doc, batch.get(doc.gstin))
+
+        frappe.db.commit()
+
+        if on_batch_complete:
+            on_batch_complete(batch)
+
+        if (wait := len(batch) / rate_limit - (time.monotonic() - started_at)) > 0:
+            time.sleep(wait)
+
+
+def _fetch_gstin_info(gstin):
+    try:
+        return _get_gstin_info(gstin=gstin)
+
+    except frappe.ValidationError:
+        frappe.log_error(
+            title=_("Error fetching GSTIN status"),
+            message=frappe.get_traceback(),
+        )
+        frappe.clear_last_message()
+
+
+def update_gstin_status_in_bulk(responses):
+    """
+    Insert or update GSTINs from API responses without loading documents.
+
+    :returns: list of updated GSTINs as dicts
+    """
+    docs = {}
+    for response in responses:
+        if not response:
+            continue
+
+        doc = frappe._dict(response)
+        set_status_fields(doc)
+        docs[doc.gstin] = doc
+
+    if not docs:
+        return []
+
+    timestamp = get_datetime()
+    user = frappe.session.user
+
+    GSTIN = frappe.qb.DocType("GSTIN")
+    existing = frappe.get_all(
+        "GSTIN", filters={"name": ("in", list(docs))}, pluck="name"
+    )
+
+    if existing:
+        query = frappe.qb.update(GSTIN).where(GSTIN.name.isin(existing))
+        for field in STATUS_FIELDS:
+            value = Case()
+            for name in existing:
+                value = value.when(GSTIN.name == name, docs[name][field])
+
+            query = query.set(GSTIN[field], value.else_(GSTIN[field]))
+
+        query.set(GSTIN.modified, timestamp).set(GSTIN.modified_by, user).run()
+
+    existing = set(existing)
+    new_docs = [doc for gstin, doc in docs.items() if gstin not in existing]
+    if new_docs:
+        fields = ("name", "owner", "creation", "modified", "modified_by", "gstin")
+        frappe.db.bulk_insert(
+            "GSTIN",
+            (*fields, *STATUS_FIELDS),
+            [
+                (
+                    doc.gstin,
+                    user,
+                    timestamp,
+                    timestamp,
+                    user,
+                    doc.gstin,
+                    *(doc[field] for field in STATUS_FIELDS),
+                )
+                for doc in new_docs
+            ],
+        )
+
+    return list(docs.values())
+
+
+def refresh_stale_gstin_status():
+    """
+    Scheduled job to refresh status of supplier GSTINs used recently
+    before they get stale, so that transactions don't wait for them.
+    """
+    settings = frappe.get_cached_doc("GST Settings")
+
+    # GSTINs left in the queue by a failed job, or queued while the job was exiting
+    if frappe.cache.hgetall(REFRESH_QUEUE):
+        queue_status_refresh({})
+
+    if (
+        not settings.validate_gstin_status
+        or not is_api_enabled(settings)
+        or settings.sandbox_mode
+    ):
+        return
+
+    # refresh a day in advance
+    stale_before = add_to_date(
+        None, days=1 - cint(settings.gstin_status_refresh_interval), as_datetime=True
+    )
+
+    PI = frappe.qb.DocType("Purchase Invoice")
+    GSTIN = frappe.qb.DocType("GSTIN")
+
+    gstins = (
+        frappe.qb.from_(PI)
+        .left_join(GSTIN)
+        .on(GSTIN.name == PI.supplier_gstin)
+        .select(PI.supplier_gstin)
+        .where(PI.docstatus == 1)
+        .where(PI.posting_date >= add_to_date(None, days=-HOT_GSTIN_DAYS))
+        .where(IfNull(PI.supplier_gstin, "") != "")
+        .where(
+            GSTIN.name.isnull()
+            | GSTIN.status.notin(("Active", "Cancelled"))
+            | (GSTIN.last_updated_on < stale_before)
+        )
+        .groupby(PI.supplier_gstin)
+        .orderby(Count(PI.name), order=frappe.qb.desc)
+        .limit(HOT_GSTIN_LIMIT)
+        .run(pluck=True)
+    )
+
+    if gstins:
+        queue_status_refresh(dict.fromkeys(gstins))
+
+
+def set_status_fields(doc):
+    doc.status = GSTIN_STATUS.get(doc.status, doc.status)
+    doc.is_blocked = GSTIN_BLOCK_STATUS.get(doc.is_blocked, 0)
+    doc.last_updated_on = get_datetime()
+
+    if not doc.cancelled_date and doc.status == "Cancelled":
+        doc.cancelled_date = doc.registration_date
+
+
 def _get_gstin_info(*, gstin=None, response=None):
     if response:
         return get_formatted_response(response)
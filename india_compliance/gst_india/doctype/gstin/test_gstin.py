@@ -1,9 +1,99 @@
 # Copyright (c) 2023, Resilient Tech and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from india_compliance.gst_india.doctype.gstin.gstin import (
+    REFRESH_QUEUE,
+    refresh_gstin_status,
+    refresh_queued_gstin_status,
+    remove_from_refresh_queue,
+    update_gstin_status_in_bulk,
+)
 
 
 class TestGSTIN(FrappeTestCase):
-    pass
+    def test_update_gstin_status_in_bulk(self):
+        frappe.get_doc(
+            {
+                "doctype": "GSTIN",
+                "gstin": "24AANFA2641L1ZF",
+                "status": "Active",
+                "registration_date": "2017-07-01",
+            }
+        ).insert(ignore_permissions=True)
+
+        update_gstin_status_in_bulk(
+            [
+                frappe._dict(
+                    gstin="24AANFA2641L1ZF",
+                    status="CNL",
+                    registration_date=getdate("2017-07-01"),
+                    cancelled_date=None,
+                    is_blocked="B",
+                ),
+                frappe._dict(
+                    gstin="24AAQCA8719H1ZC",
+                    status="ACT",
+                    registration_date=getdate("2018-04-01"),
+                    cancelled_date=None,
+                ),
+                None,
+            ]
+        )
+
+        self.assertDocumentEqual(
+            {
+                "status": "Cancelled",
+                "cancelled_date": getdate("2017-07-01"),
+                "is_blocked": 1,
+            },
+            frappe.get_doc("GSTIN", "24AANFA2641L1ZF"),
+        )
+
+        self.assertDocumentEqual(
+            {
+                "status": "Active",
+                "registration_date": getdate("2018-04-01"),
+                "is_blocked": 0,
+            },
+            frappe.get_doc("GSTIN", "24AAQCA8719H1ZC"),
+        )
+
+    @patch("india_compliance.gst_india.doctype.gstin.gstin._fetch_gstin_info")
+    def test_refresh_queued_gstin_status(self, fetch_gstin_info):
+        frappe.cache.delete_value(REFRESH_QUEUE)
+        frappe.cache.hset(REFRESH_QUEUE, "24AANFA2641L1ZF", "2023-04-01")
+
+        # GSTIN is retained in the queue if refresh fails
+        fetch_gstin_info.side_effect = frappe.AuthenticationError
+        self.assertRaises(frappe.AuthenticationError, refresh_queued_gstin_status)
+        self.assertEqual(
+            frappe.cache.hget(REFRESH_QUEUE, "24AANFA2641L1ZF"), "2023-04-01"
+        )
+
+        fetch_gstin_info.side_effect = None
+        fetch_gstin_info.return_value = None
+        refresh_queued_gstin_status()
+
+        fetch_gstin_info.assert_called_with("24AANFA2641L1ZF")
+        self.assertFalse(frappe.cache.hgetall(REFRESH_QUEUE))
+
+        def requeue(gstin):
+            frappe.cache.hset(REFRESH_QUEUE, gstin, "2023-05-01")
+
+        # GSTIN queued again while being refreshed is retained
+        frappe.cache.hset(REFRESH_QUEUE, "24AANFA2641L1ZF", "2023-04-01")
+        fetch_gstin_info.side_effect = requeue
+        refresh_gstin_status(
+            {"24AANFA2641L1ZF": "2023-04-01"},
+            on_batch_complete=remove_from_refresh_queue,
+        )
+        self.assertListEqual(
+            list(frappe.cache.hgetall(REFRESH_QUEUE).values()), ["2023-05-01"]
+        )
+        frappe.cache.delete_value(REFRESH_QUEUE)
@@ -0,0 +1,137 @@
+# Copyright (c) 2026, Resilient Tech and contributors
+# For license information, please see license.txt
+
+import time
+
+import frappe
+from frappe.utils import add_months, get_first_day, get_last_day, getdate
+
+
+def run_benchmark(
+    company="_Test Indian Registered Company",
+    company_address="_Test Indian Registered Company-Billing",
+    invoice_count=100000,
+    months=24,
+):
+    """
+    Time GSTR-3B generation for a month, with invoices spread over `months`.
+    Synthetic invoices are rolled back after the run.
+    Not a part of the test suite, as it bulk inserts and rolls back.
+
+    bench --site {site} execute
+    india_compliance.gst_india.doctype.gstr_3b_report.benchmark.run_benchmark
+    """
+    company_gstin = frappe.db.get_value("Address", company_address, "gstin")
+    today = getdate()
+
+    try:
+        insert_synthetic_invoices(company, company_gstin, invoice_count, months)
+
+        report = frappe.get_doc(
+            {
+                "doctype": "GSTR 3B Report",
+                "company": company,
+                "company_address": company_address,
+                "year": today.year,
+                "month": today.strftime("%B"),
+            }
+        )
+
+        start = time.perf_counter()
+        report.get_data()
+        generation_time = time.perf_counter() - start
+
+        def get_query_time(condition, values):
+            start = time.perf_counter()
+            count = frappe.db.sql(
+                f"""
+                SELECT count(*) FROM `tabSales Invoice`
+                WHERE company = %s and company_gstin = %s and docstatus = 1
+                and {condition}
+                """,
+                (company, company_gstin, *values),
+            )[0][0]
+
+            return count, time.perf_counter() - start
+
+        invoices_in_month, date_range_time = get_query_time(
+            "posting_date between %s and %s",
+            (get_first_day(today), get_last_day(today)),
+        )
+        _, month_year_time = get_query_time(
+            "month(posting_date) = %s and year(posting_date) = %s",
+            (today.month, today.year),
+        )
+
+    finally:
+        frappe.db.rollback()
+
+    return frappe._dict(
+        invoices=invoice_count,
+        invoices_in_month=invoices_in_month,
+        generation_time=generation_time,
+        date_range_query_time=date_range_time,
+        month_year_query_time=month_year_time,
+    )
+
+
+def insert_synthetic_invoices(company, company_gstin, invoice_count, months):
+    today = getdate()
+    invoices = []
+    items = []
+
+    for i in range(invoice_count):
+        name = f"_T-3B-BENCH-{i}"
+        invoices.append(
+            (
+                name,
+                company,
+                company_gstin,
+                1,
+                add_months(today, -(i % months)),
+                "No",
+                "Registered Regular",
+                "24-Gujarat",
+            )
+        )
+        items.append(
+            (
+                f"{name}-1",
+                name,
+                "Sales Invoice",
+                "items",
+                1,
+                "_Test Trading Goods 1",
+                100,
+                "Taxable",
+            )
+        )
+
+    frappe.db.bulk_insert(
+        "Sales Invoice",
+        (
+            "name",
+            "company",
+            "company_gstin",
+            "docstatus",
+            "posting_date",
+            "is_opening",
+            "gst_category",
+            "place_of_supply",
+        ),
+        invoices,
+    )
+    frappe.db.bulk_insert(
+        "Sales Invoice Item",
+        (
+            "name",
+            "parent",
+            "parenttype",
+            "parentfield",
+            "docstatus",
+            "item_code",
+            "taxable_value",
+            "gst_treatment",
+        ),
+        items,
+    )
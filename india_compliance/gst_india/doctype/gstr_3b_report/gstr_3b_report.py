@@ -8,8 +8,7 @@ import os
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.query_builder import DatePart
-from frappe.query_builder.functions import Extract, Sum
+from frappe.query_builder.functions import Sum
 from frappe.utils import cstr, flt, get_date_str, get_first_day, get_last_day
 
 from india_compliance.gst_india.constants import INVOICE_DOCTYPES
@@ -43,6 +42,7 @@ class GSTR3BReport(Document):
             self.report_dict["gstin"] = self.gst_details.get("gstin")
             self.report_dict["ret_period"] = get_period(self.month, self.year)
             self.month_no = get_period(self.month)
+            self.set_date_range()
             self.account_heads = self.get_account_heads()
 
             self.get_outward_supply_details("Sales Invoice")
@@ -83,6 +83,11 @@ class GSTR3BReport(Document):
                 "gstr3b_report_generation", doctype=self.doctype, docname=self.name
             )
 
+    def set_date_range(self):
+        # date range allows use of index on posting_date
+        self.from_date = get_first_day(f"{self.year}-{self.month_no}-01")
+        self.to_date = get_last_day(f"{self.year}-{self.month_no}-01")
+
     def set_inward_nil_exempt(self, inward_nil_exempt):
         self.report_dict["inward_sup"]["isup_details"][0]["inter"] = flt(
             inward_nil_exempt.get("gst").get("inter"), 2
@@ -164,10 +169,10 @@ class GSTR3BReport(Document):
             and j.is_opening = 'No'
             and ja.parent = j.name
             and j.voucher_type = 'Reversal Of ITC'
-            and month(j.posting_date) = %s and year(j.posting_date) = %s
+            and j.posting_date between %s and %s
             and j.company = %s and j.company_gstin = %s
             GROUP BY ja.account, j.ineligibility_reason""",
-            (self.month_no, self.year, self.company, self.gst_details.get("gstin")),
+            (self.from_date, self.to_date, self.company, self.gst_details.get("gstin")),
             as_dict=1,
         )
 
@@ -196,11 +201,11 @@ class GSTR3BReport(Document):
             FROM `tabPurchase Invoice`
             WHERE docstatus = 1
             and is_opening = 'No'
-            and month(posting_date) = %s and year(posting_date) = %s and company = %s
+            and posting_date between %s and %s and company = %s
             and company_gstin = %s
             GROUP BY itc_classification
         """,
-            (self.month_no, self.year, self.company, self.gst_details.get("gstin")),
+            (self.from_date, self.to_date, self.company, self.gst_details.get("gstin")),
             as_dict=1,
         )
 
@@ -233,9 +238,9 @@ class GSTR3BReport(Document):
                 .on(boe_taxes.parent == boe.name)
                 .where(
                     boe.posting_date.between(
-                        get_date_str(get_first_day(f"{self.year}-{self.month_no}-01")),
-                        get_date_str(get_last_day(f"{self.year}-{self.month_no}-01")),
+                        get_date_str(self.from_date), get_date_str(self.to_date)
                     )
+                    & boe.company.eq(self.company)
                     & boe.company_gstin.eq(self.gst_details.get("gstin"))
                     & boe.docstatus.eq(1)
                     & boe_taxes.account_head.eq(gst_accounts[account_type])
@@ -257,10 +262,10 @@ class GSTR3BReport(Document):
             WHERE p.docstatus = 1 and p.name = i.parent
             and p.is_opening = 'No'
             and (i.gst_treatment != 'Taxable' or p.gst_category = 'Registered Composition') and
-            month(p.posting_date) = %s and year(p.posting_date) = %s
+            p.posting_date between %s and %s
             and p.company = %s and p.company_gstin = %s
             """,
-            (self.month_no, self.year, self.company, self.gst_details.get("gstin")),
+            (self.from_date, self.to_date, self.company, self.gst_details.get("gstin")),
             as_dict=1,
         )
 
@@ -296,36 +301,42 @@ class GSTR3BReport(Document):
 
     def get_outward_supply_details(self, doctype, reverse_charge=None):
         self.get_outward_tax_invoices(doctype, reverse_charge=reverse_charge)
-        self.get_outward_items(doctype)
-        self.get_outward_tax_details(doctype)
-
-    def get_outward_tax_invoices(self, doctype, reverse_charge=None):
-        self.invoice_map = {}
-
+        self.get_outward_items(doctype, reverse_charge=reverse_charge)
+        self.get_outward_tax_details(doctype, reverse_charge=reverse_charge)
+
+    def get_outward_invoice_query(self, doctype, reverse_charge=None):
+        """
+        Invoices of the period, with conditions in order of index
+        `company, company_gstin, docstatus, posting_date`
+        """
         invoice = frappe.qb.DocType(doctype)
-        fields = [invoice.name, invoice.gst_category, invoice.place_of_supply]
-
-        if doctype == "Sales Invoice":
-            fields.append(invoice.is_export_with_gst)
-
         query = (
             frappe.qb.from_(invoice)
-            .select(*fields)
-            .where(invoice.docstatus == 1)
-            .where(Extract(DatePart.month, invoice.posting_date).eq(self.month_no))
-            .where(Extract(DatePart.year, invoice.posting_date).eq(self.year))
             .where(invoice.company == self.company)
             .where(invoice.company_gstin == self.gst_details.get("gstin"))
+            .where(invoice.docstatus == 1)
+            .where(invoice.posting_date[self.from_date : self.to_date])
             .where(invoice.is_opening == "No")
         )
 
         if reverse_charge:
             query = query.where(invoice.is_reverse_charge == 1)
 
-        invoice_details = query.orderby(invoice.name).run(as_dict=True)
+        return query, invoice
+
+    def get_outward_tax_invoices(self, doctype, reverse_charge=None):
+        self.invoice_map = {}
+
+        query, invoice = self.get_outward_invoice_query(doctype, reverse_charge)
+        fields = [invoice.name, invoice.gst_category, invoice.place_of_supply]
+
+        if doctype == "Sales Invoice":
+            fields.append(invoice.is_export_with_gst)
+
+        invoice_details = query.select(*fields).orderby(invoice.name).run(as_dict=True)
         self.invoice_map = {d.name: d for d in invoice_details}
 
-    def get_outward_items(self, doctype):
+    def get_outward_items(self, doctype, reverse_charge=None):
         self.invoice_items = frappe._dict()
         self.is_nil_or_exempt = []
         self.is_non_gst = []
@@ -333,17 +344,21 @@ class GSTR3BReport(Document):
         if not self.invoice_map:
             return
 
-        item_details = frappe.db.sql(
-            f"""
-            SELECT
-                item_code, parent, taxable_value, item_tax_rate,
-                gst_treatment
-            FROM
-                `tab{doctype} Item`
-            WHERE parent in ({", ".join(["%s"] * len(self.invoice_map))})
-            """,
-            tuple(self.invoice_map),
-            as_dict=1,
+        # join with invoices instead of a list of invoice names
+        query, invoice = self.get_outward_invoice_query(doctype, reverse_charge)
+        item = frappe.qb.DocType(f"{doctype} Item")
+
+        item_details = (
+            query.join(item)
+            .on(item.parent == invoice.name)
+            .select(
+                item.item_code,
+                item.parent,
+                item.taxable_value,
+                item.item_tax_rate,
+                item.gst_treatment,
+            )
+            .run(as_dict=True)
         )
 
         for d in item_details:
@@ -362,7 +377,7 @@ class GSTR3BReport(Document):
             if is_non_gst and d.item_code not in self.is_non_gst:
                 self.is_non_gst.append(d.item_code)
 
-    def get_outward_tax_details(self, doctype):
+    def get_outward_tax_details(self, doctype, reverse_charge=None):
         if doctype == "Sales Invoice":
             tax_template = "Sales Taxes and Charges"
         elif doctype == "Purchase Invoice":
@@ -375,17 +390,21 @@ class GSTR3BReport(Document):
         if not self.invoice_map:
             return
 
-        tax_details = frappe.db.sql(
-            f"""
-            SELECT
-                parent, account_head, item_wise_tax_detail, base_tax_amount_after_discount_amount
-            FROM `tab{tax_template}`
-            WHERE
-                parenttype = %s and docstatus = 1
-                and parent in ({", ".join(["%s"] * len(self.invoice_map))})
-            ORDER BY account_head
-            """,
-            (doctype, *self.invoice_map.keys()),
+        query, invoice = self.get_outward_invoice_query(doctype, reverse_charge)
+        taxes = frappe.qb.DocType(tax_template)
+
+        tax_details = (
+            query.join(taxes)
+            .on((taxes.parent == invoice.name) & (taxes.parenttype == doctype))
+            .select(
+                taxes.parent,
+                taxes.account_head,
+                taxes.item_wise_tax_detail,
+                taxes.base_tax_amount_after_discount_amount,
+            )
+            .where(taxes.docstatus == 1)
+            .orderby(taxes.account_head)
+            .run()
         )
 
         for parent, account, item_wise_tax_detail, tax_amount in tax_details:
@@ -623,11 +642,11 @@ class GSTR3BReport(Document):
                 f"""
                     SELECT name FROM `tab{doctype}`
                     WHERE docstatus = 1 and is_opening = 'No'
-                    and month(posting_date) = %s and year(posting_date) = %s
-                    and company = %s and place_of_supply IS NULL
+                    and company = %s and posting_date between %s and %s
+                    and place_of_supply IS NULL
                     and gst_category != 'Overseas'
                 """,
-                (self.month_no, self.year, self.company),
+                (self.company, self.from_date, self.to_date),
                 as_dict=1,
             )  # nosec
 
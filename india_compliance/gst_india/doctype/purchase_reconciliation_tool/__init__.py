@@ -1,8 +1,14 @@
 # Copyright (c) 2022, Resilient Tech and contributors
 # For license information, please see license.txt
 
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
 from enum import Enum
+from math import floor
 
+import numpy as np
 from dateutil.rrule import MONTHLY, rrule
 from rapidfuzz import fuzz, process
 
@@ -10,12 +16,21 @@ import frappe
 from frappe.query_builder import Case
 from frappe.query_builder.custom import ConstantColumn
 from frappe.query_builder.functions import Abs, IfNull, Sum
-from frappe.utils import add_months, format_date, getdate, rounded
+from frappe.utils import (
+    add_months,
+    cint,
+    format_date,
+    get_datetime,
+    getdate,
+    now,
+    rounded,
+)
 
 from india_compliance.gst_india.constants import GST_TAX_TYPES
 from india_compliance.gst_india.utils import (
     get_escaped_name,
     get_gst_accounts_by_type,
+    get_parties_for_gstins,
     get_party_for_gstin,
 )
 from india_compliance.gst_india.utils.gstr import IMPORT_CATEGORY, ReturnType
@@ -256,7 +271,7 @@ class InwardSupply:
 
     def get_unmatched(self, category, amended_category):
         categories = [category, amended_category or None]
-        query = self.with_period_filter()
+        query = self.with_period_filter(["modified"])
         data = (
             query.where(IfNull(self.GSTR2.match_status, "") == "")
             .where(self.GSTR2.classification.isin(categories))
@@ -368,7 +383,7 @@ class PurchaseInvoice:
         is_return = 1 if category == "CDNR" else 0
 
         query = (
-            self.get_query(is_return=is_return)
+            self.get_query([self.PI.modified], is_return=is_return)
             .where(self.PI.posting_date[self.from_date : self.to_date])
             .where(
                 self.PI.name.notin(
@@ -523,7 +538,7 @@ class BillOfEntry:
         gst_category = "SEZ" if category == "IMPGSEZ" else "Overseas"
 
         query = (
-            self.get_query()
+            self.get_query(["modified"])
             .where(self.PI.gst_category == gst_category)
             .where(self.BOE.posting_date[self.from_date : self.to_date])
             .where(
@@ -736,28 +751,54 @@ class BaseReconciliation:
 
 
 class Reconciler(BaseReconciliation):
+    UPDATE_BATCH_SIZE = 1000
+
+    # Minimum inward supplies in a category to reconcile partitions in parallel
+    PARALLEL_THRESHOLD = 5000
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.matching_docs = {}
+        self.modified_since = None
+
     def reconcile(self, category, amended_category):
         """
         Reconcile purchases and inward supplies for given category.
+        Matches are persisted together once the category is reconciled.
         """
-        # GSTIN Level matching
         purchases = self.get_unmatched_purchase_or_bill_of_entry(category)
         inward_supplies = self.get_unmatched_inward_supply(category, amended_category)
+
+        if self.modified_since:
+            purchases, inward_supplies = self.get_modified_suppliers_data(
+                purchases, inward_supplies
+            )
+
+        if workers := self.get_parallel_workers(inward_supplies):
+            self.reconcile_in_parallel(category, purchases, inward_supplies, workers)
+        else:
+            self.reconcile_data(category, purchases, inward_supplies)
+
+        self.update_matching_docs()
+
+    def reconcile_data(self, category, purchases, inward_supplies):
+        # GSTIN Level matching
         self.reconcile_for_rules(GSTIN_RULES, purchases, inward_supplies)
 
         # In case of IMPG GST in not available in 2A. So skip PAN level matching.
-        if category == "IMPG":
-            return
-
-        # PAN Level matching
-        purchases = self.get_pan_level_data(purchases)
-        inward_supplies = self.get_pan_level_data(inward_supplies)
-        self.reconcile_for_rules(PAN_RULES, purchases, inward_supplies)
+        if category != "IMPG":
+            # PAN Level matching
+            purchases = self.get_pan_level_data(purchases)
+            inward_supplies = self.get_pan_level_data(inward_supplies)
+            self.reconcile_for_rules(PAN_RULES, purchases, inward_supplies)
 
     def reconcile_for_rules(self, rules, purchases, inward_supplies):
         if not (purchases and inward_supplies):
             return
 
+        # groups differ for GSTIN and PAN level matching
+        self.fuzzy_matchers = {}
+
         for rule in rules:
             self.reconcile_for_rule(
                 purchases,
@@ -770,6 +811,7 @@ class Reconciler(BaseReconciliation):
         """
         Sequentially reconcile invoices as per rules list.
         - Reconciliation only done between invoices of same GSTIN.
+        - Only candidates from the same bucket of `CandidateIndex` are compared.
         - Where a match is found, update Inward Supply and Purchase Invoice.
         """
 
@@ -777,12 +819,18 @@ class Reconciler(BaseReconciliation):
             if not inward_supplies.get(supplier_gstin):
                 continue
 
+            candidate_index = CandidateIndex(inward_supplies[supplier_gstin], rules)
+            if rules.get(Fields.BILL_NO) == Rule.FUZZY_MATCH:
+                self.set_fuzzy_matcher(
+                    supplier_gstin,
+                    purchases[supplier_gstin],
+                    inward_supplies[supplier_gstin],
+                )
+
             for purchase_invoice_name, purchase in (
                 purchases[supplier_gstin].copy().items()
             ):
-                for inward_supply_name, inward_supply in (
-                    inward_supplies[supplier_gstin].copy().items()
-                ):
+                for inward_supply in candidate_index.get_candidates(purchase):
                     if match_status == "Residual Match":
                         if (
                             abs((purchase.bill_date - inward_supply.bill_date).days)
@@ -802,7 +850,8 @@ class Reconciler(BaseReconciliation):
 
                     # Remove from current data to ensure matching is done only once.
                     purchases[supplier_gstin].pop(purchase_invoice_name)
-                    inward_supplies[supplier_gstin].pop(inward_supply_name)
+                    inward_supplies[supplier_gstin].pop(inward_supply.name)
+                    candidate_index.remove(inward_supply)
                     break
 
     def is_doc_matching(self, purchase, inward_supply, rules):
@@ -837,37 +886,21 @@ class Reconciler(BaseReconciliation):
         elif rule == Rule.ROUNDING_DIFFERENCE:
             return self.get_amount_difference(purchase, inward_supply, field) <= 1
 
-    def fuzzy_match(self, purchase, inward_supply):
+    def set_fuzzy_matcher(self, group, purchases, inward_supplies):
         """
-        Returns true if the (cleaned) bill_no approximately match.
-        - For a fuzzy match, month of invoice and inward supply should be same.
-        - First check for partial ratio, with 100% confidence
-        - Next check for approximate match, with 90% confidence
+        Bill numbers are scored once per group for all fuzzy match rules.
         """
-        if not purchase.bill_no or not inward_supply.bill_no:
-            return False
-
-        if abs((purchase.bill_date - inward_supply.bill_date).days) > 10:
-            return False
-
-        if not purchase._bill_no:
-            purchase._bill_no = BaseUtil.get_cleaner_bill_no(
-                purchase.bill_no, purchase.fy
-            )
-
-        if not inward_supply._bill_no:
-            inward_supply._bill_no = BaseUtil.get_cleaner_bill_no(
-                inward_supply.bill_no, inward_supply.fy
-            )
+        if group not in self.fuzzy_matchers:
+            self.fuzzy_matchers[group] = FuzzyMatcher(purchases, inward_supplies)
 
-        partial_ratio = fuzz.partial_ratio(purchase._bill_no, inward_supply._bill_no)
-        if float(partial_ratio) == 100:
-            return True
+        self.fuzzy_matcher = self.fuzzy_matchers[group]
 
-        return (
-            float(process.extractOne(purchase._bill_no, [inward_supply._bill_no])[1])
-            >= 90.0
-        )
+    def fuzzy_match(self, purchase, inward_supply):
+        """
+        Returns true if the (cleaned) bill_no approximately match.
+        Scores are precomputed for the group using `FuzzyMatcher`.
+        """
+        return self.fuzzy_matcher.is_matching(purchase, inward_supply)
 
     def get_amount_difference(self, purchase, inward_supply, field):
         if field == "cess":
@@ -882,30 +915,385 @@ class Reconciler(BaseReconciliation):
     def update_matching_doc(
         self, match_status, purchase_invoice_name, inward_supply_name, link_doctype
     ):
-        """Update matching doc for records."""
+        """Record matching doc, to be updated with `update_matching_docs`."""
 
         if match_status == "Residual Match":
             match_status = "Mismatch"
 
-        inward_supply_fields = {
-            "match_status": match_status,
-            "link_doctype": link_doctype,
-            "link_name": purchase_invoice_name,
-        }
-
-        frappe.db.set_value(
-            "GST Inward Supply", inward_supply_name, inward_supply_fields
+        self.matching_docs[inward_supply_name] = frappe._dict(
+            {
+                "match_status": match_status,
+                "link_doctype": link_doctype,
+                "link_name": purchase_invoice_name,
+            }
         )
 
+    def update_matching_docs(self):
+        """
+        Bulk update recorded matches in GST Inward Supply.
+        - Docs are grouped by match status and link doctype
+        - Link name is set using a CASE expression for a batch of docs
+        """
+        if not self.matching_docs:
+            return
+
+        groups = {}
+        for inward_supply_name, fields in self.matching_docs.items():
+            groups.setdefault((fields.match_status, fields.link_doctype), {})[
+                inward_supply_name
+            ] = fields.link_name
+
+        GSTR2 = frappe.qb.DocType("GST Inward Supply")
+        modified = now()
+
+        for (match_status, link_doctype), link_names in groups.items():
+            names = list(link_names)
+            for i in range(0, len(names), self.UPDATE_BATCH_SIZE):
+                batch = names[i : i + self.UPDATE_BATCH_SIZE]
+
+                link_name = Case()
+                for inward_supply_name in batch:
+                    link_name = link_name.when(
+                        GSTR2.name == inward_supply_name, link_names[inward_supply_name]
+                    )
+
+                (
+                    frappe.qb.update(GSTR2)
+                    .set(GSTR2.match_status, match_status)
+                    .set(GSTR2.link_doctype, link_doctype)
+                    .set(GSTR2.link_name, link_name)
+                    .set(GSTR2.modified, modified)
+                    .set(GSTR2.modified_by, frappe.session.user)
+                    .where(GSTR2.name.isin(batch))
+                    .run()
+                )
+
+        self.matching_docs = {}
+
     def get_pan_level_data(self, data):
         out = {}
         for gstin, invoices in data.items():
-            pan = gstin[2:-3]
+            pan = BaseUtil.get_pan(gstin)
             out.setdefault(pan, {})
             out[pan].update(invoices)
 
         return out
 
+    def set_incremental(self):
+        """
+        Reconcile only suppliers having documents created or modified since
+        the last reconciliation with the same filters.
+        Unchanged suppliers were already reconciled and have no more matches.
+        """
+        self.modified_since = frappe.defaults.get_global_default(
+            self.get_watermark_key()
+        )
+
+    def update_watermark(self, timestamp):
+        """
+        Record the time when reconciliation with these filters was started.
+        """
+        frappe.defaults.set_global_default(self.get_watermark_key(), timestamp)
+
+    def get_watermark_key(self):
+        filters = "|".join(
+            str(getattr(self, field, None))
+            for field in (
+                "company",
+                "gst_return",
+                "purchase_from_date",
+                "purchase_to_date",
+                "inward_supply_from_date",
+                "inward_supply_to_date",
+                "include_ignored",
+            )
+        )
+
+        return "reconciliation_watermark_{0}_{1}".format(
+            self.company_gstin, hashlib.md5(filters.encode()).hexdigest()[:10]
+        )
+
+    def get_modified_suppliers_data(self, purchases, inward_supplies):
+        """
+        Returns data only for suppliers (with same PAN) having modified documents.
+        """
+        modified_since = get_datetime(self.modified_since)
+        pans = {
+            BaseUtil.get_pan(gstin)
+            for data in (purchases, inward_supplies)
+            for gstin, docs in data.items()
+            if any(doc.modified >= modified_since for doc in docs.values())
+        }
+
+        def filter_data(data):
+            return frappe._dict(
+                {
+                    gstin: docs
+                    for gstin, docs in data.items()
+                    if BaseUtil.get_pan(gstin) in pans
+                }
+            )
+
+        return filter_data(purchases), filter_data(inward_supplies)
+
+    def get_parallel_workers(self, inward_supplies):
+        """
+        Returns number of processes to reconcile with, if reconciliation should
+        be done in parallel.
+
+        Parallel mode is opt-in, with `ic_reconciliation_workers` in site config
+        set to more than 1. Processes are forked from the web or background
+        worker, so it is to be enabled only where that is known to be safe.
+        """
+        workers = cint(frappe.conf.ic_reconciliation_workers)
+        if workers <= 1:
+            return
+
+        count = sum(len(docs) for docs in inward_supplies.values())
+        if count < self.PARALLEL_THRESHOLD:
+            return
+
+        return workers
+
+    def reconcile_in_parallel(self, category, purchases, inward_supplies, workers):
+        """
+        Suppliers with the same PAN are reconciled independently of others.
+        Partitions are matched in a process pool and matches are merged
+        to be updated together.
+        """
+        partitions = self.get_partitions(purchases, inward_supplies, workers)
+        if len(partitions) <= 1:
+            return self.reconcile_data(category, purchases, inward_supplies)
+
+        # forked processes only do matching and do not use the db connection
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(partitions)),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    reconcile_partition,
+                    category,
+                    partition_purchases,
+                    partition_inward_supplies,
+                )
+                for partition_purchases, partition_inward_supplies in partitions
+            ]
+
+            for future in futures:
+                self.matching_docs.update(future.result())
+
+    @staticmethod
+    def get_partitions(purchases, inward_supplies, workers):
+        """
+        Split data into partitions of suppliers with the same PAN.
+        - Partitions are balanced by the number of inward supplies.
+        - Order of suppliers is retained within a partition.
+        """
+        weights = {}
+        for gstin, docs in inward_supplies.items():
+            pan = BaseUtil.get_pan(gstin)
+            weights[pan] = weights.get(pan, 0) + len(docs)
+
+        partitions = [
+            frappe._dict(weight=0, purchases={}, inward_supplies={})
+            for _ in range(workers)
+        ]
+
+        pan_partition = {}
+        for pan, weight in sorted(weights.items(), key=lambda row: -row[1]):
+            partition = min(partitions, key=lambda partition: partition.weight)
+            partition.weight += weight
+            pan_partition[pan] = partition
+
+        for gstin, docs in inward_supplies.items():
+            pan_partition[BaseUtil.get_pan(gstin)].inward_supplies[gstin] = docs
+
+        for gstin, docs in purchases.items():
+            # no inward supplies to match with
+            if partition := pan_partition.get(BaseUtil.get_pan(gstin)):
+                partition.purchases[gstin] = docs
+
+        return [
+            (partition.purchases, partition.inward_supplies)
+            for partition in partitions
+            if partition.purchases and partition.inward_supplies
+        ]
+
+
+def reconcile_partition(category, purchases, inward_supplies):
+    """
+    Reconcile a partition of suppliers and return the matches found.
+    Used with `Reconciler.reconcile_in_parallel`.
+    """
+    reconciler = Reconciler()
+    reconciler.reconcile_data(category, purchases, inward_supplies)
+    return reconciler.matching_docs
+
+
+class CandidateIndex:
+    """
+    Buckets inward supplies so that a purchase is only compared with
+    inward supplies that can possibly match it as per the rule.
+
+    - Fields with `Rule.EXACT_MATCH` form the bucket key.
+    - Taxable value with `Rule.ROUNDING_DIFFERENCE` is banded by its integer part,
+      so a purchase only looks into its own and the adjacent bands.
+
+    Candidates are returned in the original order of inward supplies
+    so that the results are identical to comparing every pair.
+    """
+
+    BAND_FIELD = Fields.TAXABLE_VALUE
+
+    def __init__(self, inward_supplies, rules):
+        self.exact_fields = tuple(
+            field.value for field, rule in rules.items() if rule == Rule.EXACT_MATCH
+        )
+        self.band_field = (
+            self.BAND_FIELD.value
+            if rules.get(self.BAND_FIELD) == Rule.ROUNDING_DIFFERENCE
+            else None
+        )
+
+        self.buckets = {}
+        self.position = {}
+        self.removed = set()
+
+        for position, inward_supply in enumerate(inward_supplies.values()):
+            self.position[inward_supply.name] = position
+            bands = self.buckets.setdefault(self.get_key(inward_supply), {})
+            bands.setdefault(self.get_band(inward_supply), []).append(inward_supply)
+
+    def get_candidates(self, purchase):
+        bands = self.buckets.get(self.get_key(purchase))
+        if not bands:
+            return []
+
+        band = self.get_band(purchase)
+        if band is None:
+            candidates = [doc for docs in bands.values() for doc in docs]
+
+        else:
+            candidates = []
+            # unbanded docs cannot be ruled out
+            for _band in (band - 1, band, band + 1, None):
+                candidates.extend(bands.get(_band, ()))
+
+        return sorted(
+            (doc for doc in candidates if doc.name not in self.removed),
+            key=lambda doc: self.position[doc.name],
+        )
+
+    def remove(self, inward_supply):
+        self.removed.add(inward_supply.name)
+
+    def get_key(self, doc):
+        return tuple(doc.get(field) for field in self.exact_fields)
+
+    def get_band(self, doc):
+        if not self.band_field:
+            return
+
+        value = doc.get(self.band_field)
+        if not isinstance(value, (int, float, Decimal)):
+            return
+
+        return floor(value)
+
+
+class FuzzyMatcher:
+    """
+    Scores (cleaned) bill_no of all purchases against all inward supplies at once.
+    - For a fuzzy match, bill date of invoice and inward supply should be within 10 days.
+    - First check for partial ratio, with 100% confidence
+    - Next check for approximate match, with 90% confidence
+    """
+
+    BATCH_SIZE = 1000
+    MAX_DAYS_DIFF = 10
+
+    def __init__(self, purchases, inward_supplies):
+        self.purchase_index = {name: i for i, name in enumerate(purchases)}
+        self.inward_supply_index = {name: i for i, name in enumerate(inward_supplies)}
+
+        purchase_bill_nos, purchase_days = self.get_bill_nos_and_days(purchases)
+        inward_supply_bill_nos, inward_supply_days = self.get_bill_nos_and_days(
+            inward_supplies
+        )
+
+        # only index pairs of matches are kept, as they are sparse
+        self.matches = set()
+
+        # batched to limit memory used by score matrices
+        for start in range(0, len(purchase_bill_nos), self.BATCH_SIZE):
+            end = start + self.BATCH_SIZE
+            purchase_indexes, inward_supply_indexes = np.nonzero(
+                self.get_matches(
+                    purchase_bill_nos[start:end],
+                    purchase_days[start:end],
+                    inward_supply_bill_nos,
+                    inward_supply_days,
+                )
+            )
+            self.matches.update(
+                zip((purchase_indexes + start).tolist(), inward_supply_indexes.tolist())
+            )
+
+    def get_matches(self, purchase_bill_nos, purchase_days, bill_nos, days):
+        partial_ratio = process.cdist(
+            purchase_bill_nos,
+            bill_nos,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=100,
+            workers=-1,
+        )
+        ratio = process.cdist(
+            purchase_bill_nos,
+            bill_nos,
+            scorer=fuzz.WRatio,
+            score_cutoff=90,
+            workers=-1,
+        )
+
+        matches = (partial_ratio >= 100) | (ratio >= 90)
+
+        # bill_no or bill_date not available
+        matches &= np.array([bool(bill_no) for bill_no in purchase_bill_nos])[:, None]
+        matches &= np.array([bool(bill_no) for bill_no in bill_nos])[None, :]
+
+        matches &= (
+            np.abs(np.array(purchase_days)[:, None] - np.array(days)[None, :])
+            <= self.MAX_DAYS_DIFF
+        )
+
+        return matches
+
+    def is_matching(self, purchase, inward_supply):
+        return (
+            self.purchase_index[purchase.name],
+            self.inward_supply_index[inward_supply.name],
+        ) in self.matches
+
+    @staticmethod
+    def get_bill_nos_and_days(docs):
+        bill_nos = []
+        days = []
+
+        for doc in docs.values():
+            if not doc.bill_no or not doc.bill_date:
+                bill_nos.append("")
+                days.append(0)
+                continue
+
+            if not doc._bill_no:
+                doc._bill_no = BaseUtil.get_cleaner_bill_no(doc.bill_no, doc.fy)
+
+            bill_nos.append(doc._bill_no)
+            days.append(doc.bill_date.toordinal())
+
+        return bill_nos, days
+
 
 class ReconciledData(BaseReconciliation):
     def __init__(self, **kwargs):
@@ -1095,6 +1483,11 @@ class ReconciledData(BaseReconciliation):
             "classification": "",
         }
 
+        self.set_gstin_party_map(reconciliation_data)
+
+        purchases = []
+        inward_supplies = []
+
         for data in reconciliation_data:
             data.update(default_dict)
             method = data.get if retain_doc else data.pop
@@ -1103,10 +1496,17 @@ class ReconciledData(BaseReconciliation):
             inward_supply = method("_inward_supply", frappe._dict())
 
             self.update_fields(data, purchase, inward_supply)
-            self.update_amount_difference(data, purchase, inward_supply)
-            self.update_differences(data, purchase, inward_supply)
 
-            if retain_doc and purchase:
+            purchases.append(purchase)
+            inward_supplies.append(inward_supply)
+
+        self.update_differences(reconciliation_data, purchases, inward_supplies)
+
+        if not retain_doc:
+            return
+
+        for purchase in purchases:
+            if purchase:
                 BaseUtil.update_cess_amount(purchase)
 
     def update_fields(self, data, purchase, inward_supply):
@@ -1141,34 +1541,92 @@ class ReconciledData(BaseReconciliation):
                 else "No Action"
             )
 
-    def update_amount_difference(self, data, purchase, inward_supply):
-        data.taxable_value_difference = rounded(
-            purchase.get("taxable_value", 0) - inward_supply.get("taxable_value", 0),
-            2,
+    def update_differences(self, reconciliation_data, purchases, inward_supplies):
+        """
+        Compute amount and field differences for all rows at once using arrays.
+        """
+        if not reconciliation_data:
+            return
+
+        fields = [field for field in Fields if field != Fields.BILL_NO]
+        columns = {"taxable_value", *GST_TAX_TYPES, *(field.value for field in fields)}
+
+        purchases = get_columns(purchases, columns)
+        inward_supplies = get_columns(inward_supplies, columns)
+        match_status = get_columns(reconciliation_data, ("match_status",))[
+            "match_status"
+        ]
+
+        taxable_value_difference = round_array(
+            get_amounts(purchases["taxable_value"])
+            - get_amounts(inward_supplies["taxable_value"])
+        )
+        tax_difference = round_array(
+            sum(get_amounts(purchases[tax]) for tax in GST_TAX_TYPES)
+            - sum(get_amounts(inward_supplies[tax]) for tax in GST_TAX_TYPES)
         )
 
-        data.tax_difference = rounded(
-            BaseUtil.get_total_tax(purchase) - BaseUtil.get_total_tax(inward_supply),
-            2,
+        is_exact_or_suggested_match = (
+            match_status == MatchStatus.EXACT_MATCH.value
+        ) | (match_status == MatchStatus.SUGGESTED_MATCH.value)
+        is_mismatch_or_manual_match = (match_status == MatchStatus.MISMATCH.value) | (
+            match_status == MatchStatus.MANUAL_MATCH.value
         )
 
-    def update_differences(self, data, purchase, inward_supply):
-        differences = []
-        if self.is_exact_or_suggested_match(data):
-            if self.has_rounding_difference(data):
-                differences.append("Rounding Difference")
+        # differences of each row are encoded as bits
+        # first bit for rounding difference, followed by a bit for each field
+        differences = is_exact_or_suggested_match & (
+            (np.abs(taxable_value_difference) > 0.01) | (np.abs(tax_difference) > 0.01)
+        )
+        differences = differences.astype(np.int64)
+
+        for bit, field in enumerate(fields, start=1):
+            is_different = purchases[field.value] != inward_supplies[field.value]
+            differences |= is_different.astype(np.int64) << bit
+
+        differences[~(is_exact_or_suggested_match | is_mismatch_or_manual_match)] = -1
+
+        # join labels once for each distinct set of differences
+        labels = ["Rounding Difference", *(field.name for field in fields)]
+        codes, indexes = np.unique(differences, return_inverse=True)
+        differences = [
+            ", ".join(label for bit, label in enumerate(labels) if code >> bit & 1)
+            if code >= 0
+            else ""
+            for code in codes.tolist()
+        ]
 
-        elif not self.is_mismatch_or_manual_match(data):
-            return
+        for data, taxable_value, tax, index in zip(
+            reconciliation_data,
+            taxable_value_difference.tolist(),
+            tax_difference.tolist(),
+            indexes.tolist(),
+        ):
+            data.taxable_value_difference = taxable_value
+            data.tax_difference = tax
+            data.differences = differences[index]
+
+    def set_gstin_party_map(self, reconciliation_data):
+        """
+        Resolve parties for all GSTINs without supplier name at once
+        """
+        gstins = set()
+        for data in reconciliation_data:
+            purchase = data.get("_purchase_invoice") or {}
+            inward_supply = data.get("_inward_supply") or {}
 
-        for field in Fields:
-            if field == Fields.BILL_NO:
+            if purchase.get("supplier_name") or inward_supply.get("supplier_name"):
                 continue
 
-            if purchase.get(field.value) != inward_supply.get(field.value):
-                differences.append(field.name)
+            gstins.add(
+                purchase.get("supplier_gstin") or inward_supply.get("supplier_gstin")
+            )
+
+        gstins.difference_update(self.gstin_party_map)
+        parties = get_parties_for_gstins(gstins)
 
-        data.differences = ", ".join(differences)
+        for gstin in gstins:
+            self.gstin_party_map[gstin] = parties.get(gstin) or "Unknown"
 
     def guess_supplier_name(self, gstin):
         if party := self.gstin_party_map.get(gstin):
@@ -1197,25 +1655,44 @@ class ReconciledData(BaseReconciliation):
 
         return classification
 
-    @staticmethod
-    def is_exact_or_suggested_match(data):
-        return data.match_status in (
-            MatchStatus.EXACT_MATCH.value,
-            MatchStatus.SUGGESTED_MATCH.value,
-        )
 
-    @staticmethod
-    def is_mismatch_or_manual_match(data):
-        return data.match_status in (
-            MatchStatus.MISMATCH.value,
-            MatchStatus.MANUAL_MATCH.value,
-        )
+def get_columns(docs, fields):
+    """
+    Returns a dict of field and array of its values in docs
+    """
+    fields = list(fields)
+    values = np.empty((len(docs), len(fields)), dtype=object)
+    values[:] = [tuple(map(doc.get, fields)) for doc in docs]
 
-    @staticmethod
-    def has_rounding_difference(data):
-        return (
-            abs(data.taxable_value_difference) > 0.01 or abs(data.tax_difference) > 0.01
-        )
+    return {field: values[:, i] for i, field in enumerate(fields)}
+
+
+def get_amounts(values):
+    return np.where(np.equal(values, None), 0, values).astype(float)
+
+
+def round_array(values, precision=2):
+    """
+    Round values as per `frappe.utils.rounded` for an array
+    """
+    rounding_method = (
+        frappe.get_system_settings("rounding_method") or "Banker's Rounding (legacy)"
+    )
+
+    multiplier = 10**precision
+    values = np.round(values * multiplier, 8)
+
+    if rounding_method == "Banker's Rounding (legacy)" and precision:
+        # halves are rounded up
+        values = np.floor(values + 0.5)
+    elif rounding_method in ("Banker's Rounding", "Banker's Rounding (legacy)"):
+        values = np.round(values)
+    elif rounding_method == "Commercial Rounding":
+        values = np.sign(values) * np.floor(np.abs(values) + 0.5)
+    else:
+        return np.array([rounded(value, precision) for value in values / multiplier])
+
+    return values / multiplier
 
 
 class BaseUtil:
@@ -1230,6 +1707,13 @@ class BaseUtil:
 
         return f"{date.year}-{date.year + 1}"
 
+    @staticmethod
+    def get_pan(gstin):
+        if not gstin:
+            return gstin
+
+        return gstin[2:-3]
+
     @staticmethod
     def get_cleaner_bill_no(bill_no, fy):
         """
@@ -93,6 +93,14 @@ frappe.ui.form.on("Purchase Reconciliation Tool", {
         frm.disable_save();
         frm.page.set_primary_action(__("Reconcile"), () => frm.save());
 
+        // only modified suppliers are reconciled on save
+        if (frm.doc.__onload?.incremental_reconciliation) {
+            frm.add_custom_button(__("Reconcile All"), async () => {
+                await frm.call("reconcile_all");
+                frm.events.after_save(frm);
+            });
+        }
+
         // add custom buttons
         api_enabled
             ? frm.add_custom_button(__("Download 2A/2B"), () => new ImportDialog(frm))
@@ -101,7 +109,7 @@ frappe.ui.form.on("Purchase Reconciliation Tool", {
                   () => new ImportDialog(frm, false)
               );
 
-        if (!frm.purchase_reconciliation_tool?.data?.length) return;
+        if (!frm.purchase_reconciliation_tool?.has_data()) return;
         if (frm.get_active_tab()?.df.fieldname == "invoice_tab") {
             frm.add_custom_button(
                 __("Unlink"),
@@ -208,40 +216,95 @@ frappe.ui.form.on("Purchase Reconciliation Tool", {
     },
 });
 
+// data is filtered, summarised and paginated on server
+const PAGE_LENGTH = 500;
+const TAB_METHODS = {
+    invoice: "get_invoice_data",
+    supplier: "get_supplier_summary",
+    summary: "get_match_summary",
+};
+
+// fields to sort by on server, for columns with computed values
+const SORT_FIELDS = {
+    supplier_name_gstin: "supplier_name",
+    action_taken: "action_taken_count",
+};
+
 class PurchaseReconciliationTool {
     constructor(frm) {
         this.init(frm);
         this.render_tab_group();
         this.setup_filter_button();
         this.render_data_tables();
+        if (this.has_data()) this.refresh(this.summary);
     }
 
     init(frm) {
         this.frm = frm;
-        this.data = frm.doc.reconciliation_data
+
+        // only match summary is saved with the document
+        this.summary = frm.doc.reconciliation_data
             ? JSON.parse(frm.doc.reconciliation_data)
             : [];
-        this.filtered_data = this.data;
+        this.filter_options = {};
+        this.sort = {};
         this.$wrapper = this.frm.get_field("reconciliation_html").$wrapper;
         this._tabs = ["invoice", "supplier", "summary"];
     }
 
-    refresh(data) {
-        if (data) {
-            this.data = data;
-            this.refresh_filter_fields();
+    has_data() {
+        return !!this.summary?.length;
+    }
+
+    async refresh(summary) {
+        if (summary) {
+            this.summary = summary;
+            await this.refresh_filter_fields();
         }
 
-        this.apply_filters(!!data);
+        this.filters = this.get_filters();
+        await Promise.all(this._tabs.map(tab => this.load_data(tab)));
+    }
 
-        // data unchanged!
-        if (this.rendered_data == this.filtered_data) return;
+    async load_data(tab, start = 0) {
+        const filters = this.filters;
+        const sort = this.sort[tab];
+        const datatable = this.tabs[`${tab}_tab`];
 
-        this._tabs.forEach(tab => {
-            this.tabs[`${tab}_tab`].refresh(this[`get_${tab}_data`]());
+        const { message } = await this.frm.call(TAB_METHODS[tab], {
+            filters,
+            start,
+            page_length: PAGE_LENGTH,
+            ...sort,
         });
 
-        this.rendered_data = this.filtered_data;
+        // filters or sorting changed while loading
+        if (filters !== this.filters || sort !== this.sort[tab]) return;
+
+        const { data, total } = Array.isArray(message)
+            ? { data: message, total: message.length }
+            : message;
+
+        const rows = this[`get_${tab}_data`](data, !!start);
+        datatable.refresh(start ? datatable.data.concat(rows) : rows);
+        datatable.$load_more?.toggle(datatable.data.length < total);
+    }
+
+    sort_data(tab, column) {
+        // only a page is loaded, so rows are sorted on server
+        this.sort[tab] =
+            column.sortOrder == "none"
+                ? undefined
+                : {
+                      sort_by: SORT_FIELDS[column.field] || column.field,
+                      sort_order: column.sortOrder,
+                  };
+
+        this.load_data(tab);
+    }
+
+    get_filters() {
+        return this.filter_group.filters.length ? this.filter_group.get_filters() : [];
     }
 
     render_tab_group() {
@@ -371,51 +434,49 @@ class PurchaseReconciliationTool {
         return fields;
     }
 
-    refresh_filter_fields() {
+    async refresh_filter_fields() {
+        const { message } = await this.frm.call("get_filter_options");
+        this.filter_options = message || {};
         this.filter_group.filter_options.filter_fields = this.get_filter_fields();
     }
 
     get_autocomplete_options(field) {
-        const options = [];
-        this.data.forEach(row => {
-            if (row[field] && !options.includes(row[field])) options.push(row[field]);
-        });
-        return options;
+        return this.filter_options[field] || [];
     }
 
-    apply_filters(force, supplier_filter) {
-        const has_filters = this.filter_group.filters.length > 0 || supplier_filter;
-        if (!has_filters) {
-            this.filters = null;
-            this.filtered_data = this.data;
-            return;
-        }
+    render_data_tables() {
+        this._tabs.forEach(tab => {
+            const $wrapper = this.tab_group.get_field(`${tab}_data`).$wrapper;
+            const datatable = (this.tabs[`${tab}_tab`] =
+                new india_compliance.DataTableManager({
+                    $wrapper,
+                    columns: this[`get_${tab}_columns`](),
+                    data: [],
+                    options: {
+                        cellHeight: 55,
+                        // summary is never paginated
+                        ...(tab != "summary" && {
+                            events: {
+                                onSortColumn: column => this.sort_data(tab, column),
+                            },
+                        }),
+                    },
+                }));
 
-        let filters = this.filter_group.get_filters();
-        if (supplier_filter) filters.push(supplier_filter);
-        if (!force && this.filters === filters) return;
+            // summary is never paginated
+            if (tab == "summary") return;
 
-        this.filters = filters;
-        this.filtered_data = this.data.filter(row => {
-            return filters.every(filter =>
-                india_compliance.FILTER_OPERATORS[filter[2]](
-                    filter[3] || "",
-                    row[filter[1]] || ""
-                )
-            );
-        });
-    }
+            datatable.$load_more = $(
+                `<div class="text-center mt-3">
+                    <button class="btn btn-default btn-sm">${__("Load More")}</button>
+                </div>`
+            )
+                .hide()
+                .insertAfter($wrapper);
 
-    render_data_tables() {
-        this._tabs.forEach(tab => {
-            this.tabs[`${tab}_tab`] = new india_compliance.DataTableManager({
-                $wrapper: this.tab_group.get_field(`${tab}_data`).$wrapper,
-                columns: this[`get_${tab}_columns`](),
-                data: this[`get_${tab}_data`](),
-                options: {
-                    cellHeight: 55,
-                },
-            });
+            datatable.$load_more.on("click", "button", () =>
+                this.load_data(tab, datatable.data.length)
+            );
         });
         this.set_listeners();
     }
@@ -485,73 +546,26 @@ class PurchaseReconciliationTool {
     }
 
     export_data(selected_row) {
-        this.data_to_export = this.get_filtered_data(selected_row);
-        if (selected_row) delete this.data_to_export.supplier_summary;
-
         const url =
             "india_compliance.gst_india.doctype.purchase_reconciliation_tool.purchase_reconciliation_tool.download_excel_report";
 
-        open_url_post(`/api/method/${url}`, {
-            data: JSON.stringify(this.data_to_export),
+        india_compliance.export_excel(url, {
+            data: JSON.stringify(this.get_export_args(selected_row)),
             doc: JSON.stringify(this.frm.doc),
             is_supplier_specific: !!selected_row,
         });
     }
 
-    get_filtered_data(selected_row = null) {
-        let supplier_filter = null;
-
-        if (selected_row) {
-            supplier_filter = [
-                this.frm.doctype,
-                "supplier_gstin",
-                "=",
-                selected_row.supplier_gstin,
-                false,
-            ];
-        }
-
-        this.apply_filters(true, supplier_filter);
-
-        const purchases = [];
-        const inward_supplies = [];
-
-        this.filtered_data.forEach(row => {
-            if (row.inward_supply_name) inward_supplies.push(row.inward_supply_name);
-            if (row.purchase_invoice_name) purchases.push(row.purchase_invoice_name);
-        });
-
+    get_export_args(selected_row = null) {
+        // data to export is built on server
         return {
-            match_summary: this.get_summary_data(),
-            supplier_summary: this.get_supplier_data(),
-            purchases: purchases,
-            inward_supplies: inward_supplies,
+            filters: this.get_filters(),
+            supplier_gstin: selected_row?.supplier_gstin,
         };
     }
 
-    get_summary_data() {
-        const data = {};
-        this.filtered_data.forEach(row => {
-            let new_row = data[row.match_status];
-            if (!new_row) {
-                new_row = data[row.match_status] = {
-                    match_status: row.match_status,
-                    inward_supply_count: 0,
-                    purchase_count: 0,
-                    action_taken_count: 0,
-                    total_docs: 0,
-                    tax_difference: 0,
-                    taxable_value_difference: 0,
-                };
-            }
-            if (row.inward_supply_name) new_row.inward_supply_count += 1;
-            if (row.purchase_invoice_name) new_row.purchase_count += 1;
-            if (row.action != "No Action") new_row.action_taken_count += 1;
-            new_row.total_docs += 1;
-            new_row.tax_difference += row.tax_difference || 0;
-            new_row.taxable_value_difference += row.taxable_value_difference || 0;
-        });
-        return Object.values(data);
+    get_summary_data(data) {
+        return data;
     }
 
     get_summary_columns() {
@@ -605,31 +619,11 @@ class PurchaseReconciliationTool {
         ];
     }
 
-    get_supplier_data() {
-        const data = {};
-        this.filtered_data.forEach(row => {
-            let new_row = data[row.supplier_gstin];
-            if (!new_row) {
-                new_row = data[row.supplier_gstin] = {
-                    supplier_name_gstin: this.get_supplier_name_gstin(row),
-                    supplier_name: row.supplier_name,
-                    supplier_gstin: row.supplier_gstin,
-                    inward_supply_count: 0,
-                    purchase_count: 0,
-                    action_taken_count: 0,
-                    total_docs: 0,
-                    tax_difference: 0,
-                    taxable_value_difference: 0,
-                };
-            }
-            if (row.inward_supply_name) new_row.inward_supply_count += 1;
-            if (row.purchase_invoice_name) new_row.purchase_count += 1;
-            if (row.action != "No Action") new_row.action_taken_count += 1;
-            new_row.total_docs += 1;
-            new_row.tax_difference += row.tax_difference || 0;
-            new_row.taxable_value_difference += row.taxable_value_difference || 0;
+    get_supplier_data(data) {
+        data.forEach(row => {
+            row.supplier_name_gstin = this.get_supplier_name_gstin(row);
         });
-        return Object.values(data);
+        return data;
     }
 
     get_supplier_columns() {
@@ -695,13 +689,13 @@ class PurchaseReconciliationTool {
         ];
     }
 
-    get_invoice_data() {
-        this.mapped_invoice_data = {};
-        this.filtered_data.forEach(row => {
+    get_invoice_data(data, append = false) {
+        if (!append) this.mapped_invoice_data = {};
+        data.forEach(row => {
             this.mapped_invoice_data[get_hash(row)] = row;
             row.supplier_name_gstin = this.get_supplier_name_gstin(row);
         });
-        return this.filtered_data;
+        return data;
     }
 
     get_invoice_columns() {
@@ -1345,7 +1339,7 @@ class EmailDialog {
     }
 
     get_attachment() {
-        const export_data = this.frm.purchase_reconciliation_tool.get_filtered_data(
+        const export_data = this.frm.purchase_reconciliation_tool.get_export_args(
             this.data
         );
 
@@ -1461,23 +1455,14 @@ purchase_reconciliation_tool.link_documents = async function (
 ) {
     if (frm.get_active_tab()?.df.fieldname != "invoice_tab") return;
 
-    // link documents & update data.
-    const { message: r } = await frm.call("link_documents", {
+    // link documents & reload data.
+    await frm.call("link_documents", {
         purchase_invoice_name,
         inward_supply_name,
         link_doctype,
     });
-    const reco_tool = frm.purchase_reconciliation_tool;
-    const new_data = reco_tool.data.filter(
-        row =>
-            !(
-                row.purchase_invoice_name == purchase_invoice_name ||
-                row.inward_supply_name == inward_supply_name
-            )
-    );
-    new_data.push(...r);
 
-    reco_tool.refresh(new_data);
+    await frm.purchase_reconciliation_tool.refresh();
     if (alert)
         after_successful_action(frm.purchase_reconciliation_tool.tabs.invoice_tab);
 };
@@ -1503,38 +1488,17 @@ async function unlink_documents(frm, selected_rows) {
             );
     });
 
-    // unlink documents & update table
-    const { message: r } = await frm.call("unlink_documents", selected_rows);
-    const unlinked_docs = get_unlinked_docs(selected_rows);
-
-    const reco_tool = frm.purchase_reconciliation_tool;
-    const new_data = reco_tool.data.filter(
-        row =>
-            !(
-                unlinked_docs.has(row.purchase_invoice_name) ||
-                unlinked_docs.has(row.inward_supply_name)
-            )
-    );
-    new_data.push(...r);
-    reco_tool.refresh(new_data);
+    // unlink documents & reload table
+    await frm.call("unlink_documents", selected_rows);
+    await frm.purchase_reconciliation_tool.refresh();
     after_successful_action(invoice_tab);
 }
 
-function get_unlinked_docs(selected_rows) {
-    const unlinked_docs = new Set();
-    selected_rows.forEach(row => {
-        unlinked_docs.add(row.purchase_invoice_name);
-        unlinked_docs.add(row.inward_supply_name);
-    });
-
-    return unlinked_docs;
-}
-
 function deepcopy(array) {
     return JSON.parse(JSON.stringify(array));
 }
 
-function apply_action(frm, action, selected_rows) {
+async function apply_action(frm, action, selected_rows) {
     const active_tab = frm.get_active_tab()?.df.fieldname;
     if (!active_tab) return;
 
@@ -1542,8 +1506,12 @@ function apply_action(frm, action, selected_rows) {
     if (!selected_rows) selected_rows = tab.get_checked_items();
 
     // get affected rows
-    const { filtered_data, data } = frm.purchase_reconciliation_tool;
-    let affected_rows = get_affected_rows(active_tab, selected_rows, filtered_data);
+    let affected_rows = await get_affected_rows(
+        frm,
+        active_tab,
+        selected_rows,
+        frm.purchase_reconciliation_tool.filters
+    );
 
     if (!affected_rows.length)
         return frappe.show_alert({
@@ -1586,14 +1554,9 @@ function apply_action(frm, action, selected_rows) {
             );
     }
 
-    // update affected rows to backend and frontend
-    frm.call("apply_action", { data: affected_rows, action });
-    const new_data = data.filter(row => {
-        if (has_matching_row(row, affected_rows)) row.action = action;
-        return true;
-    });
-
-    frm.purchase_reconciliation_tool.refresh(new_data);
+    // update affected rows to backend and reload
+    await frm.call("apply_action", { data: affected_rows, action });
+    await frm.purchase_reconciliation_tool.refresh();
     after_successful_action(tab);
 }
 
@@ -1605,23 +1568,20 @@ function after_successful_action(tab) {
     });
 }
 
-function has_matching_row(row, array) {
-    return array.filter(item => JSON.stringify(item) === JSON.stringify(row)).length;
-}
-
-function get_affected_rows(tab, selection, data) {
+async function get_affected_rows(frm, tab, selection, filters) {
     if (tab == "invoice_tab") return selection;
+    if (!selection.length) return [];
+
+    const fieldname = tab == "supplier_tab" ? "supplier_gstin" : "match_status";
+    const { message } = await frm.call("get_invoice_data", {
+        filters: [
+            ...(filters || []),
+            [frm.doctype, fieldname, "in", selection.map(row => row[fieldname])],
+        ],
+        page_length: 0,
+    });
 
-    if (tab == "supplier_tab")
-        return data.filter(
-            inv =>
-                selection.filter(row => row.supplier_gstin == inv.supplier_gstin).length
-        );
-
-    if (tab == "summary_tab")
-        return data.filter(
-            inv => selection.filter(row => row.match_status == inv.match_status).length
-        );
+    return message.data;
 }
 
 async function create_new_purchase_invoice(row, company, company_gstin) {
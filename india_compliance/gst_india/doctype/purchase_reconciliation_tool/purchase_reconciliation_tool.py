@@ -1,12 +1,16 @@
 # Copyright (c) 2022, Resilient Tech and contributors
 # For license information, please see license.txt
 
+import hashlib
 import json
+import re
 from typing import List
 
 import frappe
 from frappe.model.document import Document
 from frappe.query_builder.functions import IfNull
+from frappe.utils import cint, cstr, flt
+from frappe.utils.file_manager import get_file_path
 from frappe.utils.response import json_handler
 
 from india_compliance.gst_india.constants import ORIGINAL_VS_AMENDED
@@ -17,8 +21,12 @@ from india_compliance.gst_india.doctype.purchase_reconciliation_tool import (
     ReconciledData,
     Reconciler,
 )
-from india_compliance.gst_india.utils import get_json_from_file, get_timespan_date_range
-from india_compliance.gst_india.utils.exporter import ExcelExporter
+from india_compliance.gst_india.utils import get_timespan_date_range
+from india_compliance.gst_india.utils.exporter import (
+    ExcelExporter,
+    clear_export_cache,
+    enqueue_export,
+)
 from india_compliance.gst_india.utils.gstr import (
     IMPORT_CATEGORY,
     GSTRCategory,
@@ -26,9 +34,9 @@ from india_compliance.gst_india.utils.gstr import (
     ReturnType,
     download_gstr_2a,
     download_gstr_2b,
-    save_gstr_2a,
-    save_gstr_2b,
+    save_gstr_from_file,
 )
+from india_compliance.gst_india.utils.gstr.gstr_file import GSTRFile
 
 STATUS_MAP = {
     "Accept My Values": "Reconciled",
@@ -37,6 +45,28 @@ STATUS_MAP = {
     "Ignore": "Ignored",
 }
 
+EXCEL_REPORT_BUILDER = "india_compliance.gst_india.doctype.purchase_reconciliation_tool.purchase_reconciliation_tool.build_excel_report"
+
+# Reconciled data is cached on server and served to the browser in pages.
+# Each page still loads, filters and sorts all cached rows. For 100k rows, this
+# is about 0.5 to 0.8 seconds per page, mostly for loading the cached rows.
+RECONCILIATION_DATA_EXPIRY = 60 * 60
+PAGE_LENGTH = 500
+
+FILTER_OPERATORS = {
+    "=": lambda expected, value: _compare(value, expected) == 0,
+    "!=": lambda expected, value: _compare(value, expected) != 0,
+    ">": lambda expected, value: _compare(value, expected) > 0,
+    "<": lambda expected, value: _compare(value, expected) < 0,
+    ">=": lambda expected, value: _compare(value, expected) >= 0,
+    "<=": lambda expected, value: _compare(value, expected) <= 0,
+    "like": lambda expected, value: _like(expected, value),
+    "not like": lambda expected, value: not _like(expected, value),
+    "in": lambda expected, value: cstr(value) in _get_values(expected),
+    "not in": lambda expected, value: cstr(value) not in _get_values(expected),
+    "is": lambda expected, value: bool(value) == (expected == "set"),
+}
+
 
 class PurchaseReconciliationTool(Document):
     def __init__(self, *args, **kwargs):
@@ -66,34 +96,182 @@ class PurchaseReconciliationTool(Document):
             "has_missing_2b_documents",
             has_missing_2b_documents(date_range, ReturnType.GSTR2B, self.company_gstin),
         )
+        self.set_onload(
+            "incremental_reconciliation",
+            cint(frappe.conf.ic_incremental_reconciliation),
+        )
 
     def validate(self):
         # reconcile purchases and inward supplies
         if frappe.flags.in_install or frappe.flags.in_migrate:
             return
 
+        self.reconcile(
+            incremental=cint(frappe.conf.ic_incremental_reconciliation)
+            and not self.flags.full_reconciliation
+        )
+
+    def reconcile(self, incremental=False):
+        """
+        Reconcile purchases and inward supplies and cache reconciled data.
+
+        :param incremental: reconcile only suppliers having documents modified
+            since the last reconciliation with the same filters
+        """
+        reconciled_on = frappe.utils.now()
+
         _Reconciler = Reconciler(**self.get_reco_doc())
+        if incremental:
+            _Reconciler.set_incremental()
+
         for row in ORIGINAL_VS_AMENDED:
             _Reconciler.reconcile(row["original"], row["amended"])
 
+        _Reconciler.update_watermark(reconciled_on)
+
         self.ReconciledData = ReconciledData(**self.get_reco_doc())
+        data = self.ReconciledData.get()
+        self.cache_reconciliation_data(data)
+        clear_export_cache(EXCEL_REPORT_BUILDER, self.get_reco_doc_hash())
+
+        # only summary is saved, data is loaded in pages
         self.reconciliation_data = json.dumps(
-            self.ReconciledData.get(), default=json_handler
+            get_summary(data, "match_status"), default=json_handler
         )
 
         self.db_set("is_modified", 0)
 
     @frappe.whitelist()
-    def upload_gstr(self, return_type, period, file_path):
+    def reconcile_all(self):
+        """Reconcile all suppliers, even where incremental reconciliation is enabled"""
         frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
 
-        return_type = ReturnType(return_type)
-        json_data = get_json_from_file(file_path)
-        if return_type == ReturnType.GSTR2A:
-            return save_gstr_2a(self.company_gstin, period, json_data)
+        self.flags.full_reconciliation = True
+        self.save()
+
+    def get_reconciliation_data(self):
+        data = frappe.cache.get_value(self.get_reconciliation_data_key())
+        if data is None:
+            data = self.ReconciledData.get()
+            self.cache_reconciliation_data(data)
+
+        return data
+
+    def cache_reconciliation_data(self, data):
+        frappe.cache.set_value(
+            self.get_reconciliation_data_key(),
+            data,
+            expires_in_sec=RECONCILIATION_DATA_EXPIRY,
+        )
+
+    def update_reconciliation_data(self, purchases, inward_supplies, new_data):
+        """
+        Replace rows of given purchases and inward supplies in cached data
+        """
+        clear_export_cache(EXCEL_REPORT_BUILDER, self.get_reco_doc_hash())
+
+        key = self.get_reconciliation_data_key()
+        if (data := frappe.cache.get_value(key)) is None:
+            return
+
+        purchases = set(purchases)
+        inward_supplies = set(inward_supplies)
+
+        data = [
+            row
+            for row in data
+            if row.purchase_invoice_name not in purchases
+            and row.inward_supply_name not in inward_supplies
+        ]
+        data.extend(new_data)
+
+        self.cache_reconciliation_data(data)
 
-        if return_type == ReturnType.GSTR2B:
-            return save_gstr_2b(self.company_gstin, period, json_data)
+    def get_reconciliation_data_key(self):
+        return "purchase_reconciliation_data:" + self.get_reco_doc_hash()
+
+    def get_reco_doc_hash(self):
+        reco_doc = json.dumps(self.get_reco_doc(), default=str, sort_keys=True)
+        return hashlib.md5(reco_doc.encode()).hexdigest()
+
+    def get_filtered_data(self, filters=None):
+        data = self.get_reconciliation_data()
+
+        if filters := frappe.parse_json(filters):
+            data = [row for row in data if matches_filters(row, filters)]
+
+        return data
+
+    @frappe.whitelist()
+    def get_match_summary(self, filters=None):
+        frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
+
+        return get_summary(self.get_filtered_data(filters), "match_status")
+
+    @frappe.whitelist()
+    def get_supplier_summary(
+        self,
+        filters=None,
+        start=0,
+        page_length=PAGE_LENGTH,
+        sort_by=None,
+        sort_order=None,
+    ):
+        frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
+
+        data = get_summary(
+            self.get_filtered_data(filters), "supplier_gstin", ("supplier_name",)
+        )
+        return paginate(data, start, page_length, sort_by, sort_order)
+
+    @frappe.whitelist()
+    def get_invoice_data(
+        self,
+        filters=None,
+        start=0,
+        page_length=PAGE_LENGTH,
+        sort_by=None,
+        sort_order=None,
+    ):
+        frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
+
+        return paginate(
+            self.get_filtered_data(filters), start, page_length, sort_by, sort_order
+        )
+
+    @frappe.whitelist()
+    def get_filter_options(self):
+        frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
+
+        data = self.get_reconciliation_data()
+        return {
+            field: sorted({row[field] for row in data if row.get(field)})
+            for field in ("supplier_name", "supplier_gstin")
+        }
+
+    def get_export_data(self, filters=None, supplier_gstin=None):
+        filters = frappe.parse_json(filters) or []
+        if supplier_gstin:
+            filters.append([self.doctype, "supplier_gstin", "=", supplier_gstin])
+
+        data = self.get_filtered_data(filters)
+
+        return {
+            "match_summary": get_summary(data, "match_status"),
+            "supplier_summary": get_summary(data, "supplier_gstin", ("supplier_name",)),
+            "purchases": [
+                row.purchase_invoice_name for row in data if row.purchase_invoice_name
+            ],
+            "inward_supplies": [
+                row.inward_supply_name for row in data if row.inward_supply_name
+            ],
+        }
+
+    @frappe.whitelist()
+    def upload_gstr(self, return_type, period, file_path):
+        frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
+
+        return save_gstr_from_file(self.company_gstin, return_type, period, file_path)
 
     @frappe.whitelist()
     def download_gstr_2a(self, date_range, force=False, otp=None):
@@ -207,12 +385,12 @@ class PurchaseReconciliationTool(Document):
 
         return_type = ReturnType(return_type)
         try:
-            json_data = get_json_from_file(file_path)
+            gstr_file = GSTRFile(get_file_path(file_path))
             if return_type == ReturnType.GSTR2A:
-                return json_data.get("fp")
+                return gstr_file.get_value("fp")
 
             if return_type == ReturnType.GSTR2B:
-                return json_data.get("data").get("rtnprd")
+                return gstr_file.get_value("data.rtnprd")
 
         except Exception:
             pass
@@ -238,6 +416,10 @@ class PurchaseReconciliationTool(Document):
             "has_missing_2b_documents",
             has_missing_2b_documents(date_range, ReturnType.GSTR2B, self.company_gstin),
         )
+        self.set_onload(
+            "incremental_reconciliation",
+            cint(frappe.conf.ic_incremental_reconciliation),
+        )
 
         return date_range
 
@@ -289,7 +471,10 @@ class PurchaseReconciliationTool(Document):
 
         self.db_set("is_modified", 1)
 
-        return self.ReconciledData.get(purchases, inward_supplies)
+        data = self.ReconciledData.get(purchases, inward_supplies)
+        self.update_reconciliation_data(purchases, inward_supplies, data)
+
+        return data
 
     @frappe.whitelist()
     def unlink_documents(self, data):
@@ -316,7 +501,11 @@ class PurchaseReconciliationTool(Document):
 
         self.db_set("is_modified", 1)
 
-        return self.ReconciledData.get(purchases.union(boe), inward_supplies)
+        purchases = purchases.union(boe)
+        data = self.ReconciledData.get(purchases, inward_supplies)
+        self.update_reconciliation_data(purchases, inward_supplies, data)
+
+        return data
 
     def set_reconciliation_status(self, doctype, names, status):
         if not names:
@@ -387,6 +576,13 @@ class PurchaseReconciliationTool(Document):
 
         self.db_set("is_modified", 1)
 
+        purchases.extend(boe)
+        self.update_reconciliation_data(
+            purchases,
+            inward_supplies,
+            self.ReconciledData.get(purchases, inward_supplies),
+        )
+
     @frappe.whitelist()
     def get_link_options(self, doctype, filters):
         frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
@@ -465,6 +661,113 @@ class PurchaseReconciliationTool(Document):
         return data
 
 
+def get_summary(data, group_by, fields=()):
+    """
+    Summarise reconciliation data, grouped by given field
+    """
+    summary = {}
+    for row in data:
+        key = row.get(group_by)
+        if not (group := summary.get(key)):
+            group = summary[key] = frappe._dict(
+                {
+                    group_by: key,
+                    **{field: row.get(field) for field in fields},
+                    "inward_supply_count": 0,
+                    "purchase_count": 0,
+                    "action_taken_count": 0,
+                    "total_docs": 0,
+                    "tax_difference": 0,
+                    "taxable_value_difference": 0,
+                }
+            )
+
+        if row.inward_supply_name:
+            group.inward_supply_count += 1
+
+        if row.purchase_invoice_name:
+            group.purchase_count += 1
+
+        if row.action != "No Action":
+            group.action_taken_count += 1
+
+        group.total_docs += 1
+        group.tax_difference += flt(row.tax_difference)
+        group.taxable_value_difference += flt(row.taxable_value_difference)
+
+    return list(summary.values())
+
+
+def paginate(data, start=0, page_length=PAGE_LENGTH, sort_by=None, sort_order=None):
+    """
+    Returns a page of data with total count.
+    All rows are returned if `page_length` is 0.
+    """
+    if sort_by:
+        data = sorted(
+            data,
+            key=lambda row: _get_sort_key(row.get(sort_by)),
+            reverse=sort_order == "desc",
+        )
+
+    start = cint(start)
+    page_length = cint(page_length)
+
+    return {
+        "data": data[start : start + page_length] if page_length else data[start:],
+        "total": len(data),
+    }
+
+
+def matches_filters(row, filters):
+    """
+    Filters as per `india_compliance.FILTER_OPERATORS`, in the format
+    [doctype, fieldname, operator, value]
+    """
+    for _doctype, fieldname, operator, value, *_ in filters:
+        row_value = row.get(fieldname)
+        if not FILTER_OPERATORS[operator](
+            "" if value is None else value, "" if row_value is None else row_value
+        ):
+            return False
+
+    return True
+
+
+def _compare(value, expected):
+    # numbers are compared numerically
+    if isinstance(value, (int, float)):
+        expected = flt(expected)
+    else:
+        value, expected = cstr(value), cstr(expected)
+
+    return (value > expected) - (value < expected)
+
+
+def _get_sort_key(value):
+    # numbers are sorted before strings
+    if isinstance(value, (int, float)):
+        return (0, value)
+
+    return (1, cstr(value))
+
+
+def _like(expected, value):
+    """
+    Case-insensitive match for pattern with `%` as wildcard.
+    Pattern without `%` is matched exactly.
+    """
+    pattern = ".*".join(re.escape(part) for part in cstr(expected).lower().split("%"))
+    return re.fullmatch(pattern, cstr(value).lower(), flags=re.DOTALL) is not None
+
+
+def _get_values(values):
+    if isinstance(values, str):
+        values = values.split(",")
+
+    return {cstr(value).strip() for value in values}
+
+
 def get_import_history(
     company_gstin, return_type: ReturnType, periods: List[str], fields=None, pluck=None
 ):
@@ -541,8 +844,21 @@ def generate_excel_attachment(data, doc):
 def download_excel_report(data, doc, is_supplier_specific=False):
     frappe.has_permission("Purchase Reconciliation Tool", "export", throw=True)
 
+    return enqueue_export(
+        EXCEL_REPORT_BUILDER,
+        attached_to_doctype="Purchase Reconciliation Tool",
+        attached_to_name="Purchase Reconciliation Tool",
+        # cleared when data for these filters is reconciled again
+        scope=frappe.get_doc(frappe.parse_json(doc)).get_reco_doc_hash(),
+        data=data,
+        doc=doc,
+        is_supplier_specific=is_supplier_specific,
+    )
+
+
+def build_excel_report(data, doc, is_supplier_specific=False):
     build_data = BuildExcel(doc, data, is_supplier_specific)
-    build_data.export_data()
+    return build_data.build_excel(), build_data.get_file_name()
 
 
 def parse_params(fun):
@@ -583,6 +899,12 @@ class BuildExcel:
         :param is_supplier_specific: if true, data will be downloded for specific supplier
         :param email: send the file as email
         """
+        if "purchases" not in data:
+            # data is filtered and summarised on server
+            data = frappe.get_doc(doc).get_export_data(
+                data.get("filters"), data.get("supplier_gstin")
+            )
+
         self.doc = doc
         self.data = data
         self.is_supplier_specific = is_supplier_specific
@@ -592,6 +914,16 @@ class BuildExcel:
 
     def export_data(self):
         """Exports data to an excel file"""
+        excel = self.build_excel()
+
+        file_name = self.get_file_name()
+        if self.email:
+            xlsx_data = excel.save_workbook()
+            return [xlsx_data, file_name]
+
+        excel.export(file_name)
+
+    def build_excel(self):
         excel = ExcelExporter()
         excel.create_sheet(
             sheet_name="Match Summary Data",
@@ -617,13 +949,7 @@ class BuildExcel:
         )
 
         excel.remove_sheet("Sheet")
-
-        file_name = self.get_file_name()
-        if self.email:
-            xlsx_data = excel.save_workbook()
-            return [xlsx_data, file_name]
-
-        excel.export(file_name)
+        return excel
 
     def set_headers(self):
         """Sets headers for the excel file"""
@@ -682,11 +1008,10 @@ class BuildExcel:
         return self.process_data(data, self.invoice_header)
 
     def process_data(self, data, column_list):
-        """return required list of dict for the excel file"""
+        """yield required dict for each row of the excel file"""
         if not data:
             return
 
-        out = []
         fields = [d.get("fieldname") for d in column_list]
         purchase_fields = [field.get("fieldname") for field in self.pr_columns]
         for row in data:
@@ -701,9 +1026,7 @@ class BuildExcel:
 
                 self.assign_value(field, row, new_row)
 
-            out.append(new_row)
-
-        return out
+            yield new_row
 
     def assign_value(self, field, source_data, target_data):
         if source_data.get(field) is None:
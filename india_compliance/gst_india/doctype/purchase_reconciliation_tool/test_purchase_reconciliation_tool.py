@@ -1,9 +1,354 @@
 # Copyright (c) 2022, Resilient Tech and Contributors
 # See license.txt
 
-# import frappe
+from copy import deepcopy
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import get_datetime, getdate
+
+from india_compliance.gst_india.doctype.purchase_reconciliation_tool import (
+    GSTIN_RULES,
+    CandidateIndex,
+    FuzzyMatcher,
+    Reconciler,
+)
+from india_compliance.gst_india.doctype.purchase_reconciliation_tool.purchase_reconciliation_tool import (
+    get_summary,
+    matches_filters,
+    paginate,
+)
 
 
 class TestPurchaseReconciliationTool(FrappeTestCase):
     pass
+
+
+class TestReconciler(FrappeTestCase):
+    PANS = ("AABCR6898M", "AAACN1234K", "AAFCD5862R")
+
+    def get_doc(self, name, gstin, bill_no, taxable_value=1000, **kwargs):
+        return frappe._dict(
+            {
+                "name": name,
+                "fy": "2023-2024",
+                "supplier_gstin": gstin,
+                "bill_no": bill_no,
+                "bill_date": getdate("2023-05-01"),
+                "place_of_supply": "24-Gujarat",
+                "is_reverse_charge": 0,
+                "taxable_value": taxable_value,
+                "cgst": 90,
+                "sgst": 90,
+                "igst": 0,
+                "cess": 0,
+                "modified": get_datetime("2023-05-01"),
+                **kwargs,
+            }
+        )
+
+    def get_data(self):
+        purchases = {}
+        inward_supplies = {}
+
+        def add(data, doc):
+            data.setdefault(doc.supplier_gstin, {})[doc.name] = doc
+
+        purchase = {"doctype": "Purchase Invoice"}
+        for i, pan in enumerate(self.PANS):
+            gstin, other_gstin = f"24{pan}1ZN", f"27{pan}1ZN"
+
+            for doc in (
+                self.get_doc(f"ISUP-{i}-1", gstin, "INV-1"),
+                self.get_doc(f"ISUP-{i}-2", gstin, "INV/2023-24/2"),
+                self.get_doc(f"ISUP-{i}-3", gstin, "INV-3", 1000.5),
+                self.get_doc(f"ISUP-{i}-4", other_gstin, "INV-4"),
+                self.get_doc(f"ISUP-{i}-5", gstin, "X-999", 5000),
+            ):
+                add(inward_supplies, doc)
+
+            for doc in (
+                self.get_doc(f"PINV-{i}-1", gstin, "INV-1", **purchase),
+                self.get_doc(f"PINV-{i}-2", gstin, "INV-2", **purchase),
+                self.get_doc(f"PINV-{i}-3", gstin, "INV-3", **purchase),
+                self.get_doc(f"PINV-{i}-4", gstin, "INV-4", **purchase),
+            ):
+                add(purchases, doc)
+
+        return purchases, inward_supplies
+
+    def reconcile(self, data=None, workers=1, modified_since=None):
+        purchases, inward_supplies = deepcopy(data or self.get_data())
+
+        reconciler = Reconciler()
+        reconciler.modified_since = modified_since
+        reconciler.get_unmatched_purchase_or_bill_of_entry = lambda category: purchases
+        reconciler.get_unmatched_inward_supply = (
+            lambda category, amended_category: inward_supplies
+        )
+        # keep matches to compare instead of updating them
+        reconciler.update_matching_docs = lambda: None
+
+        with patch.dict(
+            frappe.conf, {"ic_reconciliation_workers": workers}
+        ), patch.object(Reconciler, "PARALLEL_THRESHOLD", 0):
+            reconciler.reconcile("B2B", "B2BA")
+
+        return {
+            name: (doc.match_status, doc.link_name)
+            for name, doc in reconciler.matching_docs.items()
+        }
+
+    def test_reconcile_with_and_without_partitions(self):
+        purchases, inward_supplies = self.get_data()
+        self.assertEqual(
+            len(Reconciler.get_partitions(purchases, inward_supplies, 2)), 2
+        )
+
+        matches = self.reconcile(workers=1)
+
+        for i in range(len(self.PANS)):
+            self.assertEqual(matches[f"ISUP-{i}-1"], ("Exact Match", f"PINV-{i}-1"))
+            self.assertEqual(matches[f"ISUP-{i}-2"], ("Suggested Match", f"PINV-{i}-2"))
+            self.assertEqual(matches[f"ISUP-{i}-3"], ("Suggested Match", f"PINV-{i}-3"))
+
+            # PAN level match
+            self.assertEqual(matches[f"ISUP-{i}-4"], ("Mismatch", f"PINV-{i}-4"))
+            self.assertNotIn(f"ISUP-{i}-5", matches)
+
+        self.assertDictEqual(self.reconcile(workers=2), matches)
+
+    def test_incremental_and_full_reconciliation(self):
+        purchases, inward_supplies = self.get_data()
+        matches = self.reconcile((purchases, inward_supplies))
+
+        # unmatched documents after the last reconciliation
+        for docs in purchases.values():
+            for status, link_name in matches.values():
+                docs.pop(link_name, None)
+
+        for docs in inward_supplies.values():
+            for name in matches:
+                docs.pop(name, None)
+
+        # purchase created since then
+        gstin = f"24{self.PANS[0]}1ZN"
+        purchases[gstin]["PINV-0-5"] = self.get_doc(
+            "PINV-0-5",
+            gstin,
+            "X-999",
+            5000,
+            doctype="Purchase Invoice",
+            modified=get_datetime("2023-06-02"),
+        )
+
+        full = self.reconcile((purchases, inward_supplies))
+        self.assertDictEqual(full, {"ISUP-0-5": ("Exact Match", "PINV-0-5")})
+
+        incremental = self.reconcile(
+            (purchases, inward_supplies), modified_since="2023-06-01"
+        )
+        self.assertDictEqual(incremental, full)
+
+
+class TestCandidateIndex(FrappeTestCase):
+    def get_doc(self, name, **kwargs):
+        return frappe._dict(
+            {
+                "name": name,
+                "fy": "2023-2024",
+                "supplier_gstin": "24AABCR6898M1ZN",
+                "bill_no": "INV-1",
+                "place_of_supply": "24-Gujarat",
+                "is_reverse_charge": 0,
+                "taxable_value": 1000,
+                **kwargs,
+            }
+        )
+
+    def test_exact_match_candidates(self):
+        inward_supplies = {
+            doc.name: doc
+            for doc in (
+                self.get_doc("ISUP-1", bill_no="INV-2"),
+                self.get_doc("ISUP-2"),
+                self.get_doc("ISUP-3", fy="2022-2023"),
+            )
+        }
+
+        index = CandidateIndex(inward_supplies, GSTIN_RULES[0]["rule"])
+        candidates = index.get_candidates(self.get_doc("PINV-1"))
+
+        self.assertEqual([doc.name for doc in candidates], ["ISUP-2"])
+
+    def test_rounding_difference_candidates(self):
+        inward_supplies = {
+            doc.name: doc
+            for doc in (
+                self.get_doc("ISUP-1", taxable_value=1001),
+                self.get_doc("ISUP-2", taxable_value=999.5),
+                self.get_doc("ISUP-3", taxable_value=1002.5),
+                self.get_doc("ISUP-4", taxable_value=None),
+            )
+        }
+
+        # Residual Match
+        index = CandidateIndex(inward_supplies, GSTIN_RULES[-1]["rule"])
+        purchase = self.get_doc("PINV-1", bill_no="OTHER", taxable_value=1000.25)
+
+        self.assertEqual(
+            [doc.name for doc in index.get_candidates(purchase)],
+            ["ISUP-1", "ISUP-2", "ISUP-4"],
+        )
+
+        index.remove(inward_supplies["ISUP-1"])
+        self.assertEqual(
+            [doc.name for doc in index.get_candidates(purchase)],
+            ["ISUP-2", "ISUP-4"],
+        )
+
+
+class TestFuzzyMatcher(FrappeTestCase):
+    def get_doc(self, name, bill_no, bill_date):
+        return frappe._dict(
+            {
+                "name": name,
+                "fy": "2023-2024",
+                "bill_no": bill_no,
+                "bill_date": getdate(bill_date),
+            }
+        )
+
+    def test_fuzzy_match(self):
+        purchases = {
+            doc.name: doc
+            for doc in (
+                self.get_doc("PINV-1", "INV/2023-24/45", "2023-05-01"),
+                self.get_doc("PINV-2", "INV/0046", "2023-05-01"),
+                self.get_doc("PINV-3", "", "2023-05-01"),
+            )
+        }
+        inward_supplies = {
+            doc.name: doc
+            for doc in (
+                self.get_doc("ISUP-1", "INV-45", "2023-05-05"),
+                self.get_doc("ISUP-2", "INV-46", "2023-06-01"),
+                self.get_doc("ISUP-3", "INV-47", "2023-05-01"),
+            )
+        }
+
+        matcher = FuzzyMatcher(purchases, inward_supplies)
+
+        def is_matching(purchase, inward_supply):
+            return matcher.is_matching(
+                purchases[purchase], inward_supplies[inward_supply]
+            )
+
+        self.assertTrue(is_matching("PINV-1", "ISUP-1"))
+
+        # bill date beyond 10 days
+        self.assertFalse(is_matching("PINV-2", "ISUP-2"))
+
+        self.assertFalse(is_matching("PINV-1", "ISUP-3"))
+        self.assertFalse(is_matching("PINV-3", "ISUP-3"))
+
+    def test_fuzzy_match_in_batches(self):
+        purchases = {
+            doc.name: doc
+            for doc in (
+                self.get_doc("PINV-1", "INV/0046", "2023-05-01"),
+                self.get_doc("PINV-2", "", "2023-05-01"),
+                self.get_doc("PINV-3", "INV/2023-24/45", "2023-05-01"),
+            )
+        }
+        inward_supplies = {
+            doc.name: doc
+            for doc in (
+                self.get_doc("ISUP-1", "INV-47", "2023-05-01"),
+                self.get_doc("ISUP-2", "INV-45", "2023-05-05"),
+            )
+        }
+
+        # indexes of matches are offset for later batches
+        with patch.object(FuzzyMatcher, "BATCH_SIZE", 2):
+            matcher = FuzzyMatcher(purchases, inward_supplies)
+
+        self.assertSetEqual(matcher.matches, {(2, 1)})
+        self.assertTrue(
+            matcher.is_matching(purchases["PINV-3"], inward_supplies["ISUP-2"])
+        )
+
+
+class TestReconciliationDataPages(FrappeTestCase):
+    def setUp(self):
+        self.data = [
+            frappe._dict(
+                supplier_gstin="24AABCR6898M1ZN",
+                supplier_name="_Test Registered Supplier",
+                match_status="Mismatch" if i % 2 else "Exact Match",
+                purchase_invoice_name=f"PINV-{i}",
+                inward_supply_name=f"ISUP-{i}" if i % 3 else None,
+                action="Ignore" if i == 1 else "No Action",
+                tax_difference=i,
+                taxable_value_difference=0,
+            )
+            for i in range(6)
+        ]
+
+    def test_get_summary(self):
+        summary = {
+            row.match_status: row for row in get_summary(self.data, "match_status")
+        }
+
+        self.assertDictEqual(
+            summary["Mismatch"],
+            {
+                "match_status": "Mismatch",
+                "inward_supply_count": 2,
+                "purchase_count": 3,
+                "action_taken_count": 1,
+                "total_docs": 3,
+                "tax_difference": 9,
+                "taxable_value_difference": 0,
+            },
+        )
+
+    def test_filters_and_pagination(self):
+        filters = [
+            ["Purchase Reconciliation Tool", "match_status", "like", "%match%"],
+            ["Purchase Reconciliation Tool", "tax_difference", ">", "1"],
+        ]
+        data = [row for row in self.data if matches_filters(row, filters)]
+
+        page = paginate(data, 1, 2, "tax_difference", "desc")
+        self.assertEqual(page["total"], 4)
+        self.assertEqual([row.tax_difference for row in page["data"]], [4, 3])
+
+    def test_filter_operators(self):
+        def get_filtered(fieldname, operator, value):
+            filters = [["Purchase Reconciliation Tool", fieldname, operator, value]]
+            return [
+                row.purchase_invoice_name
+                for row in self.data
+                if matches_filters(row, filters)
+            ]
+
+        # numbers are compared numerically, including zero
+        self.assertEqual(get_filtered("tax_difference", "=", "0"), ["PINV-0"])
+        self.assertEqual(len(get_filtered("tax_difference", ">", "-1")), 6)
+        self.assertEqual(
+            get_filtered("tax_difference", "<", "1.5"), ["PINV-0", "PINV-1"]
+        )
+        self.assertEqual(len(get_filtered("tax_difference", ">=", "10")), 0)
+
+        # without wildcard, like is an exact (case-insensitive) match
+        self.assertEqual(len(get_filtered("match_status", "like", "mismatch")), 3)
+        self.assertEqual(len(get_filtered("match_status", "like", "match")), 0)
+        self.assertEqual(len(get_filtered("match_status", "like", "%match")), 6)
+        self.assertEqual(len(get_filtered("match_status", "like", "exact%")), 3)
+        self.assertEqual(len(get_filtered("match_status", "not like", "%mis%")), 3)
+
+        self.assertEqual(
+            get_filtered("inward_supply_name", "is", "not set"), ["PINV-0", "PINV-3"]
+        )
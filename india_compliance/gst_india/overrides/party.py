@@ -4,7 +4,9 @@ import frappe
 from frappe import _
 from frappe.contacts.doctype.address.address import get_address_display
 
+from india_compliance.gst_india.constants import GST_PARTY_TYPES
 from india_compliance.gst_india.utils import (
+    clear_gstin_party_cache,
     guess_gst_category,
     is_autofill_party_info_enabled,
     is_valid_pan,
@@ -159,3 +161,10 @@ def make_address(doc):
             "links": [{"link_doctype": doc.doctype, "link_name": doc.name}],
         }
     ).insert()
+
+
+def clear_party_cache(doc, method=None, *args, **kwargs):
+    """Clear cached parties for GSTINs, as GSTIN or address links could change"""
+    clear_gstin_party_cache(
+        GST_PARTY_TYPES if doc.doctype == "Address" else (doc.doctype,)
+    )
@@ -154,7 +154,7 @@ function download_full_report_json(report) {
 }
 
 function download_current_report_excel(report) {
-    open_url_post(`/api/method/${url}.get_gstr1_excel`, {
+    india_compliance.export_excel(`${url}.get_gstr1_excel`, {
         data: JSON.stringify(report.data),
         filters: JSON.stringify(report.get_values()),
         columns: JSON.stringify(report.columns),
@@ -162,7 +162,7 @@ function download_current_report_excel(report) {
 }
 
 function download_full_report_excel(report) {
-    open_url_post(`/api/method/${url}.get_gstr1_excel`, {
+    india_compliance.export_excel(`${url}.get_gstr1_excel`, {
         filters: JSON.stringify(report.get_values()),
     });
 }
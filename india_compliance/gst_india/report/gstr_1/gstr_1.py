@@ -1,5 +1,6 @@
 # Copyright (c) 2013, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
+import hashlib
 import json
 import re
 from datetime import date
@@ -15,9 +16,6 @@ from frappe.utils import cint, flt, formatdate, getdate
 from india_compliance.gst_india.report.hsn_wise_summary_of_outward_supplies.hsn_wise_summary_of_outward_supplies import (
     get_columns as get_hsn_columns,
 )
-from india_compliance.gst_india.report.hsn_wise_summary_of_outward_supplies.hsn_wise_summary_of_outward_supplies import (
-    get_conditions as get_hsn_conditions,
-)
 from india_compliance.gst_india.report.hsn_wise_summary_of_outward_supplies.hsn_wise_summary_of_outward_supplies import (
     get_hsn_data,
     get_hsn_wise_json_data,
@@ -27,10 +25,22 @@ from india_compliance.gst_india.utils import (
     get_gst_accounts_by_type,
     is_overseas_transaction,
 )
-from india_compliance.gst_india.utils.exporter import ExcelExporter
+from india_compliance.gst_india.utils.exporter import ExcelExporter, enqueue_export
 
 B2C_LIMIT = 2_50_000
 
+# sections built from invoices and their items
+INVOICE_SECTIONS = (
+    "B2B",
+    "B2C Large",
+    "B2C Small",
+    "CDNR-REG",
+    "CDNR-UNREG",
+    "EXPORT",
+    "NIL Rated",
+)
+INVOICE_DATA_EXPIRY = 60 * 60
+
 TYPES_OF_BUSINESS = {
     "B2B": "b2b",
     "B2C Large": "b2cl",
@@ -91,8 +101,6 @@ class Gstr1Report:
         self.get_invoice_data()
 
         if self.invoices:
-            self.get_invoice_items()
-            self.get_items_based_on_tax_rate()
             self.invoice_fields = [d["fieldname"] for d in self.invoice_columns]
 
         self.get_data()
@@ -313,28 +321,40 @@ class Gstr1Report:
 
     def get_invoice_data(self):
         self.invoices = frappe._dict()
-        conditions = self.get_conditions()
 
-        invoice_data = frappe.db.sql(
-            """
-			select
-				{select_columns}
-			from `tab{doctype}` si
-			where docstatus = 1 {where_conditions}
-			and is_opening = 'No'
-			order by posting_date desc
-			""".format(
-                select_columns=self.select_columns,
-                doctype=self.doctype,
-                where_conditions=conditions,
-            ),
-            self.filters,
-            as_dict=1,
+        type_of_business = self.filters.get("type_of_business")
+        if type_of_business not in INVOICE_SECTIONS:
+            return
+
+        data = GSTR1InvoiceData(
+            self.filters, self.gst_accounts, self.select_columns
+        ).get()
+
+        if data.unidentified_gst_accounts:
+            frappe.msgprint(
+                _("Following accounts might be selected in GST Settings:")
+                + "<br>"
+                + "<br>".join(data.unidentified_gst_accounts),
+                alert=True,
+            )
+
+        self.invoices = frappe._dict(
+            {
+                name: invoice
+                for name, invoice in data.invoices.items()
+                if is_invoice_in_section(invoice, type_of_business)
+            }
         )
 
-        for d in invoice_data:
-            d.is_reverse_charge = "Y" if d.is_reverse_charge else "N"
-            self.invoices.setdefault(d.invoice_number, d)
+        def _filter(values):
+            return {
+                name: value for name, value in values.items() if name in self.invoices
+            }
+
+        self.invoice_items = frappe._dict(_filter(data.invoice_items))
+        self.nil_exempt_non_gst = _filter(data.nil_exempt_non_gst)
+        self.items_based_on_tax_rate = _filter(data.items_based_on_tax_rate)
+        self.invoice_cess = frappe._dict(_filter(data.invoice_cess))
 
     def get_11A_11B_data(self):
         report = GSTR11A11BData(self.filters, self.gst_accounts)
@@ -351,192 +371,6 @@ class Gstr1Report:
         for row in data:
             self.data.append(row)
 
-    def get_conditions(self):
-        if self.filters.get("type_of_business") == "HSN":
-            return get_hsn_conditions(self.filters)
-
-        conditions = ""
-
-        for opts in (
-            ("company", " and company=%(company)s"),
-            ("from_date", " and posting_date>=%(from_date)s"),
-            ("to_date", " and posting_date<=%(to_date)s"),
-            ("company_address", " and company_address=%(company_address)s"),
-            ("company_gstin", " and company_gstin=%(company_gstin)s"),
-        ):
-            if self.filters.get(opts[0]):
-                conditions += opts[1]
-
-        if self.filters.get("type_of_business") == "B2B":
-            conditions += (
-                "AND IFNULL(gst_category, '') not in ('Unregistered', 'Overseas') AND is_return != 1 AND"
-                " is_debit_note !=1"
-            )
-
-        if self.filters.get("type_of_business") == "B2C Large":
-            conditions += """ AND ifnull(SUBSTR(place_of_supply, 1, 2),'') != ifnull(SUBSTR(company_gstin, 1, 2),'')
-				AND grand_total > {0} AND is_return != 1 AND is_debit_note !=1
-                AND IFNULL(gst_category, "") in ('Unregistered', 'Overseas')
-                AND SUBSTR(place_of_supply, 1, 2) != '96'""".format(
-                B2C_LIMIT
-            )
-
-        elif self.filters.get("type_of_business") == "B2C Small":
-            conditions += """ AND (
-				SUBSTR(place_of_supply, 1, 2) = SUBSTR(company_gstin, 1, 2)
-					OR grand_total <= {0}) AND IFNULL(gst_category, "") in ('Unregistered', 'Overseas')
-                    AND SUBSTR(place_of_supply, 1, 2) != '96' """.format(
-                B2C_LIMIT
-            )
-
-        elif self.filters.get("type_of_business") == "CDNR-REG":
-            conditions += """ AND (is_return = 1 OR is_debit_note = 1) AND IFNULL(gst_category, '') not in ('Unregistered', 'Overseas')"""
-
-        elif self.filters.get("type_of_business") == "CDNR-UNREG":
-            conditions += """ AND ifnull(SUBSTR(place_of_supply, 1, 2),'') != ifnull(SUBSTR(company_gstin, 1, 2),'')
-				AND (is_return = 1 OR is_debit_note = 1)
-				AND IFNULL(gst_category, '') in ('Unregistered', 'Overseas')"""
-
-        elif self.filters.get("type_of_business") == "EXPORT":
-            conditions += """ AND is_return !=1 and gst_category = 'Overseas' and place_of_supply = '96-Other Countries' """
-
-        elif self.filters.get("type_of_business") == "NIL Rated":
-            conditions += """ AND IFNULL(place_of_supply, '') != '96-Other Countries' and IFNULL(gst_category, '') != 'Overseas'"""
-
-        conditions += " AND IFNULL(billing_address_gstin, '') != company_gstin"
-
-        return conditions
-
-    def get_invoice_items(self):
-        self.invoice_items = frappe._dict()
-        self.nil_exempt_non_gst = {}
-
-        items = frappe.db.sql(
-            """
-			select item_code, item_name, parent, taxable_value, item_tax_rate, gst_treatment
-            from `tab%s Item`
-			where parent in (%s)
-		"""
-            % (self.doctype, ", ".join(["%s"] * len(self.invoices))),
-            tuple(self.invoices),
-            as_dict=1,
-        )
-
-        for d in items:
-            d.item_code = d.item_code or d.item_name
-            self.invoice_items.setdefault(d.parent, {}).setdefault(d.item_code, 0.0)
-            if d.gst_treatment in ("Taxable", "Zero-Rated"):
-                self.invoice_items[d.parent][d.item_code] += d.get("taxable_value", 0)
-                continue
-
-            is_nil_rated = d.gst_treatment == "Nil-Rated"
-            is_exempted = d.gst_treatment == "Exempted"
-            is_non_gst = d.gst_treatment == "Non-GST"
-
-            self.nil_exempt_non_gst.setdefault(d.parent, [0.0, 0.0, 0.0])
-            if is_nil_rated:
-                self.nil_exempt_non_gst[d.parent][0] += d.get("taxable_value", 0)
-            elif is_exempted:
-                self.nil_exempt_non_gst[d.parent][1] += d.get("taxable_value", 0)
-            elif is_non_gst:
-                self.nil_exempt_non_gst[d.parent][2] += d.get("taxable_value", 0)
-
-    def get_items_based_on_tax_rate(self):
-        tax_details = frappe.db.sql(
-            """
-			select
-				parent, account_head, item_wise_tax_detail
-			from `tab%s`
-			where
-				parenttype = %s and docstatus = 1
-				and parent in (%s)
-			order by account_head
-		"""
-            % (self.tax_doctype, "%s", ", ".join(["%s"] * len(self.invoices.keys()))),
-            tuple([self.doctype] + list(self.invoices.keys())),
-        )
-
-        self.items_based_on_tax_rate = {}
-        self.invoice_cess = frappe._dict()
-
-        unidentified_gst_accounts = set()
-        unidentified_gst_accounts_invoice = set()
-        for parent, account, item_wise_tax_detail in tax_details:
-            if not item_wise_tax_detail:
-                continue
-
-            if account not in self.gst_accounts.values():
-                if "gst" in account.lower():
-                    unidentified_gst_accounts.add(account)
-                    unidentified_gst_accounts_invoice.add(parent)
-
-                continue
-
-            try:
-                item_wise_tax_detail = json.loads(item_wise_tax_detail)
-            except ValueError:
-                continue
-
-            is_cess = account == self.gst_accounts.cess_account
-            is_cgst_or_sgst = (
-                account == self.gst_accounts.cgst_account
-                or account == self.gst_accounts.sgst_account
-            )
-
-            for item_code, tax_amounts in item_wise_tax_detail.items():
-                tax_rate = tax_amounts[0]
-
-                if not tax_rate and parent not in self.nil_exempt_non_gst:
-                    continue
-
-                if is_cess:
-                    self.invoice_cess.setdefault(parent, {})
-                    self.invoice_cess[parent].setdefault(item_code, 0.0)
-                    self.invoice_cess[parent][item_code] += tax_amounts[1]
-                    continue
-
-                if is_cgst_or_sgst:
-                    tax_rate *= 2
-
-                (
-                    self.items_based_on_tax_rate.setdefault(parent, {})
-                    .setdefault(tax_rate, set())
-                    .add(item_code)
-                )
-
-        if unidentified_gst_accounts:
-            frappe.msgprint(
-                _("Following accounts might be selected in GST Settings:")
-                + "<br>"
-                + "<br>".join(unidentified_gst_accounts),
-                alert=True,
-            )
-
-        # Build itemised tax for export invoices where tax table is blank
-        for invoice_no, items in self.invoice_items.items():
-            if (
-                invoice_no in self.items_based_on_tax_rate
-                or invoice_no in unidentified_gst_accounts_invoice
-            ):
-                continue
-
-            invoice = self.invoices.get(invoice_no, {})
-            if not invoice.get("is_export_with_gst") and is_overseas_transaction(
-                "Sales Invoice", invoice.gst_category, invoice.place_of_supply
-            ):
-                self.items_based_on_tax_rate.setdefault(invoice_no, {}).setdefault(
-                    0, []
-                ).extend(items)
-
-            # Show invoice with all items are in nil exempt and exclude non-gst
-            if (
-                invoice_no in self.nil_exempt_non_gst
-                and self.nil_exempt_non_gst[invoice_no][2] == 0
-            ):
-                self.items_based_on_tax_rate.setdefault(invoice_no, {}).setdefault(
-                    0, []
-                ).extend(items)
-
     def get_columns(self):
         self.other_columns = []
         self.tax_columns = []
@@ -1027,6 +861,212 @@ class Gstr1Report:
         self.columns = self.invoice_columns + self.tax_columns + self.other_columns
 
 
+class GSTR1InvoiceData:
+    """
+    Invoices of the period with their items grouped by tax rate, for all
+    invoice sections. Built in a single pass over item rows using item-wise
+    GST rates, and cached until invoices of the period change.
+    """
+
+    def __init__(self, filters, gst_accounts, select_columns):
+        self.filters = filters
+        self.gst_accounts = gst_accounts
+        self.select_columns = select_columns
+        self.conditions = self.get_conditions()
+
+    def get(self):
+        key = self.get_cache_key()
+        if (data := frappe.cache.get_value(key)) is None:
+            data = self.build()
+            frappe.cache.set_value(key, data, expires_in_sec=INVOICE_DATA_EXPIRY)
+
+        return data
+
+    def get_cache_key(self):
+        version = self.get_data_version()
+        filters = {
+            key: self.filters.get(key)
+            for key in (
+                "company",
+                "company_address",
+                "company_gstin",
+                "from_date",
+                "to_date",
+            )
+        }
+        params = json.dumps([filters, version], default=str, sort_keys=True)
+
+        return "gstr1_invoice_data:" + hashlib.md5(params.encode()).hexdigest()
+
+    def get_data_version(self):
+        # changes when an invoice of the period is submitted, updated or cancelled
+        return frappe.db.sql(
+            f"""
+            select count(*), max(si.modified) from `tabSales Invoice` si
+            where si.docstatus = 1 {self.conditions}
+            """,
+            self.filters,
+        )[0]
+
+    def get_conditions(self):
+        conditions = ""
+
+        for opts in (
+            ("company", " and si.company=%(company)s"),
+            ("from_date", " and si.posting_date>=%(from_date)s"),
+            ("to_date", " and si.posting_date<=%(to_date)s"),
+            ("company_address", " and si.company_address=%(company_address)s"),
+            ("company_gstin", " and si.company_gstin=%(company_gstin)s"),
+        ):
+            if self.filters.get(opts[0]):
+                conditions += opts[1]
+
+        conditions += " and si.is_opening = 'No'"
+        conditions += " and IFNULL(si.billing_address_gstin, '') != si.company_gstin"
+
+        return conditions
+
+    def build(self):
+        self.data = frappe._dict(
+            invoices=frappe._dict(),
+            invoice_items={},
+            nil_exempt_non_gst={},
+            items_based_on_tax_rate={},
+            invoice_cess={},
+            unidentified_gst_accounts=[],
+        )
+
+        self.set_invoices()
+        if self.data.invoices:
+            self.set_items_based_on_tax_rate()
+
+        return self.data
+
+    def set_invoices(self):
+        invoice_data = frappe.db.sql(
+            f"""
+            select {self.select_columns}, grand_total
+            from `tabSales Invoice` si
+            where si.docstatus = 1 {self.conditions}
+            order by posting_date desc
+            """,
+            self.filters,
+            as_dict=1,
+        )
+
+        for d in invoice_data:
+            d.is_reverse_charge = "Y" if d.is_reverse_charge else "N"
+            self.data.invoices.setdefault(d.invoice_number, d)
+
+    def set_items_based_on_tax_rate(self):
+        items = frappe.db.sql(
+            f"""
+            select
+                item.parent, item.item_code, item.item_name, item.taxable_value,
+                item.gst_treatment, item.igst_rate, item.cgst_rate, item.sgst_rate,
+                item.cess_amount, item.cess_non_advol_amount
+            from `tabSales Invoice Item` item
+            join `tabSales Invoice` si on si.name = item.parent
+            where si.docstatus = 1 {self.conditions}
+            """,
+            self.filters,
+            as_dict=1,
+        )
+
+        invoice_items = self.data.invoice_items
+        nil_exempt_non_gst = self.data.nil_exempt_non_gst
+        items_based_on_tax_rate = self.data.items_based_on_tax_rate
+        invoice_cess = self.data.invoice_cess
+        taxed_invoices = set()
+
+        for d in items:
+            d.item_code = d.item_code or d.item_name
+            d.tax_rate = flt(d.igst_rate) or flt(d.cgst_rate) + flt(d.sgst_rate)
+            if d.tax_rate:
+                taxed_invoices.add(d.parent)
+
+            invoice_items.setdefault(d.parent, {}).setdefault(d.item_code, 0.0)
+            if d.gst_treatment in ("Taxable", "Zero-Rated"):
+                invoice_items[d.parent][d.item_code] += flt(d.taxable_value)
+                continue
+
+            values = nil_exempt_non_gst.setdefault(d.parent, [0.0, 0.0, 0.0])
+            if d.gst_treatment == "Nil-Rated":
+                values[0] += flt(d.taxable_value)
+            elif d.gst_treatment == "Exempted":
+                values[1] += flt(d.taxable_value)
+            elif d.gst_treatment == "Non-GST":
+                values[2] += flt(d.taxable_value)
+
+        for d in items:
+            # items without rate are considered only where invoice has taxes
+            if d.parent not in taxed_invoices or (
+                not d.tax_rate and d.parent not in nil_exempt_non_gst
+            ):
+                continue
+
+            if cess := flt(d.cess_amount) + flt(d.cess_non_advol_amount):
+                invoice_cess.setdefault(d.parent, {}).setdefault(d.item_code, 0.0)
+                invoice_cess[d.parent][d.item_code] += cess
+
+            (
+                items_based_on_tax_rate.setdefault(d.parent, {})
+                .setdefault(d.tax_rate, set())
+                .add(d.item_code)
+            )
+
+        unidentified_gst_accounts_invoice = self.set_unidentified_gst_accounts()
+
+        # Build itemised tax for export invoices where tax table is blank
+        for invoice_no, items in invoice_items.items():
+            if (
+                invoice_no in items_based_on_tax_rate
+                or invoice_no in unidentified_gst_accounts_invoice
+            ):
+                continue
+
+            invoice = self.data.invoices.get(invoice_no, {})
+            if not invoice.get("is_export_with_gst") and is_overseas_transaction(
+                "Sales Invoice", invoice.gst_category, invoice.place_of_supply
+            ):
+                items_based_on_tax_rate.setdefault(invoice_no, {}).setdefault(
+                    0, set()
+                ).update(items)
+
+            # Show invoice with all items are in nil exempt and exclude non-gst
+            if (
+                invoice_no in nil_exempt_non_gst
+                and nil_exempt_non_gst[invoice_no][2] == 0
+            ):
+                items_based_on_tax_rate.setdefault(invoice_no, {}).setdefault(
+                    0, set()
+                ).update(items)
+
+    def set_unidentified_gst_accounts(self):
+        """Taxes with accounts that look like GST accounts, but not set in GST Settings"""
+        gst_accounts = [account for account in self.gst_accounts.values() if account]
+        if not gst_accounts:
+            return set()
+
+        tax_details = frappe.db.sql(
+            f"""
+            select distinct taxes.parent, taxes.account_head
+            from `tabSales Taxes and Charges` taxes
+            join `tabSales Invoice` si on si.name = taxes.parent
+            where taxes.parenttype = 'Sales Invoice' and si.docstatus = 1
+            and IFNULL(taxes.item_wise_tax_detail, '') != ''
+            and taxes.account_head not in %(gst_accounts)s
+            and taxes.account_head like '%%gst%%' {self.conditions}
+            """,
+            {**self.filters, "gst_accounts": gst_accounts},
+        )
+
+        self.data.unidentified_gst_accounts = sorted(
+            {account for _parent, account in tax_details}
+        )
+        return {parent for parent, _account in tax_details}
+
+
 class GSTR11A11BData:
     def __init__(self, filters, gst_accounts):
         self.filters = filters
@@ -1904,6 +1944,54 @@ def download_json_file():
     frappe.response["type"] = "download"
 
 
+def is_invoice_in_section(invoice, type_of_business):
+    """Invoices to be reported in the section of GSTR-1"""
+    is_unregistered = (invoice.gst_category or "") in ("Unregistered", "Overseas")
+    is_cdn = invoice.is_return or invoice.is_debit_note
+    state_code = (invoice.place_of_supply or "")[:2]
+    is_inter_state = state_code != (invoice.company_gstin or "")[:2]
+
+    if type_of_business == "B2B":
+        return not is_unregistered and not is_cdn
+
+    if type_of_business == "B2C Large":
+        return (
+            is_unregistered
+            and not is_cdn
+            and is_inter_state
+            and flt(invoice.grand_total) > B2C_LIMIT
+            and state_code not in ("", "96")
+        )
+
+    if type_of_business == "B2C Small":
+        return (
+            is_unregistered
+            and (not is_inter_state or flt(invoice.grand_total) <= B2C_LIMIT)
+            and state_code not in ("", "96")
+        )
+
+    if type_of_business == "CDNR-REG":
+        return is_cdn and not is_unregistered
+
+    if type_of_business == "CDNR-UNREG":
+        return is_cdn and is_unregistered and is_inter_state
+
+    if type_of_business == "EXPORT":
+        return (
+            not invoice.is_return
+            and invoice.gst_category == "Overseas"
+            and invoice.place_of_supply == "96-Other Countries"
+        )
+
+    if type_of_business == "NIL Rated":
+        return (
+            invoice.place_of_supply != "96-Other Countries"
+            and invoice.gst_category != "Overseas"
+        )
+
+    return False
+
+
 def is_inter_state(invoice_detail):
     if invoice_detail.place_of_supply.split("-")[0] != invoice_detail.company_gstin[:2]:
         return True
@@ -1915,6 +2003,21 @@ def is_inter_state(invoice_detail):
 def get_gstr1_excel(filters, data=None, columns=None):
     frappe.has_permission("GL Entry", throw=True)
 
+    return enqueue_export(
+        "india_compliance.gst_india.report.gstr_1.gstr_1.build_gstr1_excel",
+        attached_to_doctype="Report",
+        attached_to_name="GSTR-1",
+        # exports are not reused once invoices of the period change
+        data_version=GSTR1InvoiceData(
+            frappe.parse_json(filters), None, None
+        ).get_data_version(),
+        filters=filters,
+        data=data,
+        columns=columns,
+    )
+
+
+def build_gstr1_excel(filters, data=None, columns=None):
     report_dict = set_gst_defaults(filters)
     filters = json.loads(filters)
 
@@ -1940,12 +2043,14 @@ def get_gstr1_excel(filters, data=None, columns=None):
             report_data = execute(filters)
 
             headers = report_data[0] or []
-            data = format_data_to_dict(report_data)
+
+            # rows are streamed to the sheet in order of headers
+            data = report_data[1] or []
 
             create_excel_sheet(excel, type_of_business, headers, data)
 
     filename.extend([gstin, report_dict["fp"]])
-    excel.export("_".join(filename))
+    return excel, "_".join(filename)
 
 
 def create_excel_sheet(excel, sheet_name, headers, data):
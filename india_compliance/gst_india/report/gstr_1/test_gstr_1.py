@@ -7,6 +7,7 @@ from india_compliance.gst_india.report.gstr_1.gstr_1 import (
     execute,
     format_data_to_dict,
     get_json,
+    is_invoice_in_section,
 )
 from india_compliance.gst_india.utils.tests import create_sales_invoice
 
@@ -74,6 +75,52 @@ class TestGSTR1DocumentIssuedSummary(FrappeTestCase):
         self.assertDictEqual(report_json, JSON_OUTPUT)
 
 
+class TestGSTR1InvoiceData(FrappeTestCase):
+    def test_sections_from_period_data(self):
+        filters = {
+            "company": "_Test Indian Registered Company",
+            "company_gstin": "24AAQCA8719H1ZC",
+            "from_date": getdate(),
+            "to_date": getdate(),
+            "type_of_business": "B2B",
+        }
+
+        def get_invoices(type_of_business):
+            report_data = format_data_to_dict(
+                execute({**filters, "type_of_business": type_of_business})
+            )
+            return {row["invoice_number"] for row in report_data}
+
+        invoice = create_sales_invoice()
+        self.assertIn(invoice.name, get_invoices("B2B"))
+        self.assertNotIn(invoice.name, get_invoices("CDNR-REG"))
+
+        # period data is rebuilt once invoices change
+        credit_note = create_sales_invoice(is_return=1, qty=-1)
+        self.assertIn(credit_note.name, get_invoices("CDNR-REG"))
+        self.assertNotIn(credit_note.name, get_invoices("B2B"))
+
+    def test_is_invoice_in_section(self):
+        invoice = frappe._dict(
+            company_gstin="24AAQCA8719H1ZC",
+            gst_category="Unregistered",
+            place_of_supply="29-Karnataka",
+            grand_total=3_00_000,
+        )
+
+        self.assertTrue(is_invoice_in_section(invoice, "B2C Large"))
+        self.assertFalse(is_invoice_in_section(invoice, "B2C Small"))
+        self.assertFalse(is_invoice_in_section(invoice, "B2B"))
+
+        invoice.place_of_supply = "24-Gujarat"
+        self.assertFalse(is_invoice_in_section(invoice, "B2C Large"))
+        self.assertTrue(is_invoice_in_section(invoice, "B2C Small"))
+
+        invoice.update(gst_category="Registered Regular", is_return=1)
+        self.assertTrue(is_invoice_in_section(invoice, "CDNR-REG"))
+        self.assertFalse(is_invoice_in_section(invoice, "B2B"))
+
+
 def create_test_items():
     """Create Sales Invoices for testing GSTR1 Document Issued Summary."""
 
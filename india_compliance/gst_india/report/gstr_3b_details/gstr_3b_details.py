@@ -3,9 +3,9 @@
 
 import frappe
 from frappe import _
-from frappe.query_builder import Case, DatePart
+from frappe.query_builder import Case
 from frappe.query_builder.custom import ConstantColumn
-from frappe.query_builder.functions import Extract, Ifnull, IfNull, LiteralValue, Sum
+from frappe.query_builder.functions import Ifnull, IfNull, LiteralValue, Sum
 from frappe.utils import cint, flt, get_first_day, get_last_day
 
 from india_compliance.gst_india.utils import get_escaped_gst_accounts
@@ -419,6 +419,8 @@ class IneligibleITC:
         self.gstin = gstin
         self.month = month
         self.year = year
+        self.from_date = get_first_day(f"{cint(year)}-{cint(month)}-01")
+        self.to_date = get_last_day(f"{cint(year)}-{cint(month)}-01")
         self.gst_accounts = get_escaped_gst_accounts(company, "Input")
 
     def get_for_purchase_invoice(self, group_by="name"):
@@ -617,8 +619,7 @@ class IneligibleITC:
             .where(self.gl_entry.voucher_type == voucher_type)
             .where(self.gl_entry.is_cancelled == 0)
             .where(self.gl_entry.company_gstin == self.gstin)
-            .where(Extract(DatePart.month, self.gl_entry.posting_date).eq(self.month))
-            .where(Extract(DatePart.year, self.gl_entry.posting_date).eq(self.year))
+            .where(self.gl_entry.posting_date[self.from_date : self.to_date])
         )
 
         return query
@@ -7,10 +7,13 @@ import json
 import frappe
 from frappe import _
 from frappe.model.meta import get_field_precision
-from frappe.utils import cstr, flt, getdate
+from frappe.utils import cstr, flt, get_first_day, get_last_day, getdate
 import erpnext
 
 from india_compliance.gst_india.constants import GST_ACCOUNT_FIELDS
+from india_compliance.gst_india.doctype.gst_period_summary.gst_period_summary import (
+    get_period_summary,
+)
 from india_compliance.gst_india.utils import get_gst_accounts_by_type, get_gst_uom
 
 
@@ -29,6 +32,101 @@ def execute(filters=None):
 
 
 def get_hsn_data(filters, columns, output_gst_accounts_dict):
+    if use_period_summary(filters):
+        return get_hsn_data_from_summary(filters, columns, output_gst_accounts_dict)
+
+    return get_hsn_data_from_invoices(filters, columns, output_gst_accounts_dict)
+
+
+def use_period_summary(filters):
+    """Summary can be used for whole months, where user has access to all invoices"""
+    from_date, to_date = filters.get("from_date"), filters.get("to_date")
+    if not (from_date and to_date):
+        return False
+
+    return (
+        getdate(from_date) == get_first_day(from_date)
+        and getdate(to_date) == get_last_day(to_date)
+        and not frappe.build_match_conditions("Sales Invoice")
+    )
+
+
+def get_hsn_data_from_summary(filters, columns, output_gst_accounts_dict):
+    # summary value for each tax account
+    tax_fields = {
+        "igst_account": "igst_amount",
+        "cgst_account": "cgst_amount",
+        "sgst_account": "sgst_amount",
+        "cess_account": "cess_amount",
+        "cess_non_advol_account": "cess_non_advol_amount",
+    }
+
+    summary = [
+        row for row in get_period_summary(frappe._dict(filters)) if row.gst_hsn_code
+    ]
+    tax_columns = [
+        account
+        for account_type, account in output_gst_accounts_dict.items()
+        if account
+        and account_type in tax_fields
+        and any(row[tax_fields[account_type]] for row in summary)
+    ]
+
+    for account in tax_columns:
+        columns.append(
+            {
+                "label": account,
+                "fieldname": frappe.scrub(account),
+                "fieldtype": "Float",
+                "width": 110,
+            }
+        )
+
+    descriptions = dict(
+        frappe.get_all(
+            "GST HSN Code",
+            filters={"name": ("in", {row.gst_hsn_code for row in summary})},
+            fields=["name", "description"],
+            as_list=True,
+        )
+    )
+
+    data = []
+    for row in summary:
+        if row.gst_hsn_code.startswith("99"):
+            # service item doesn't have qty/uom
+            row.qty = 0
+            row.uom = "NA"
+        else:
+            row.uom = get_gst_uom(row.uom)
+
+        taxes_by_account = {
+            account: row[tax_fields[account_type]]
+            for account_type, account in output_gst_accounts_dict.items()
+            if account in tax_columns
+        }
+        total_tax = sum(taxes_by_account.values())
+
+        data.append(
+            [
+                row.gst_hsn_code,
+                descriptions.get(row.gst_hsn_code) or "NA",
+                row.uom,
+                row.qty,
+                row.gst_rate,
+                row.taxable_value + total_tax,
+                row.taxable_value,
+                *(taxes_by_account[account] for account in tax_columns),
+            ]
+        )
+
+    if data:
+        data = get_merged_data(columns, data)  # merge same hsn code data
+
+    return data
+
+
+def get_hsn_data_from_invoices(filters, columns, output_gst_accounts_dict):
     output_gst_accounts = set()
     non_cess_accounts = set()
     for account_type, account_name in output_gst_accounts_dict.items():
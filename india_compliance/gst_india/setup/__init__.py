@@ -23,6 +23,16 @@ from india_compliance.gst_india.utils.custom_fields import toggle_custom_fields
 
 ITEM_VARIANT_FIELDNAMES = frozenset(("gst_hsn_code",))
 
+# covers filters used by GST reports for a return period
+GST_PERIOD_INDEX = "gst_period_index"
+GST_PERIOD_INDEX_FIELDS = ("company", "company_gstin", "docstatus", "posting_date")
+GST_PERIOD_INDEX_DOCTYPES = (
+    "Sales Invoice",
+    "Purchase Invoice",
+    "Journal Entry",
+    "Bill of Entry",
+)
+
 
 def after_install():
     create_custom_fields()
@@ -34,6 +44,7 @@ def after_install():
     set_default_accounts_settings()
     create_hsn_codes()
     add_fields_to_item_variant_settings()
+    create_indexes()
 
 
 def create_custom_fields():
@@ -49,6 +60,11 @@ def create_hrms_custom_fields():
     _create_custom_fields(HRMS_CUSTOM_FIELDS, ignore_validate=True)
 
 
+def create_indexes():
+    for doctype in GST_PERIOD_INDEX_DOCTYPES:
+        frappe.db.add_index(doctype, GST_PERIOD_INDEX_FIELDS, GST_PERIOD_INDEX)
+
+
 def create_accounting_dimension_fields():
     doctypes = frappe.get_hooks(
         "accounting_dimension_doctypes",
@@ -1,6 +1,7 @@
 import copy
 import io
 import tarfile
+import time
 
 from dateutil import parser
 from pytz import timezone
@@ -28,6 +29,7 @@ from india_compliance.gst_india.constants import (
     ABBREVIATIONS,
     E_INVOICE_MASTER_CODES_URL,
     GST_ACCOUNT_FIELDS,
+    GST_PARTY_TYPES,
     GSTIN_FORMATS,
     PAN_NUMBER,
     PINCODE_FORMAT,
@@ -39,6 +41,8 @@ from india_compliance.gst_india.constants import (
     UOM_MAP,
 )
 
+GSTIN_PARTY_CACHE_EXPIRY = 24 * 60 * 60
+
 
 def get_state(state_number):
     """Get state from State Number"""
@@ -117,25 +121,88 @@ def get_party_for_gstin(gstin, party_type="Supplier"):
     if not gstin:
         return
 
-    if party := frappe.db.get_value(
-        party_type, filters={"gstin": gstin}, fieldname="name"
+    cache_key = get_gstin_party_cache_key(party_type)
+    party = frappe.cache.hget(cache_key, gstin)
+
+    if party is None:
+        party = _get_parties_for_gstins({gstin}, party_type).get(gstin, "")
+        cache_gstin_parties(cache_key, {gstin: party})
+
+    return party or None
+
+
+def get_parties_for_gstins(gstins, party_type="Supplier"):
+    """
+    Returns a dict of GSTIN and party for given GSTINs, using GSTIN of the party
+    or else of its address. GSTINs without a party are not included.
+
+    Parties are cached per GSTIN until a party or address is changed,
+    or for a day at most.
+    """
+    cache_key = get_gstin_party_cache_key(party_type)
+    cached = {
+        frappe.safe_decode(gstin): party
+        for gstin, party in frappe.cache.hgetall(cache_key).items()
+    }
+
+    gstins = set(filter(None, gstins))
+    parties = {gstin: cached[gstin] for gstin in gstins if gstin in cached}
+
+    if missing := gstins.difference(parties):
+        found = _get_parties_for_gstins(missing, party_type)
+
+        # cache empty value to avoid querying again
+        found = {gstin: found.get(gstin, "") for gstin in missing}
+        cache_gstin_parties(cache_key, found)
+        parties.update(found)
+
+    return {gstin: party for gstin, party in parties.items() if party}
+
+
+def _get_parties_for_gstins(gstins, party_type):
+    parties = {}
+    for party in frappe.get_all(
+        party_type, filters={"gstin": ("in", list(gstins))}, fields=("name", "gstin")
     ):
-        return party
+        parties.setdefault(party.gstin, party.name)
+
+    if not (gstins := gstins.difference(parties)):
+        return parties
 
     address = frappe.qb.DocType("Address")
     links = frappe.qb.DocType("Dynamic Link")
-    party = (
+    for gstin, party in (
         frappe.qb.from_(address)
         .join(links)
         .on(links.parent == address.name)
-        .select(links.link_name)
+        .select(address.gstin, links.link_name)
         .where(links.link_doctype == party_type)
-        .where(address.gstin == gstin)
-        .limit(1)
+        .where(address.gstin.isin(list(gstins)))
         .run()
+    ):
+        parties.setdefault(gstin, party)
+
+    return parties
+
+
+def cache_gstin_parties(cache_key, parties):
+    for gstin, party in parties.items():
+        frappe.cache.hset(cache_key, gstin, party)
+
+    # expiry is set once, so that changes missed by hooks are picked up eventually
+    key = frappe.cache.make_key(cache_key)
+    if frappe.cache.ttl(key) < 0:
+        frappe.cache.expire(key, GSTIN_PARTY_CACHE_EXPIRY)
+
+
+def clear_gstin_party_cache(party_types=GST_PARTY_TYPES):
+    frappe.cache.delete_value(
+        [get_gstin_party_cache_key(party_type) for party_type in party_types]
     )
-    if party:
-        return party[0][0]
+
+
+def get_gstin_party_cache_key(party_type):
+    return f"party_for_gstin:{party_type}"
 
 
 @frappe.whitelist()
@@ -806,3 +873,57 @@ def tar_gz_bytes_to_data(tar_gz_bytes: bytes) -> str | None:
 @frappe.whitelist(methods=["POST"])
 def disable_item_tax_template_notification():
     frappe.defaults.clear_user_default("needs_item_tax_template_notification")
+
+
+class ProgressReporter:
+    """
+    Publish realtime progress for long running jobs, throttled to limit messages.
+
+    Progress is published only when it has advanced by `min_step` percent or
+    `min_interval` seconds have passed since it was last published.
+    Completion (100%) is always published.
+    """
+
+    def __init__(
+        self,
+        event,
+        total,
+        doctype=None,
+        user=None,
+        min_step=5,
+        min_interval=0.5,
+    ):
+        self.event = event
+        self.total = total
+        self.doctype = doctype
+        self.user = user or frappe.session.user
+        self.min_step = min_step
+        self.min_interval = min_interval
+
+        self.last_progress = None
+        self.last_published_at = 0
+
+    def update(self, current, **data):
+        progress = current * 100 / self.total if self.total else 100
+
+        if not self.should_publish(progress):
+            return
+
+        self.last_progress = progress
+        self.last_published_at = time.monotonic()
+
+        frappe.publish_realtime(
+            self.event,
+            {"current_progress": progress, **data},
+            user=self.user,
+            doctype=self.doctype,
+        )
+
+    def should_publish(self, progress):
+        if progress >= 100 or self.last_progress is None:
+            return True
+
+        return (
+            progress - self.last_progress >= self.min_step
+            or time.monotonic() - self.last_published_at >= self.min_interval
+        )
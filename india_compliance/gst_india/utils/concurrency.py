@@ -0,0 +1,133 @@
+from queue import Empty, SimpleQueue
+from threading import Thread
+
+import frappe
+
+
+def run_in_threads(func, args_list, max_workers=4, on_complete=None):
+    """
+    Run `func` for each item of `args_list` in a thread pool.
+
+    Each thread is initialised once with the current site and user, with its
+    own database connection (committed after each item where `func` succeeds).
+    Runs sequentially in tests or where `max_workers` is 1.
+
+    :param func: function to call with each item of `args_list` (unpacked if tuple)
+    :param args_list: list of args
+    :param max_workers: maximum number of threads
+    :param on_complete: called in the current thread with number of completed items
+    :returns: list of results in the order of `args_list`
+    """
+    args_list = [args if isinstance(args, tuple) else (args,) for args in args_list]
+    results = [None] * len(args_list)
+
+    if frappe.flags.in_test or max_workers <= 1 or len(args_list) <= 1:
+        for i, args in enumerate(args_list, start=1):
+            results[i - 1] = func(*args)
+            if on_complete:
+                on_complete(i)
+
+        return results
+
+    pending = SimpleQueue()
+    for item in enumerate(args_list):
+        pending.put(item)
+
+    completed = SimpleQueue()
+    context = frappe._dict(
+        site=frappe.local.site,
+        sites_path=frappe.local.sites_path,
+        user=frappe.session.user,
+    )
+
+    for _ in range(min(max_workers, len(args_list))):
+        Thread(
+            target=_worker,
+            args=(context, func, pending, completed),
+            daemon=True,
+        ).start()
+
+    exception = None
+    for count in range(1, len(args_list) + 1):
+        index, result, error = completed.get()
+        if error:
+            exception = exception or error
+        else:
+            results[index] = result
+
+        if on_complete:
+            on_complete(count)
+
+    if exception:
+        raise exception
+
+    return results
+
+
+def _worker(context, func, pending, completed):
+    """
+    Processes items from `pending` until it is empty.
+
+    A result or an error is put in `completed` for every item taken
+    (including on `BaseException`), so that the caller is never left waiting.
+    """
+    try:
+        frappe.init(site=context.site, sites_path=context.sites_path)
+        frappe.connect()
+        frappe.set_user(context.user)
+
+    except BaseException as e:
+        _fail_pending(pending, completed, e)
+        _destroy()
+        return
+
+    try:
+        while True:
+            try:
+                index, args = pending.get_nowait()
+            except Empty:
+                return
+
+            try:
+                result = func(*args)
+                frappe.db.commit()
+
+            except BaseException as e:
+                completed.put((index, None, e))
+
+                try:
+                    frappe.db.rollback()
+                except BaseException as rollback_error:
+                    # connection is not usable anymore
+                    _fail_pending(pending, completed, rollback_error)
+                    return
+
+                # interrupted, stop processing
+                if not isinstance(e, Exception):
+                    _fail_pending(pending, completed, e)
+                    return
+
+                continue
+
+            completed.put((index, result, None))
+
+    finally:
+        _destroy()
+
+
+def _fail_pending(pending, completed, error):
+    """Mark remaining items as failed"""
+    while True:
+        try:
+            index, args = pending.get_nowait()
+        except Empty:
+            return
+
+        completed.put((index, None, error))
+
+
+def _destroy():
+    try:
+        frappe.destroy()
+    except Exception:
+        pass
@@ -1,4 +1,5 @@
 import json
+import time
 
 import jwt
 
@@ -6,6 +7,7 @@ import frappe
 from frappe import _
 from frappe.utils import (
     add_to_date,
+    cint,
     cstr,
     format_date,
     get_datetime,
@@ -30,6 +32,7 @@ from india_compliance.gst_india.overrides.transaction import (
     validate_mandatory_fields,
 )
 from india_compliance.gst_india.utils import (
+    ProgressReporter,
     are_goods_supplied,
     is_api_enabled,
     is_foreign_doc,
@@ -39,12 +42,19 @@ from india_compliance.gst_india.utils import (
     send_updated_doc,
     update_onload,
 )
+from india_compliance.gst_india.utils.concurrency import run_in_threads
 from india_compliance.gst_india.utils.e_waybill import (
     _cancel_e_waybill,
     log_and_process_e_waybill_generation,
 )
 from india_compliance.gst_india.utils.transaction_data import GSTTransactionData
 
+BULK_GENERATION_BATCH_SIZE = 50
+BULK_GENERATION_WORKERS = 4
+
+# Maximum IRN requests per second for bulk generation
+BULK_GENERATION_RATE_LIMIT = 10
+
 
 @frappe.whitelist()
 def enqueue_bulk_e_invoice_generation(docnames):
@@ -59,10 +69,12 @@ def enqueue_bulk_e_invoice_generation(docnames):
         frappe.throw(_("Please enable e-Invoicing in GST Settings first"))
 
     docnames = frappe.parse_json(docnames) if docnames.startswith("[") else [docnames]
+    max_workers = get_bulk_generation_workers()
     rq_job = frappe.enqueue(
         "india_compliance.gst_india.utils.e_invoice.generate_e_invoices",
         queue="short" if len(docnames) < 5 else "long",
-        timeout=len(docnames) * 240,  # 4 mins per e-Invoice
+        # 4 mins per e-Invoice, for each worker
+        timeout=-(-len(docnames) // max_workers) * 240,
         docnames=docnames,
     )
 
@@ -73,6 +85,43 @@ def generate_e_invoices(docnames, force=False):
     """
     Bulk generate e-Invoices for the given Sales Invoices.
     Permission checks are done in the `generate_e_invoice` function.
+
+    Invoices are processed concurrently in rate-limited batches. Each e-Invoice
+    is committed individually, so that a failure doesn't affect others.
+    If the GSP server is down, remaining invoices are not processed.
+    """
+    max_workers = get_bulk_generation_workers()
+    rate_limit = cint(frappe.conf.ic_e_invoice_rate_limit) or BULK_GENERATION_RATE_LIMIT
+
+    for i in range(0, len(docnames), BULK_GENERATION_BATCH_SIZE):
+        batch = docnames[i : i + BULK_GENERATION_BATCH_SIZE]
+        started_at = time.monotonic()
+
+        has_server_error = any(
+            run_in_threads(
+                _generate_e_invoice,
+                [(docname, force) for docname in batch],
+                max_workers=max_workers,
+            )
+        )
+
+        if has_server_error:
+            set_auto_retry_status(docnames[i + BULK_GENERATION_BATCH_SIZE :])
+            return
+
+        if (wait := len(batch) / rate_limit - (time.monotonic() - started_at)) > 0:
+            time.sleep(wait)
+
+
+def get_bulk_generation_workers():
+    return cint(frappe.conf.ic_e_invoice_workers) or BULK_GENERATION_WORKERS
+
+
+def _generate_e_invoice(docname, force=False):
+    """
+    Generate e-Invoice for a Sales Invoice in bulk generation.
+
+    :returns: True if the GSP server is down
     """
 
     def log_error():
@@ -83,28 +132,35 @@ def generate_e_invoices(docnames, force=False):
             message=frappe.get_traceback(),
         )
 
-    for docname in docnames:
-        try:
-            generate_e_invoice(docname, throw=False, force=force)
+    try:
+        generate_e_invoice(docname, throw=False, force=force)
+
+    except GSPServerError:
+        set_auto_retry_status([docname])
 
-        except GSPServerError:
-            frappe.db.set_value(
-                "Sales Invoice",
-                {"name": ("in", docnames), "irn": ("is", "not set")},
-                "einvoice_status",
-                "Auto-Retry",
-            )
+        log_error()
+        frappe.clear_last_message()
+        return True
+
+    except Exception:
+        log_error()
+        frappe.clear_last_message()
+
+    finally:
+        # each e-Invoice needs to be committed individually
+        frappe.db.commit()  # nosemgrep
 
-            log_error()
-            frappe.clear_last_message()
 
-        except Exception:
-            log_error()
-            frappe.clear_last_message()
+def set_auto_retry_status(docnames):
+    if not docnames:
+        return
 
-        finally:
-            # each e-Invoice needs to be committed individually
-            frappe.db.commit()  # nosemgrep
+    frappe.db.set_value(
+        "Sales Invoice",
+        {"name": ("in", docnames), "irn": ("is", "not set")},
+        "einvoice_status",
+        "Auto-Retry",
+    )
 
 
 @frappe.whitelist()
@@ -195,28 +251,7 @@ def generate_e_invoice(docname, throw=True, force=False):
         }
     )
 
-    invoice_data = None
-    if result.SignedInvoice:
-        decoded_invoice = json.loads(
-            jwt.decode(result.SignedInvoice, options={"verify_signature": False})[
-                "data"
-            ]
-        )
-        invoice_data = frappe.as_json(decoded_invoice, indent=4)
-
-    log_e_invoice(
-        doc,
-        {
-            "irn": doc.irn,
-            "sales_invoice": docname,
-            "acknowledgement_number": result.AckNo,
-            "acknowledged_on": parse_datetime(result.AckDt),
-            "signed_invoice": result.SignedInvoice,
-            "signed_qr_code": result.SignedQRCode,
-            "invoice_data": invoice_data,
-            "is_generated_in_sandbox_mode": api.sandbox_mode,
-        },
-    )
+    log_e_invoice(doc, get_e_invoice_log_data(docname, result, api.sandbox_mode))
 
     if result.EwbNo:
         log_and_process_e_waybill_generation(doc, result, with_irn=True)
@@ -233,6 +268,28 @@ def generate_e_invoice(docname, throw=True, force=False):
     return send_updated_doc(doc)
 
 
+def get_e_invoice_log_data(docname, result, sandbox_mode):
+    invoice_data = None
+    if result.SignedInvoice:
+        decoded_invoice = json.loads(
+            jwt.decode(result.SignedInvoice, options={"verify_signature": False})[
+                "data"
+            ]
+        )
+        invoice_data = frappe.as_json(decoded_invoice, indent=4)
+
+    return {
+        "irn": result.Irn,
+        "sales_invoice": docname,
+        "acknowledgement_number": result.AckNo,
+        "acknowledged_on": parse_datetime(result.AckDt),
+        "signed_invoice": result.SignedInvoice,
+        "signed_qr_code": result.SignedQRCode,
+        "invoice_data": invoice_data,
+        "is_generated_in_sandbox_mode": sandbox_mode,
+    }
+
+
 @frappe.whitelist()
 def cancel_e_invoice(docname, values):
     doc = load_doc("Sales Invoice", docname, "cancel")
@@ -283,6 +340,256 @@ def log_and_process_e_invoice_cancellation(doc, values, result, message):
     frappe.msgprint(_(message), indicator="green", alert=True)
 
 
+@frappe.whitelist()
+def enqueue_bulk_e_invoice_cancellation(docnames, values):
+    """
+    Enqueue bulk cancellation of e-Invoices for the given Sales Invoices.
+    """
+
+    frappe.has_permission("Sales Invoice", "cancel", throw=True)
+
+    docnames = frappe.parse_json(docnames) if docnames.startswith("[") else [docnames]
+    rq_job = frappe.enqueue(
+        "india_compliance.gst_india.utils.e_invoice.cancel_e_invoices",
+        queue="long",
+        # 4 mins per e-Invoice, for each worker
+        timeout=-(-len(docnames) // get_bulk_generation_workers()) * 240,
+        docnames=docnames,
+        values=frappe.parse_json(values),
+    )
+
+    return rq_job.id
+
+
+def cancel_e_invoices(docnames, values):
+    """
+    Bulk cancel e-Invoices for the given Sales Invoices.
+    Permission checks are done in the `cancel_e_invoice` function.
+    """
+    return run_bulk_e_invoice_action(
+        "Cancel",
+        _cancel_e_invoice,
+        [(docname, values) for docname in docnames],
+    )
+
+
+def _cancel_e_invoice(docname, values):
+    try:
+        cancel_e_invoice(docname, values)
+        return "Cancelled"
+
+    except Exception:
+        frappe.log_error(
+            title=_("e-Invoice cancellation failed for Sales Invoice {0}").format(
+                docname
+            ),
+            message=frappe.get_traceback(),
+        )
+        return "Failed"
+
+    finally:
+        frappe.clear_last_message()
+
+
+@frappe.whitelist()
+def enqueue_bulk_e_invoice_status_sync(docnames=None, filters=None):
+    """
+    Enqueue sync of e-Invoice status with the e-Invoice Portal, for the given
+    Sales Invoices or those matching the filters.
+    """
+
+    frappe.has_permission("Sales Invoice", "write", throw=True)
+
+    if docnames:
+        docnames = frappe.parse_json(docnames)
+    else:
+        docnames = frappe.get_list(
+            "Sales Invoice",
+            filters=frappe.parse_json(filters or "{}"),
+            pluck="name",
+        )
+
+    rq_job = frappe.enqueue(
+        "india_compliance.gst_india.utils.e_invoice.sync_e_invoice_status",
+        queue="long",
+        timeout=-(-len(docnames) // get_bulk_generation_workers()) * 240,
+        docnames=docnames,
+    )
+
+    return rq_job.id
+
+
+def sync_e_invoice_status(docnames):
+    """
+    Update status of e-Invoices and their logs, as per details available
+    on the e-Invoice Portal. Updates are written together at the end.
+
+    Invoices without IRN are looked up by document details, in case the
+    e-Invoice was generated but its response was not received.
+    """
+    invoices = frappe.get_all(
+        "Sales Invoice",
+        filters={"name": ("in", docnames), "docstatus": 1},
+        or_filters={
+            "irn": ("is", "set"),
+            "einvoice_status": ("in", ("Pending", "Auto-Retry", "Failed")),
+        },
+        fields=["name", "irn", "einvoice_status"],
+    )
+
+    responses = run_bulk_e_invoice_action(
+        "Sync",
+        _get_e_invoice,
+        [(invoice.name, invoice.irn) for invoice in invoices],
+        summarise=False,
+    )
+
+    sandbox_mode = frappe.get_cached_value("GST Settings", None, "sandbox_mode")
+    summary = {}
+    invoice_updates = {}
+    log_updates = {}
+    new_logs = []
+
+    for invoice, response in zip(invoices, responses):
+        if not response:
+            status = "Failed"
+
+        # IRN details cannot be provided as it is generated more than 2 days ago
+        elif response.error_code == "2283":
+            status = "Not Available"
+
+        # e-Invoice is not generated for the document
+        elif response.error_code == "2148":
+            status = "Not Generated"
+
+        elif response.Status == "CNL":
+            status = "Cancelled"
+            invoice_updates[invoice.name] = {"einvoice_status": status, "irn": ""}
+            log_data = {
+                "is_cancelled": 1,
+                "cancelled_on": (
+                    parse_datetime(response.CnlDt) if response.CnlDt else get_datetime()
+                ),
+                **get_cancel_reason(response),
+            }
+
+            if invoice.irn:
+                log_updates[invoice.irn] = log_data
+            else:
+                new_logs.append(
+                    {
+                        **get_e_invoice_log_data(invoice.name, response, sandbox_mode),
+                        **log_data,
+                    }
+                )
+
+        else:
+            status = "Generated"
+            if not invoice.irn:
+                invoice_updates[invoice.name] = {
+                    "einvoice_status": status,
+                    "irn": response.Irn,
+                }
+                new_logs.append(
+                    get_e_invoice_log_data(invoice.name, response, sandbox_mode)
+                )
+
+            elif invoice.einvoice_status != status:
+                invoice_updates[invoice.name] = {"einvoice_status": status}
+
+        summary[status] = summary.get(status, 0) + 1
+
+    if invoice_updates:
+        frappe.db.bulk_update("Sales Invoice", invoice_updates)
+
+    if log_updates:
+        frappe.db.bulk_update("e-Invoice Log", log_updates)
+
+    for log_data in new_logs:
+        _log_e_invoice(log_data)
+
+    publish_bulk_e_invoice_summary("Sync", summary)
+    return summary
+
+
+def get_cancel_reason(response):
+    # reason is only available if returned by the portal
+    reason = next(
+        (
+            reason
+            for reason, code in CANCEL_REASON_CODES.items()
+            if code == cstr(response.CnlRsn)
+        ),
+        "Others",
+    )
+
+    return {
+        "cancel_reason_code": reason,
+        "cancel_remark": response.CnlRem or _("Cancelled on e-Invoice Portal"),
+    }
+
+
+def _get_e_invoice(docname, irn=None):
+    try:
+        doc = load_doc("Sales Invoice", docname, "write")
+        api = EInvoiceAPI(doc)
+
+        if irn:
+            return api.get_e_invoice_by_irn(irn)
+
+        return api.get_e_invoice_by_doc_details(
+            get_invoice_type(doc),
+            doc.name,
+            format_date(doc.posting_date, EInvoiceData.DATE_FORMAT),
+        )
+
+    except Exception:
+        frappe.log_error(
+            title=_("e-Invoice status sync failed for Sales Invoice {0}").format(
+                docname
+            ),
+            message=frappe.get_traceback(),
+        )
+        frappe.clear_last_message()
+
+
+def run_bulk_e_invoice_action(action, func, args_list, summarise=True):
+    """
+    Run `func` for each item of `args_list` concurrently, with realtime progress.
+
+    :param summarise: publish count of each result, returned by `func`
+    """
+    progress = ProgressReporter(
+        "bulk_e_invoice_progress", len(args_list), doctype="Sales Invoice"
+    )
+
+    results = run_in_threads(
+        func,
+        args_list,
+        max_workers=get_bulk_generation_workers(),
+        on_complete=lambda completed: progress.update(completed, action=action),
+    )
+
+    if not summarise:
+        return results
+
+    summary = {}
+    for result in results:
+        summary[result] = summary.get(result, 0) + 1
+
+    publish_bulk_e_invoice_summary(action, summary)
+    return summary
+
+
+def publish_bulk_e_invoice_summary(action, summary):
+    frappe.publish_realtime(
+        "bulk_e_invoice_summary",
+        {"action": action, "summary": summary},
+        user=frappe.session.user,
+        doctype="Sales Invoice",
+    )
+
+
 @frappe.whitelist()
 def mark_e_invoice_as_cancelled(doctype, docname, values):
     doc = load_doc(doctype, docname, "cancel")
@@ -329,6 +636,16 @@ def _log_e_invoice(log_data):
     log.save(ignore_permissions=True)
 
 
+def get_invoice_type(doc):
+    if doc.is_debit_note:
+        return "DBN"
+
+    if doc.is_return:
+        return "CRN"
+
+    return "INV"
+
+
 def validate_e_invoice_applicability(doc, gst_settings=None, throw=True):
     def _throw(error):
         if throw:
@@ -581,26 +898,20 @@ class EInvoiceData(GSTTransactionData):
             )
 
     def update_transaction_details(self):
-        invoice_type = "INV"
-
-        if self.doc.is_debit_note:
-            invoice_type = "DBN"
-
-        elif self.doc.is_return:
-            invoice_type = "CRN"
+        invoice_type = get_invoice_type(self.doc)
 
-            if return_against := self.doc.return_against:
-                self.transaction_details.update(
-                    {
-                        "original_name": return_against,
-                        "original_date": format_date(
-                            frappe.db.get_value(
-                                "Sales Invoice", return_against, "posting_date"
-                            ),
-                            self.DATE_FORMAT,
+        if invoice_type == "CRN" and (return_against := self.doc.return_against):
+            self.transaction_details.update(
+                {
+                    "original_name": return_against,
+                    "original_date": format_date(
+                        frappe.db.get_value(
+                            "Sales Invoice", return_against, "posting_date"
                         ),
-                    }
-                )
+                        self.DATE_FORMAT,
+                    ),
+                }
+            )
 
         self.transaction_details.update(
             {
@@ -1,11 +1,13 @@
 import json
 import os
+import time
 
 import frappe
 from frappe import _
 from frappe.desk.form.load import get_docinfo
 from frappe.utils import (
     add_to_date,
+    cint,
     format_date,
     get_datetime,
     get_fullname,
@@ -13,6 +15,7 @@ from frappe.utils import (
     random_string,
 )
 from frappe.utils.file_manager import save_file
+from frappe.utils.pdf import get_pdf
 
 from india_compliance.gst_india.api_classes.e_invoice import EInvoiceAPI
 from india_compliance.gst_india.api_classes.e_waybill import EWaybillAPI
@@ -35,8 +38,18 @@ from india_compliance.gst_india.utils import (
     send_updated_doc,
     update_onload,
 )
+from india_compliance.gst_india.utils.concurrency import run_in_threads
 from india_compliance.gst_india.utils.transaction_data import GSTTransactionData
 
+BULK_GENERATION_BATCH_SIZE = 50
+BULK_GENERATION_WORKERS = 4
+
+# Maximum e-Waybill requests per second for bulk generation
+BULK_GENERATION_RATE_LIMIT = 10
+
+PDF_BATCH_SIZE = 50
+PDF_WORKERS = 4
+
 #######################################################################################
 ### Manual JSON Generation for e-Waybill ##############################################
 #######################################################################################
@@ -93,10 +106,12 @@ def enqueue_bulk_e_waybill_generation(doctype, docnames):
         frappe.throw(_("Please enable e-Waybill in GST Settings first."))
 
     docnames = frappe.parse_json(docnames) if docnames.startswith("[") else [docnames]
+    max_workers = get_e_waybill_workers()
     rq_job = frappe.enqueue(
         "india_compliance.gst_india.utils.e_waybill.generate_e_waybills",
         queue="long",
-        timeout=len(docnames) * 240,  # 4 mins per e-Waybill
+        # 4 mins per e-Waybill, for each worker
+        timeout=-(-len(docnames) // max_workers) * 240,
         doctype=doctype,
         docnames=docnames,
     )
@@ -107,23 +122,167 @@ def enqueue_bulk_e_waybill_generation(doctype, docnames):
 def generate_e_waybills(doctype, docnames):
     """
     Bulk generate e-Waybill for the given documents.
-    """
 
-    for docname in docnames:
-        try:
-            doc = load_doc(doctype, docname, "submit")
-            _generate_e_waybill(doc)
-        except Exception:
-            frappe.log_error(
-                title=_("e-Waybill generation failed for {0} {1}").format(
-                    doctype, docname
-                ),
-                message=frappe.get_traceback(),
+    Documents are processed concurrently in rate-limited batches, and each
+    e-Waybill is committed individually. PDFs are attached in a separate job
+    once all e-Waybills are generated.
+    """
+    max_workers = get_e_waybill_workers()
+    rate_limit = cint(frappe.conf.ic_e_waybill_rate_limit) or BULK_GENERATION_RATE_LIMIT
+    generated = []
+
+    for i in range(0, len(docnames), BULK_GENERATION_BATCH_SIZE):
+        batch = docnames[i : i + BULK_GENERATION_BATCH_SIZE]
+        started_at = time.monotonic()
+
+        generated.extend(
+            docname
+            for docname in run_in_threads(
+                _generate_e_waybill_in_bulk,
+                [(doctype, docname) for docname in batch],
+                max_workers=max_workers,
             )
+            if docname
+        )
+
+        if (wait := len(batch) / rate_limit - (time.monotonic() - started_at)) > 0:
+            time.sleep(wait)
+
+    if not generated:
+        return
+
+    settings = frappe.get_cached_doc("GST Settings")
+    if settings.fetch_e_waybill_data and settings.attach_e_waybill_print:
+        frappe.enqueue(
+            "india_compliance.gst_india.utils.e_waybill.attach_e_waybill_pdfs",
+            queue="long",
+            timeout=len(generated) * 60,
+            doctype=doctype,
+            docnames=generated,
+        )
+
+
+def get_e_waybill_workers():
+    return cint(frappe.conf.ic_e_waybill_workers) or BULK_GENERATION_WORKERS
+
+
+def _generate_e_waybill_in_bulk(doctype, docname):
+    """Returns docname if e-Waybill is generated"""
+    # log and fetch data in the same thread, and defer attaching PDF
+    frappe.flags.in_bulk_e_waybill_generation = True
+
+    try:
+        doc = load_doc(doctype, docname, "submit")
+        _generate_e_waybill(doc)
+
+        if doc.get("ewaybill"):
+            return docname
+
+    except Exception:
+        frappe.log_error(
+            title=_("e-Waybill generation failed for {0} {1}").format(doctype, docname),
+            message=frappe.get_traceback(),
+        )
+        frappe.clear_last_message()
+
+    finally:
+        # each e-Waybill needs to be committed individually
+        frappe.db.commit()  # nosemgrep
+        frappe.flags.in_bulk_e_waybill_generation = False
+
+
+def attach_e_waybill_pdfs(doctype, docnames):
+    """
+    Attach PDFs of e-Waybills generated in bulk.
+
+    Prints are rendered to HTML first, and then converted to PDF by
+    concurrent renderer processes for each batch.
+    """
+    max_workers = cint(frappe.conf.ic_e_waybill_pdf_workers) or PDF_WORKERS
+    docs = frappe.get_all(
+        doctype,
+        filters={"name": ("in", docnames), "ewaybill": ("is", "set")},
+        fields=["name", "ewaybill"],
+    )
+
+    for i in range(0, len(docs), PDF_BATCH_SIZE):
+        batch = docs[i : i + PDF_BATCH_SIZE]
+        prints = {}
+
+        for doc in batch:
+            try:
+                prints[doc.name] = frappe.get_print(
+                    "e-Waybill Log",
+                    doc.ewaybill,
+                    "e-Waybill",
+                    no_letterhead=True,
+                )
+
+            except Exception:
+                log_pdf_error(doctype, doc.name)
+
+        pdfs = run_in_threads(
+            _get_e_waybill_pdf,
+            [(doctype, docname, html) for docname, html in prints.items()],
+            max_workers=max_workers,
+        )
+
+        e_waybill_map = {doc.name: doc.ewaybill for doc in batch}
+        attach_files(
+            doctype,
+            {
+                docname: (get_pdf_filename(e_waybill_map[docname]), pdf)
+                for docname, pdf in zip(prints, pdfs)
+                if pdf
+            },
+        )
+        frappe.db.commit()  # nosemgrep
+
+
+def _get_e_waybill_pdf(doctype, docname, html):
+    try:
+        return get_pdf(html)
 
-        finally:
-            # each e-Waybill needs to be committed individually
-            frappe.db.commit()  # nosemgrep
+    except Exception:
+        log_pdf_error(doctype, docname)
+
+
+def log_pdf_error(doctype, docname):
+    frappe.log_error(
+        title=_("e-Waybill PDF could not be attached for {0} {1}").format(
+            doctype, docname
+        ),
+        message=frappe.get_traceback(),
+    )
+    frappe.clear_last_message()
+
+
+def attach_files(doctype, files):
+    """
+    Replace files attached to documents.
+
+    :param files: dict of docname and tuple of file name and content
+    """
+    if not files:
+        return
+
+    # existing files with same name are fetched for all documents at once
+    for file in frappe.get_all(
+        "File",
+        filters={
+            "attached_to_doctype": doctype,
+            "attached_to_name": ("in", list(files)),
+        },
+        fields=["name", "attached_to_name", "file_name"],
+    ):
+        filename, extn = os.path.splitext(files[file.attached_to_name][0])
+        file_name = file.file_name or ""
+        if file_name.startswith(filename) and file_name.endswith(extn):
+            frappe.delete_doc("File", file.name, force=True, ignore_permissions=True)
+
+    for docname, (filename, content) in files.items():
+        save_file(filename, content, doctype, docname, is_private=1)
+        publish_pdf_update(frappe.get_doc(doctype, docname))
 
 
 @frappe.whitelist()
@@ -689,6 +848,16 @@ def get_valid_and_invalid_e_waybill_log(
         )
     }
 
+    refreshed_docs = refresh_e_waybill_logs(
+        doctype,
+        [
+            docname
+            for docname in docs
+            if (log := e_waybill_log.get(e_waybill_map.get(docname)))
+            and not log.is_latest_data
+        ],
+    )
+
     for docname in docs:
         form_link = f"""<strong>{get_link_to_form(doctype, docname)}</strong>"""
         e_waybill_no = e_waybill_map.get(docname)
@@ -703,17 +872,11 @@ def get_valid_and_invalid_e_waybill_log(
             invalid_log.append({"link": form_link, "reason": "Has no e-Waybill Log"})
             continue
 
-        if log.is_latest_data:
+        if log.is_latest_data or docname in refreshed_docs:
             valid_log.append(e_waybill_no)
             continue
 
-        try:
-            fetch_e_waybill_data(doctype=doctype, docname=docname, attach=False)
-            valid_log.append(e_waybill_no)
-        except Exception:
-            invalid_log.append(
-                {"link": form_link, "reason": "Cannot fetch latest data"}
-            )
+        invalid_log.append({"link": form_link, "reason": "Cannot fetch latest data"})
 
     if not valid_log:
         frappe.throw(_("No Valid e-Waybill log found."))
@@ -721,6 +884,51 @@ def get_valid_and_invalid_e_waybill_log(
     return {"valid_log": valid_log, "invalid_log": invalid_log}
 
 
+def refresh_e_waybill_logs(doctype, docnames):
+    """
+    Fetch latest data of e-Waybills for the given documents concurrently,
+    and update e-Waybill Logs at once.
+
+    :returns: set of docnames for which latest data was fetched
+    """
+    if not docnames:
+        return set()
+
+    results = run_in_threads(
+        _get_latest_e_waybill_data,
+        [(doctype, docname) for docname in docnames],
+        max_workers=get_e_waybill_workers(),
+    )
+
+    updates = {
+        e_waybill_number: {
+            "data": frappe.as_json(data, indent=4),
+            "is_latest_data": 1,
+        }
+        for e_waybill_number, data in filter(None, results)
+    }
+
+    if updates:
+        frappe.db.bulk_update("e-Waybill Log", updates)
+
+    return {docname for docname, result in zip(docnames, results) if result}
+
+
+def _get_latest_e_waybill_data(doctype, docname):
+    try:
+        doc = load_doc(doctype, docname, "print")
+        return doc.ewaybill, EWaybillAPI(doc).get_e_waybill(doc.ewaybill)
+
+    except Exception:
+        frappe.log_error(
+            title=_("Latest e-Waybill data could not be fetched for {0} {1}").format(
+                doctype, docname
+            ),
+            message=frappe.get_traceback(),
+        )
+        frappe.clear_last_message()
+
+
 #######################################################################################
 ### Other Utility Functions ###########################################################
 #######################################################################################
@@ -731,6 +939,8 @@ def log_and_process_e_waybill(doc, log_data, fetch=False, comment=None):
         _log_and_process_e_waybill,
         queue="short",
         at_front=True,
+        # bulk generation is already in background
+        now=frappe.flags.in_bulk_e_waybill_generation,
         doc=doc,
         log_data=log_data,
         fetch=fetch,
@@ -773,7 +983,8 @@ def _log_and_process_e_waybill(doc, log_data, fetch=False, comment=None):
 
     ### Attach PDF
 
-    if not frappe.get_cached_value(
+    # attached separately for bulk generation
+    if frappe.flags.in_bulk_e_waybill_generation or not frappe.get_cached_value(
         "GST Settings",
         "GST Settings",
         "attach_e_waybill_print",
@@ -1,16 +1,29 @@
+import hashlib
+import json
 from io import BytesIO
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.formatting.rule import FormulaRule
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
 from openpyxl.utils import get_column_letter
 
 import frappe
+from frappe import _
+from frappe.utils import add_to_date
+
+# identical exports are reused within this time
+EXPORT_CACHE_EXPIRY = 60 * 60
+
+# exported files are deleted after this time
+EXPORT_FILE_EXPIRY = 24 * 60 * 60
+EXPORT_FIELD = "excel_export"
 
 
 class ExcelExporter:
     def __init__(self):
-        self.wb = openpyxl.Workbook()
+        # write-only workbook streams rows to file, keeping memory flat
+        self.wb = openpyxl.Workbook(write_only=True)
 
     def create_sheet(self, **kwargs):
         """
@@ -22,7 +35,8 @@ class ExcelExporter:
                 'label': [column1, colum2]
             }
         :param headers: A List of dictionary (cell properties will be optional)
-        :param data: A list of dictionary to append data to sheet
+        :param data: An iterable of dictionaries (or lists in order of headers)
+            to append data to sheet. Can be a generator.
         """
 
         Worksheet().create(workbook=self.wb, **kwargs)
@@ -53,6 +67,126 @@ class ExcelExporter:
         frappe.local.response["filecontent"] = xlsx_file.getvalue()
         frappe.local.response["type"] = "binary"
 
+    def save_file(self, file_name, **kwargs):
+        """Save workbook to a private file directly, and return the File doc"""
+        if file_name.endswith(".xlsx"):
+            file_name = file_name[:-5]
+
+        file_name = f"{file_name}-{frappe.generate_hash(length=8)}.xlsx"
+        self.wb.save(frappe.get_site_path("private", "files", file_name))
+
+        file = frappe.get_doc(
+            {
+                "doctype": "File",
+                "file_name": file_name,
+                "file_url": f"/private/files/{file_name}",
+                "is_private": 1,
+                **kwargs,
+            }
+        )
+        file.insert(ignore_permissions=True)
+        return file
+
+
+def enqueue_export(
+    builder,
+    attached_to_doctype=None,
+    attached_to_name=None,
+    scope=None,
+    data_version=None,
+    **kwargs,
+):
+    """
+    Build excel in background and notify user with a link to the file.
+
+    :param builder: method path, called with `kwargs` to return
+        `ExcelExporter` and file name
+    :param scope: exports of a scope can be cleared together with `clear_export_cache`
+    :param data_version: changes when the exported data changes
+    :returns: URL of file if an identical export is available
+    """
+    key = get_export_key(builder, kwargs, scope, data_version)
+    file_url = frappe.cache.get_value(key)
+
+    if file_url and frappe.db.exists("File", {"file_url": file_url}):
+        return {"file_url": file_url}
+
+    frappe.enqueue(
+        build_export,
+        queue="long",
+        timeout=3600,
+        job_id=key,
+        deduplicate=True,
+        key=key,
+        builder=builder,
+        builder_kwargs=kwargs,
+        attached_to_doctype=attached_to_doctype,
+        attached_to_name=attached_to_name,
+    )
+
+    return {"queued": True}
+
+
+def build_export(
+    key, builder, builder_kwargs, attached_to_doctype=None, attached_to_name=None
+):
+    try:
+        excel, file_name = frappe.get_attr(builder)(**builder_kwargs)
+        file = excel.save_file(
+            file_name,
+            attached_to_doctype=attached_to_doctype,
+            attached_to_name=attached_to_name,
+            attached_to_field=EXPORT_FIELD,
+        )
+
+    except Exception:
+        frappe.log_error(title=_("Excel Export Failed"))
+        frappe.publish_realtime(
+            "excel_export", {"error": True}, user=frappe.session.user
+        )
+        return
+
+    frappe.cache.set_value(key, file.file_url, expires_in_sec=EXPORT_CACHE_EXPIRY)
+    frappe.publish_realtime(
+        "excel_export",
+        {"file_url": file.file_url, "file_name": file.file_name},
+        user=frappe.session.user,
+    )
+
+
+def get_export_key(builder, kwargs, scope=None, data_version=None):
+    params = json.dumps([kwargs, data_version], sort_keys=True, default=str)
+
+    return ":".join(
+        (
+            get_export_cache_prefix(builder, scope),
+            frappe.session.user,
+            hashlib.md5(params.encode()).hexdigest(),
+        )
+    )
+
+
+def get_export_cache_prefix(builder, scope=None):
+    prefix = f"excel_export:{builder}"
+    return f"{prefix}:{scope}" if scope else prefix
+
+
+def clear_export_cache(builder, scope=None):
+    """Data has changed, exports (of the scope) are not to be reused"""
+    frappe.cache.delete_keys(get_export_cache_prefix(builder, scope))
+
+
+def delete_expired_exports():
+    for file in frappe.get_all(
+        "File",
+        filters={
+            "attached_to_field": EXPORT_FIELD,
+            "creation": ("<", add_to_date(None, seconds=-EXPORT_FILE_EXPIRY)),
+        },
+        pluck="name",
+    ):
+        frappe.delete_doc("File", file, force=True, ignore_permissions=True)
+
 
 class Worksheet:
     data_format = frappe._dict(
@@ -97,6 +231,9 @@ class Worksheet:
         self.row_dimension = 1
         self.column_dimension = 1
 
+        # named style for (style key, column)
+        self.styles = {}
+
     def create(
         self,
         workbook,
@@ -111,6 +248,8 @@ class Worksheet:
         self.headers = headers
 
         self.ws = workbook.create_sheet(sheet_name)
+        self.set_dimensions()
+
         self.add_data(filters, is_filter=True)
         self.add_merged_header(merged_headers)
         self.add_data(headers, is_header=True)
@@ -121,25 +260,61 @@ class Worksheet:
 
         self.apply_conditional_formatting(add_totals)
 
+    def set_dimensions(self):
+        """Dimensions are to be set before writing any rows"""
+
+        # avoid row dimension for each data row
+        self.ws.sheet_format.defaultRowHeight = self.data_format.height
+        self.ws.sheet_format.customHeight = True
+
+        for column in range(1, len(self.headers) + 1):
+            style = self.get_style(column, "is_header")
+            self.ws.column_dimensions[get_column_letter(column)].width = style.width
+
     def add_data(self, data, **kwargs):
         if not data:
             return
 
-        if kwargs.get("is_data"):
+        key = next(iter(kwargs))
+        if key == "is_data":
             self.data_row = self.row_dimension
 
+        styles = []
+        height = self.get_style(1, key).height
+
         for row in self.parse_data(data):
-            for idx, val in enumerate(row, 1):
-                cell = self.ws.cell(row=self.row_dimension, column=idx)
-                self.apply_format(row=self.row_dimension, column=idx, **kwargs)
-                cell.value = val
+            # styles are resolved once per column for all rows
+            while len(styles) < len(row):
+                styles.append(self.get_named_style(len(styles) + 1, key))
+
+            self.append_row(row, styles, height)
+
+        if key == "is_data" and self.row_dimension == self.data_row:
+            # no rows in data
+            del self.data_row
+
+    def append_row(self, row, styles, height):
+        cells = []
+        for value, style in zip(row, styles):
+            cell = WriteOnlyCell(self.ws, value=value)
+            if style:
+                cell.style = style
 
-            self.row_dimension += 1
+            cells.append(cell)
+
+        if height != self.ws.sheet_format.defaultRowHeight:
+            self.ws.row_dimensions[self.row_dimension].height = height
+
+        self.ws.append(cells)
+        self.row_dimension += 1
 
     def add_merged_header(self, merged_headers):
         if not merged_headers:
             return
 
+        row = [None] * len(self.headers)
+        styles = [None] * len(self.headers)
+
         for key, value in merged_headers.items():
             merge_from_idx = self.get_column_index(value[0])
             merge_to_idx = self.get_column_index(value[1])
@@ -151,48 +326,64 @@ class Worksheet:
                 end_column=merge_to_idx,
             )
 
-            self.ws.cell(row=self.row_dimension, column=merge_from_idx).value = key
-
-            self.ws.merge_cells(cell_range)
-
-            self.apply_format(
-                row=self.row_dimension,
-                column=merge_from_idx,
-                is_header=True,
+            row[merge_from_idx - 1] = key
+            styles[merge_from_idx - 1] = self.get_named_style(
+                merge_from_idx, "is_header"
             )
+            self.ws.merged_cells.add(cell_range)
 
-        self.row_dimension += 1
+        self.append_row(row, styles, self.get_style(1, "is_header").height)
 
     def get_totals(self):
         """build total row array of fields to be calculated"""
         total_row = []
+        last_row = self.row_dimension - 1
 
         for idx, column in enumerate(self.headers, 1):
             if idx == 1:
                 total_row.append("Totals")
-            elif column.get("fieldtype") in ("Float", "Int"):
-                cell_range = self.get_range(self.data_row, idx, self.ws.max_row, idx)
+            elif column.get("fieldtype") in ("Float", "Int") and getattr(
+                self, "data_row", None
+            ):
+                cell_range = self.get_range(self.data_row, idx, last_row, idx)
                 total_row.append(f"=SUM({cell_range})")
             else:
                 total_row.append("")
 
         return total_row
 
-    def apply_format(self, row, column, **kwargs):
-        """Get style if defined or apply default format to the cell"""
+    def get_named_style(self, column, key):
+        """
+        Get name of style registered in the workbook for cells of the column.
+        Identical styles are defined only once and shared across sheets.
+        """
+        if name := self.styles.get((key, column)):
+            return name
 
-        key, value = kwargs.popitem()
-        if not value:
-            return
+        style = self.get_style(column, key)
+        name = hashlib.md5(
+            str(sorted((k, v) for k, v in style.items() if k != "width")).encode()
+        ).hexdigest()[:10]
+
+        workbook = self.ws.parent
+        if name not in workbook.named_styles:
+            workbook.add_named_style(self.get_cell_style(name, style))
+
+        self.styles[(key, column)] = name
+        return name
+
+    def get_style(self, column, key):
+        """Get style if defined or default format for cells of the column"""
 
         # get default style
         style_name = self.default_styles.get(key)
         style = getattr(self, style_name).copy()
 
         # update custom style
-        custom_styles = self.headers[column - 1].get(style_name)
-        if custom_styles:
-            style.update(custom_styles)
+        if column <= len(self.headers):
+            custom_styles = self.headers[column - 1].get(style_name)
+            if custom_styles:
+                style.update(custom_styles)
 
         if key == "is_total":
             style.update(
@@ -202,29 +393,33 @@ class Worksheet:
                 }
             )
 
-        self.apply_style(row, column, style)
+        return style
 
-    def apply_style(self, row, column, style):
-        """Apply style to cell"""
+    def get_cell_style(self, name, style):
+        """Build named style for the cell"""
 
-        cell = self.ws.cell(row=row, column=column)
-        cell.font = Font(name=style.font_family, size=style.font_size, bold=style.bold)
-        cell.alignment = Alignment(
-            horizontal=style.horizontal,
-            vertical=style.vertical,
-            wrap_text=style.wrap_text,
+        cell_style = NamedStyle(
+            name=name,
+            font=Font(name=style.font_family, size=style.font_size, bold=style.bold),
+            alignment=Alignment(
+                horizontal=style.horizontal,
+                vertical=style.vertical,
+                wrap_text=style.wrap_text,
+            ),
+            number_format=style.number_format,
         )
-        cell.number_format = style.number_format
 
         if style.bg_color:
-            cell.fill = PatternFill(fill_type="solid", fgColor=style.bg_color)
+            cell_style.fill = PatternFill(fill_type="solid", fgColor=style.bg_color)
 
-        self.ws.column_dimensions[get_column_letter(column)].width = style.width
-        self.ws.row_dimensions[row].height = style.height
+        return cell_style
 
     def apply_conditional_formatting(self, has_totals):
         """Apply conditional formatting to data based on comparable fields as defined in headers"""
 
+        if not getattr(self, "data_row", None):
+            return
+
         for row in self.headers:
             if not (compare_field := row.get("compare_with")):
                 continue
@@ -238,7 +433,7 @@ class Worksheet:
             cell_range = self.get_range(
                 start_row=self.data_row,
                 start_column=column,
-                end_row=self.ws.max_row - has_totals,
+                end_row=self.row_dimension - 1 - has_totals,
                 end_column=column,
             )
 
@@ -257,31 +452,38 @@ class Worksheet:
             )
 
     def parse_data(self, data):
-        """Convert data to List of Lists"""
-        out = []
+        """Convert data to rows, lazily for generators"""
 
         if isinstance(data, dict):
             for key, value in data.items():
                 # eg: {"fieldname": "value"} => ["fieldname", "value"]. for filters.
-                out.append([key, value])
+                yield [key, value]
+
+            return
 
-        elif isinstance(data, list):
-            # eg: ["value1", "value2"] => ["value1", "value2"]. for totals.
-            if isinstance(data[0], str):
-                return [data]
+        # eg: ["value1", "value2"] => ["value1", "value2"]. for totals.
+        if isinstance(data, list) and isinstance(data[0], str):
+            yield data
+            return
 
-            for row in data:
-                # eg: [{"label": "value1"}] => "value1". for headers.
-                if row.get("label"):
-                    out.append(row.get("label"))
-                else:
-                    # eg: [{"fieldname1": "value1", "fieldname2": "value2"}] => ["value1", "value2"]. for data.
-                    out.append([row.get(field["fieldname"]) for field in self.headers])
+        fields = [field["fieldname"] for field in self.headers]
+        labels = []
 
-            if row.get("label"):
-                return [out]
+        for row in data:
+            # eg: [{"label": "value1"}] => "value1". for headers.
+            if isinstance(row, dict) and row.get("label"):
+                labels.append(row.get("label"))
+
+            # eg: [{"fieldname1": "value1", "fieldname2": "value2"}] => ["value1", "value2"]. for data.
+            elif isinstance(row, dict):
+                yield [row.get(field) for field in fields]
+
+            # eg: [["value1", "value2"]] => ["value1", "value2"]. rows in order of headers.
+            else:
+                yield row
 
-        return out
+        if labels:
+            yield labels
 
     def get_range(self, start_row, start_column, end_row, end_column, freeze=False):
         """
@@ -1,9 +1,12 @@
 from enum import Enum
+from itertools import groupby
+from operator import itemgetter
 
 import frappe
 from frappe import _
 from frappe.query_builder.terms import Criterion
 from frappe.utils import cint
+from frappe.utils.file_manager import get_file_path
 
 from india_compliance.gst_india.api_classes.returns import (
     GSTR2aAPI,
@@ -14,8 +17,10 @@ from india_compliance.gst_india.doctype.gstr_import_log.gstr_import_log import (
     create_import_log,
     toggle_scheduled_jobs,
 )
-from india_compliance.gst_india.utils import get_party_for_gstin
+from india_compliance.gst_india.utils import ProgressReporter, get_party_for_gstin
+from india_compliance.gst_india.utils.concurrency import run_in_threads
 from india_compliance.gst_india.utils.gstr import gstr_2a, gstr_2b
+from india_compliance.gst_india.utils.gstr.gstr_file import GSTRFile
 
 
 class ReturnType(Enum):
@@ -51,43 +56,88 @@ GSTR_MODULES = {
 
 IMPORT_CATEGORY = ("IMPG", "IMPGSEZ")
 
+# Concurrent requests per return period while downloading GSTR-2A
+DOWNLOAD_WORKERS = 4
+
+# Prefixes for header and categories in GSTR files
+GSTR_FILE_PREFIXES = {
+    ReturnType.GSTR2A.value: ("", ""),
+    ReturnType.GSTR2B.value: ("data", "data.docdata"),
+}
+
+# Header keys read from GSTR files before saving
+GSTR_FILE_HEADER_KEYS = {
+    ReturnType.GSTR2A.value: ("gstin", "fp"),
+    ReturnType.GSTR2B.value: ("gstin", "gendt"),
+}
+
 
 def download_gstr_2a(gstin, return_periods, otp=None):
-    total_expected_requests = len(return_periods) * len(ACTIONS)
+    settings = frappe.get_cached_doc("GST Settings")
+    actions = [
+        action
+        for action, category in ACTIONS.items()
+        if settings.enable_overseas_transactions
+        or category.value not in IMPORT_CATEGORY
+    ]
+
+    total_expected_requests = len(return_periods) * len(actions)
     requests_made = 0
+    progress = ProgressReporter(
+        "update_api_progress",
+        total_expected_requests,
+        doctype="Purchase Reconciliation Tool",
+    )
     queued_message = False
-    settings = frappe.get_cached_doc("GST Settings")
+    max_workers = cint(frappe.conf.ic_gstr_download_workers) or DOWNLOAD_WORKERS
 
     return_type = ReturnType.GSTR2A
     api = GSTR2aAPI(gstin)
     for return_period in return_periods:
         is_last_period = return_periods[-1] == return_period
 
-        json_data = frappe._dict({"gstin": gstin, "fp": return_period})
-        for action, category in ACTIONS.items():
-            requests_made += 1
-
-            if (
-                not settings.enable_overseas_transactions
-                and category.value in IMPORT_CATEGORY
-            ):
-                continue
-
-            frappe.publish_realtime(
-                "update_api_progress",
-                {
-                    "current_progress": requests_made * 100 / total_expected_requests,
-                    "return_period": return_period,
-                    "is_last_period": is_last_period,
-                },
-                user=frappe.session.user,
-                doctype="Purchase Reconciliation Tool",
+        def update_progress(
+            completed,
+            requests_made=requests_made,
+            return_period=return_period,
+            is_last_period=is_last_period,
+        ):
+            progress.update(
+                requests_made + completed,
+                return_period=return_period,
+                is_last_period=is_last_period,
             )
 
+        # first request is made alone to handle OTP and authentication
+        responses = {}
+        for action in actions[:1]:
             response = api.get_data(action, return_period, otp)
             if response.error_type in ["otp_requested", "invalid_otp"]:
                 return response
 
+            responses[action] = response
+            update_progress(1)
+
+        # remaining actions for the period are downloaded concurrently
+        for action, response in zip(
+            actions[1:],
+            run_in_threads(
+                get_gstr_2a_data,
+                [(gstin, action, return_period, otp) for action in actions[1:]],
+                max_workers=max_workers,
+                on_complete=lambda completed: update_progress(completed + 1),
+            ),
+        ):
+            responses[action] = response
+
+        requests_made += len(actions)
+
+        json_data = frappe._dict({"gstin": gstin, "fp": return_period})
+        for action, response in responses.items():
+            category = ACTIONS[action]
+            if response.error_type in ["otp_requested", "invalid_otp"]:
+                return response
+
             if response.error_type == "no_docs_found":
                 create_import_log(
                     gstin,
@@ -132,24 +182,29 @@ def download_gstr_2a(gstin, return_periods, otp=None):
         show_queued_message()
 
 
+def get_gstr_2a_data(gstin, action, return_period, otp=None):
+    # API instances are not thread-safe
+    return GSTR2aAPI(gstin).get_data(action, return_period, otp)
+
+
 def download_gstr_2b(gstin, return_periods, otp=None):
     total_expected_requests = len(return_periods)
     requests_made = 0
+    progress = ProgressReporter(
+        "update_api_progress",
+        total_expected_requests,
+        doctype="Purchase Reconciliation Tool",
+    )
     queued_message = False
 
     api = GSTR2bAPI(gstin)
     for return_period in return_periods:
         is_last_period = return_periods[-1] == return_period
         requests_made += 1
-        frappe.publish_realtime(
-            "update_api_progress",
-            {
-                "current_progress": requests_made * 100 / total_expected_requests,
-                "return_period": return_period,
-                "is_last_period": is_last_period,
-            },
-            user=frappe.session.user,
-            doctype="Purchase Reconciliation Tool",
+        progress.update(
+            requests_made,
+            return_period=return_period,
+            is_last_period=is_last_period,
         )
 
         # TODO: skip if today is not greater than 14th return period's next months
@@ -243,6 +298,110 @@ def save_gstr_2b(gstin, return_period, json_data):
     update_import_history(return_period)
 
 
+def save_gstr_from_file(gstin, return_type, return_period, file_path):
+    """
+    Validate and save GSTR file uploaded from the GST Portal.
+
+    Only the header is read here. Categories are saved from the file
+    in a background job, parsing it incrementally in a single pass,
+    so that memory used does not grow with the size of the file.
+    """
+    return_type = ReturnType(return_type)
+    file_path = get_file_path(file_path)
+    header_prefix = GSTR_FILE_PREFIXES[return_type.value][0]
+    header = GSTRFile(file_path).get_header(
+        header_prefix, GSTR_FILE_HEADER_KEYS[return_type.value]
+    )
+
+    if header.gstin != gstin or (
+        return_type == ReturnType.GSTR2A and header.fp != return_period
+    ):
+        frappe.throw(
+            _(
+                "Data received seems to be invalid from the GST Portal. Please try"
+                " again or raise support ticket."
+            ),
+            title=_("Invalid Response Received."),
+        )
+
+    if return_type == ReturnType.GSTR2B:
+        create_import_log(gstin, return_type.value, return_period)
+
+    frappe.enqueue(
+        _save_gstr_from_file,
+        queue="long",
+        now=frappe.flags.in_test,
+        timeout=7200,
+        gstin=gstin,
+        return_type=return_type.value,
+        return_period=return_period,
+        file_path=file_path,
+        gen_date_2b=header.gendt,
+    )
+
+
+def _save_gstr_from_file(
+    gstin, return_type, return_period, file_path, gen_date_2b=None
+):
+    """Save GSTR data to Inward Supply, streaming suppliers from the file"""
+
+    company = get_party_for_gstin(gstin, "Company")
+    gstr_file = GSTRFile(file_path)
+    categories = {
+        prefix: category
+        for category in GSTRCategory
+        if (prefix := get_file_prefix(return_type, category))
+    }
+
+    # suppliers of a category are together in the file
+    for prefix, records in groupby(
+        gstr_file.get_records(categories), key=itemgetter(0)
+    ):
+        category = categories[prefix]
+        gstr = get_data_handler(return_type, category)
+        gstr(company, gstin, return_period, None, gen_date_2b).stream_transactions(
+            category,
+            (supplier for _, supplier in records),
+            gstr_file.get_progress,
+        )
+
+    if return_type == ReturnType.GSTR2B.value:
+        update_import_history(return_period)
+        return
+
+    for prefix in gstr_file.lists_found:
+        create_import_log(
+            gstin, return_type, return_period, classification=categories[prefix].value
+        )
+
+
+def get_file_prefix(return_type, category):
+    """Returns prefix of the list of suppliers for the category in GSTR files"""
+    if not (key := get_file_key(return_type, category)):
+        return
+
+    categories_prefix = GSTR_FILE_PREFIXES[return_type][1]
+    if categories_prefix:
+        return f"{categories_prefix}.{key}"
+
+    return key
+
+
+def get_file_key(return_type, category):
+    """Returns key used for the category in GSTR files"""
+    if return_type == ReturnType.GSTR2A.value:
+        return next(
+            (
+                action.lower()
+                for action, _category in ACTIONS.items()
+                if _category == category
+            ),
+            None,
+        )
+
+    return category.value.lower()
+
+
 def save_gstr(gstin, return_type, return_period, json_data, gen_date_2b=None):
     frappe.enqueue(
         _save_gstr,
@@ -2,8 +2,9 @@ import frappe
 
 from india_compliance.gst_india.constants import STATE_NUMBERS
 from india_compliance.gst_india.doctype.gst_inward_supply.gst_inward_supply import (
-    create_inward_supply,
+    create_inward_supplies,
 )
+from india_compliance.gst_india.utils import ProgressReporter
 
 
 def get_mapped_value(value, mapping):
@@ -11,6 +12,9 @@ def get_mapped_value(value, mapping):
 
 
 class GSTR:
+    # Transactions saved together when streaming from file
+    STREAM_CHUNK_SIZE = 5000
+
     # Maps of API keys to doctype fields
     KEY_MAPS = frappe._dict()
 
@@ -54,22 +58,54 @@ class GSTR:
             return
 
         transactions = self.get_all_transactions(category, suppliers)
-        total_transactions = len(transactions)
-        current_transaction = 0
-
-        for transaction in transactions:
-            create_inward_supply(transaction)
-
-            current_transaction += 1
-            frappe.publish_realtime(
-                "update_transactions_progress",
-                {
-                    "current_progress": current_transaction * 100 / total_transactions,
-                    "return_period": self.return_period,
-                },
-                user=frappe.session.user,
-                doctype="Purchase Reconciliation Tool",
-            )
+        progress = ProgressReporter(
+            "update_transactions_progress",
+            len(transactions),
+            doctype="Purchase Reconciliation Tool",
+        )
+
+        create_inward_supplies(
+            transactions,
+            lambda current_transaction: progress.update(
+                current_transaction, return_period=self.return_period
+            ),
+        )
+
+    def stream_transactions(self, category, suppliers, get_progress):
+        """
+        Create transactions for suppliers yielded one at a time, in chunks.
+        Used for large files, so that all transactions are not held in memory.
+
+        :param suppliers: iterable of suppliers
+        :param get_progress: function returning approx. progress in percentage
+        """
+        progress = ProgressReporter(
+            "update_transactions_progress",
+            100,
+            doctype="Purchase Reconciliation Tool",
+        )
+
+        transactions = []
+        has_transactions = False
+
+        for supplier in suppliers:
+            transactions.extend(self.get_supplier_transactions(category, supplier))
+            if len(transactions) < self.STREAM_CHUNK_SIZE:
+                continue
+
+            create_inward_supplies(transactions)
+            progress.update(get_progress(), return_period=self.return_period)
+            transactions = []
+            has_transactions = True
+
+        if transactions:
+            create_inward_supplies(transactions)
+            has_transactions = True
+
+        self.update_gstins()
+
+        if has_transactions:
+            progress.update(100, return_period=self.return_period)
 
     def get_all_transactions(self, category, suppliers):
         transactions = []
@@ -0,0 +1,88 @@
+import os
+
+import ijson
+
+import frappe
+
+SCALAR_EVENTS = ("string", "number", "boolean", "null")
+
+
+class GSTRFile:
+    """
+    Incrementally parse GSTR JSON files downloaded from the GST Portal.
+
+    Large (annual) files are never loaded in memory completely.
+    Records are yielded one at a time for the given prefixes.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.file_size = os.path.getsize(file_path) or 1
+        self.position = 0
+        self.lists_found = set()
+
+    def get_header(self, prefix, keys):
+        """
+        Returns scalar values for `keys` at `prefix` (eg: `gstin` and `fp` for GSTR-2A).
+
+        Parsing stops once all keys are read, as these are at the beginning of file.
+        """
+        header = frappe._dict()
+        keys = set(keys)
+
+        with open(self.file_path, "rb") as f:
+            for _prefix, event, value in ijson.parse(f):
+                if event not in SCALAR_EVENTS:
+                    continue
+
+                parent, _, key = _prefix.rpartition(".")
+                if parent != prefix or key not in keys:
+                    continue
+
+                header[key] = value
+                if len(header) == len(keys):
+                    break
+
+        return header
+
+    def get_value(self, prefix):
+        """
+        Returns first value for the prefix. Useful for keys at the beginning of file.
+        """
+        with open(self.file_path, "rb") as f:
+            return next(ijson.items(f, prefix, use_float=True), None)
+
+    def get_records(self, prefixes):
+        """
+        Yields prefix and record from the lists at `prefixes`
+        (eg: suppliers for each category), parsing the file only once.
+
+        Prefixes of lists found in the file (even if empty) are set in `lists_found`.
+        """
+        self.position = 0
+        self.lists_found = set()
+        item_prefixes = {f"{prefix}.item": prefix for prefix in prefixes}
+        builder = item_prefix = None
+
+        with open(self.file_path, "rb") as f:
+            for _prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if event == "end_map" and _prefix == item_prefix:
+                        self.position = f.tell()
+                        yield item_prefixes[item_prefix], frappe._dict(builder.value)
+                        builder = item_prefix = None
+
+                    continue
+
+                if event == "start_array" and _prefix in prefixes:
+                    self.lists_found.add(_prefix)
+
+                elif event == "start_map" and _prefix in item_prefixes:
+                    item_prefix = _prefix
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+
+    def get_progress(self):
+        """Returns approx. percentage of the file read for current records"""
+        return min(self.position * 100 / self.file_size, 99)
@@ -87,6 +87,38 @@ class TestGSTR2a(FrappeTestCase, TestGSTRMixin):
         mock_save_gstr.side_effect = mock_save_gstr_func
         download_gstr_2a(self.gstin, (self.return_period,))
 
+    @patch("india_compliance.gst_india.utils.gstr.save_gstr")
+    @patch("india_compliance.gst_india.utils.gstr.GSTR2aAPI")
+    def test_download_gstr_2a_concurrently(self, mock_gstr_2a_api, mock_save_gstr):
+        requests = []
+
+        def mock_get_data(action, return_period, otp):
+            requests.append(action)
+            return frappe._dict({action.lower(): self.test_data[action.lower()]})
+
+        def get_api(gstin):
+            api = Mock()
+            api.get_data.side_effect = mock_get_data
+            return api
+
+        def mock_save_gstr_func(gstin, return_type, return_period, json_data):
+            self.assertListEqual(json_data.b2b, self.test_data.b2b)
+            self.assertListEqual(json_data.cdnr, self.test_data.cdn)
+            self.assertListEqual(json_data.isd, self.test_data.isd)
+
+        mock_gstr_2a_api.side_effect = get_api
+        mock_save_gstr.side_effect = mock_save_gstr_func
+
+        # threads are not used in tests otherwise
+        with patch.dict(frappe.flags, {"in_test": False}):
+            download_gstr_2a(self.gstin, (self.return_period,))
+
+        # one instance for each concurrent request
+        self.assertEqual(mock_gstr_2a_api.call_count, len(requests))
+        self.assertEqual(len(requests), len(set(requests)))
+        self.assertIn("ISD", requests)
+        mock_save_gstr.assert_called_once()
+
     def test_gstr2a_b2b(self):
         doc = self.get_doc(GSTRCategory.B2B)
         self.assertImportLog(GSTRCategory.B2B)
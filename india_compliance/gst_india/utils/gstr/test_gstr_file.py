@@ -0,0 +1,94 @@
+import os
+from itertools import groupby
+from operator import itemgetter
+from tempfile import NamedTemporaryFile
+from unittest.mock import patch
+
+import frappe
+from frappe import parse_json, read_file
+from frappe.tests.utils import FrappeTestCase
+
+from india_compliance.gst_india.utils import get_data_file_path
+from india_compliance.gst_india.utils.gstr import ReturnType, save_gstr_from_file
+from india_compliance.gst_india.utils.gstr.gstr_file import GSTRFile
+
+
+class TestGSTRFile(FrappeTestCase):
+    def get_records(self, gstr_file, prefixes):
+        return {
+            prefix: [record for _, record in records]
+            for prefix, records in groupby(
+                gstr_file.get_records(prefixes), key=itemgetter(0)
+            )
+        }
+
+    def test_gstr_2a_file(self):
+        file_path = get_data_file_path("test_gstr_2a.json")
+        data = parse_json(read_file(file_path))
+        gstr_file = GSTRFile(file_path)
+
+        self.assertDictEqual(
+            gstr_file.get_header("", ("gstin", "fp")),
+            {"gstin": "01AABCE2207R1Z5", "fp": "032020"},
+        )
+
+        prefixes = ("b2b", "cdn", "isd", "isda")
+        self.assertDictEqual(
+            self.get_records(gstr_file, prefixes),
+            {"b2b": data.b2b, "cdn": data.cdn, "isd": data.isd},
+        )
+        self.assertSetEqual(gstr_file.lists_found, {"b2b", "cdn", "isd"})
+        self.assertGreater(gstr_file.get_progress(), 0)
+
+    def test_gstr_2b_file(self):
+        file_path = get_data_file_path("test_gstr_2b.json")
+        data = parse_json(read_file(file_path)).data
+        gstr_file = GSTRFile(file_path)
+
+        self.assertDictEqual(
+            gstr_file.get_header("data", ("gstin", "gendt")),
+            {"gstin": "01AABCE2207R1Z5", "gendt": "14-04-2020"},
+        )
+
+        prefixes = ("data.docdata.b2b", "data.docdata.impg")
+        self.assertDictEqual(
+            self.get_records(gstr_file, prefixes),
+            {
+                "data.docdata.b2b": data.docdata.b2b,
+                "data.docdata.impg": data.docdata.impg,
+            },
+        )
+
+    def test_header_is_read_from_beginning_of_file(self):
+        # file is incomplete after the header
+        with NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write('{"gstin": "01AABCE2207R1Z5", "fp": "032020", "b2b": [{"ctin"')
+
+        try:
+            self.assertDictEqual(
+                GSTRFile(f.name).get_header("", ("gstin", "fp")),
+                {"gstin": "01AABCE2207R1Z5", "fp": "032020"},
+            )
+        finally:
+            os.remove(f.name)
+
+    @patch(
+        "india_compliance.gst_india.utils.gstr.get_file_path",
+        side_effect=lambda file_path: file_path,
+    )
+    def test_file_not_matching_gstin_or_period(self, get_file_path):
+        file_path = get_data_file_path("test_gstr_2a.json")
+
+        for gstin, return_period in (
+            ("24AAQCA8719H1ZC", "032020"),
+            ("01AABCE2207R1Z5", "042020"),
+        ):
+            self.assertRaisesRegex(
+                frappe.ValidationError,
+                "Data received seems to be invalid",
+                save_gstr_from_file,
+                gstin,
+                ReturnType.GSTR2A.value,
+                return_period,
+                file_path,
+            )
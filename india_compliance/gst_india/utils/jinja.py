@@ -1,4 +1,5 @@
 import base64
+import hashlib
 from datetime import datetime
 from io import BytesIO
 
@@ -6,6 +7,8 @@ import pyqrcode
 from barcode import Code128
 from barcode.writer import ImageWriter
 
+import frappe
+
 from india_compliance.gst_india.constants.e_waybill import (
     SUB_SUPPLY_TYPES,
     SUPPLY_TYPES,
@@ -29,6 +32,9 @@ E_INVOICE_ITEM_FIELDS = {
     "TotItemVal": "Total",
 }
 
+# QR codes and barcodes are reused when printing documents again
+IMAGE_CACHE_EXPIRY = 24 * 60 * 60
+
 E_INVOICE_AMOUNT_FIELDS = {
     "AssVal": "Taxable Value",
     "CgstVal": "CGST",
@@ -89,10 +95,21 @@ def get_e_waybill_qr_code(e_waybill, gstin, ewaybill_date):
 
 
 def get_qr_code(qr_text, scale=5):
-    return pyqrcode.create(qr_text).png_as_base64_str(scale=scale, quiet_zone=1)
+    key = hashlib.md5(str(qr_text).encode()).hexdigest()
+
+    return get_cached_image(
+        f"qr_code:{key}:{scale}",
+        lambda: pyqrcode.create(qr_text).png_as_base64_str(scale=scale, quiet_zone=1),
+    )
 
 
 def get_ewaybill_barcode(ewaybill):
+    return get_cached_image(
+        f"ewaybill_barcode:{ewaybill}", lambda: _get_ewaybill_barcode(ewaybill)
+    )
+
+
+def _get_ewaybill_barcode(ewaybill):
     stream = BytesIO()
     Code128(str(ewaybill), writer=ImageWriter()).write(
         stream,
@@ -109,6 +126,17 @@ def get_ewaybill_barcode(ewaybill):
     return barcode_base64
 
 
+def get_cached_image(key, generate):
+    key = f"print_image:{key}"
+    if image := frappe.cache.get_value(key):
+        return image
+
+    image = generate()
+    frappe.cache.set_value(key, image, expires_in_sec=IMAGE_CACHE_EXPIRY)
+
+    return image
+
+
 def get_non_zero_fields(data, fields):
     """Returns a list of fields with non-zero values"""
 
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from india_compliance.gst_india.utils.concurrency import run_in_threads
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def get_square(number):
+    if number == 3:
+        raise frappe.ValidationError("Invalid number")
+
+    if number == 5:
+        raise Interrupted
+
+    return number * number
+
+
+class TestRunInThreads(FrappeTestCase):
+    def run_in_threads(self, args_list, **kwargs):
+        # threads are not used in tests otherwise
+        with patch.dict(frappe.flags, {"in_test": False}):
+            return run_in_threads(get_square, args_list, max_workers=3, **kwargs)
+
+    def test_results_in_order(self):
+        completed = []
+        results = self.run_in_threads(
+            [1, 2, 4, 6, 7], on_complete=lambda count: completed.append(count)
+        )
+
+        self.assertListEqual(results, [1, 4, 16, 36, 49])
+        self.assertListEqual(completed, [1, 2, 3, 4, 5])
+
+    def test_error_is_raised_after_all_items(self):
+        completed = []
+        with self.assertRaises(frappe.ValidationError):
+            self.run_in_threads(
+                list(range(1, 5)), on_complete=lambda count: completed.append(count)
+            )
+
+        self.assertListEqual(completed, [1, 2, 3, 4])
+
+    def test_base_exception_does_not_block(self):
+        with self.assertRaises(Interrupted):
+            self.run_in_threads([4, 5, 6, 7, 8, 9])
@@ -1,22 +1,28 @@
 import json
 import re
+from unittest.mock import patch
 
 import responses
 from responses import matchers
 
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
-from frappe.utils import add_to_date, get_datetime, getdate, now_datetime
+from frappe.utils import add_to_date, get_datetime, getdate, now_datetime, random_string
 from frappe.utils.data import format_date
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
+from india_compliance.exceptions import GSPServerError
 from india_compliance.gst_india.api_classes.base import BASE_URL
+from india_compliance.gst_india.api_classes.e_invoice import EInvoiceAPI
 from india_compliance.gst_india.utils import load_doc
 from india_compliance.gst_india.utils.e_invoice import (
     EInvoiceData,
     cancel_e_invoice,
+    cancel_e_invoices,
     generate_e_invoice,
+    generate_e_invoices,
     mark_e_invoice_as_cancelled,
+    sync_e_invoice_status,
     validate_e_invoice_applicability,
     validate_if_e_invoice_can_be_cancelled,
 )
@@ -304,6 +310,139 @@ class TestEInvoice(FrappeTestCase):
             frappe.db.get_value("e-Waybill Log", {"reference_name": si.name}, "name")
         )
 
+    @responses.activate
+    def test_generate_e_invoices_in_bulk(self):
+        """Failure of one e-Invoice doesn't affect others in bulk generation"""
+        test_data = self.e_invoice_test_data.get("service_item")
+        si = create_sales_invoice(
+            **test_data.get("kwargs"),
+            is_in_state=True,
+        )
+
+        self._mock_e_invoice_response(data=test_data)
+
+        generate_e_invoices(["_Test Missing Sales Invoice", si.name])
+
+        self.assertDocumentEqual(
+            {
+                "irn": test_data.get("response_data").get("result").get("Irn"),
+                "einvoice_status": "Generated",
+            },
+            frappe.get_doc("Sales Invoice", si.name),
+        )
+
+        self.assertTrue(
+            frappe.db.exists(
+                "Error Log",
+                {
+                    "method": (
+                        "e-Invoice generation failed for Sales Invoice"
+                        " _Test Missing Sales Invoice"
+                    )
+                },
+            )
+        )
+
+    @patch("india_compliance.gst_india.utils.e_invoice.BULK_GENERATION_BATCH_SIZE", 1)
+    @patch("india_compliance.gst_india.utils.e_invoice.generate_e_invoice")
+    def test_bulk_generation_stops_on_server_error(self, generate_e_invoice):
+        generate_e_invoice.side_effect = GSPServerError
+        docnames = [create_sales_invoice().name for _ in range(3)]
+
+        generate_e_invoices(docnames)
+
+        # remaining batches are not processed, but queued for retry
+        generate_e_invoice.assert_called_once()
+        self.assertListEqual(
+            frappe.get_all(
+                "Sales Invoice",
+                filters={"name": ("in", docnames)},
+                pluck="einvoice_status",
+            ),
+            ["Auto-Retry"] * 3,
+        )
+
+    def test_cancel_e_invoices_in_bulk(self):
+        si = create_sales_invoice()
+        summary = cancel_e_invoices(
+            ["_Test Missing Sales Invoice", si.name],
+            frappe._dict(reason="Data Entry Mistake", remark=""),
+        )
+
+        # neither exists nor has IRN
+        self.assertDictEqual(summary, {"Failed": 2})
+
+    @patch.object(EInvoiceAPI, "get_e_invoice_by_doc_details")
+    @patch.object(EInvoiceAPI, "get_e_invoice_by_irn")
+    def test_sync_e_invoice_status(
+        self, get_e_invoice_by_irn, get_e_invoice_by_doc_details
+    ):
+        cancelled_irn = random_string(64)
+        generated_irn = random_string(64)
+
+        # cancelled on portal, with IRN available locally
+        cancelled = create_sales_invoice()
+        cancelled.db_set({"irn": cancelled_irn, "einvoice_status": "Generated"})
+        frappe.get_doc(
+            {
+                "doctype": "e-Invoice Log",
+                "irn": cancelled_irn,
+                "sales_invoice": cancelled.name,
+            }
+        ).insert()
+
+        # generated on portal, but response was not received
+        generated = create_sales_invoice()
+        generated.db_set({"einvoice_status": "Failed"}, update_modified=False)
+
+        get_e_invoice_by_irn.return_value = frappe._dict(
+            Irn=cancelled_irn, Status="CNL", CnlRsn="2", CnlRem="Wrong rate"
+        )
+        get_e_invoice_by_doc_details.return_value = frappe._dict(
+            Irn=generated_irn,
+            Status="ACT",
+            AckNo=112210119220088,
+            AckDt="2022-09-16 19:29:00",
+        )
+
+        summary = sync_e_invoice_status([cancelled.name, generated.name])
+        self.assertDictEqual(summary, {"Cancelled": 1, "Generated": 1})
+
+        get_e_invoice_by_irn.assert_called_once_with(cancelled_irn)
+        get_e_invoice_by_doc_details.assert_called_once_with(
+            "INV", generated.name, format_date(generated.posting_date, "dd/mm/yyyy")
+        )
+
+        self.assertDocumentEqual(
+            {
+                "is_cancelled": 1,
+                "cancel_reason_code": "Data Entry Mistake",
+                "cancel_remark": "Wrong rate",
+            },
+            frappe.get_doc("e-Invoice Log", cancelled_irn),
+        )
+        self.assertEqual(
+            frappe.db.get_value("Sales Invoice", cancelled.name, "einvoice_status"),
+            "Cancelled",
+        )
+
+        self.assertDocumentEqual(
+            {
+                "sales_invoice": generated.name,
+                "acknowledgement_number": "112210119220088",
+            },
+            frappe.get_doc("e-Invoice Log", generated_irn),
+        )
+        invoice = frappe.db.get_value(
+            "Sales Invoice",
+            generated.name,
+            ("irn", "einvoice_status", "modified"),
+            as_dict=True,
+        )
+        self.assertEqual(invoice.irn, generated_irn)
+        self.assertEqual(invoice.einvoice_status, "Generated")
+        self.assertGreater(invoice.modified, generated.modified)
+
     @responses.activate
     def test_generate_e_invoice_with_nil_exempted_item(self):
         """Generate test e-Invoice for nil/exempted items Item"""
@@ -1,6 +1,7 @@
 import datetime
 import random
 import re
+from unittest.mock import patch
 
 import responses
 import time_machine
@@ -8,7 +9,13 @@ from responses import matchers
 
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
-from frappe.utils import add_to_date, get_datetime, now_datetime, today
+from frappe.utils import (
+    add_to_date,
+    get_datetime,
+    get_link_to_form,
+    now_datetime,
+    today,
+)
 from frappe.utils.data import format_date
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
@@ -16,9 +23,13 @@ from india_compliance.gst_india.api_classes.base import BASE_URL
 from india_compliance.gst_india.utils import load_doc
 from india_compliance.gst_india.utils.e_waybill import (
     EWaybillData,
+    attach_e_waybill_pdfs,
     cancel_e_waybill,
     fetch_e_waybill_data,
     generate_e_waybill,
+    generate_e_waybills,
+    get_pdf_filename,
+    get_valid_and_invalid_e_waybill_log,
     update_transporter,
     update_vehicle_info,
 )
@@ -98,6 +109,41 @@ class TestEWaybill(FrappeTestCase):
             ),
         )
 
+    @responses.activate
+    def test_generate_e_waybills_in_bulk(self):
+        """Failure of one e-Waybill doesn't affect others in bulk generation"""
+        self._mock_generate_e_waybill_response(
+            self.e_waybill_test_data.goods_item_with_ewaybill
+        )
+
+        generate_e_waybills(
+            "Sales Invoice", ["_Test Missing Sales Invoice", self.sales_invoice.name]
+        )
+
+        self.assertDocumentEqual(
+            {
+                "name": self.e_waybill_test_data.goods_item_with_ewaybill.get(
+                    "response_data"
+                )
+                .get("result")
+                .get("ewayBillNo")
+            },
+            frappe.get_doc(
+                "e-Waybill Log", {"reference_name": self.sales_invoice.name}
+            ),
+        )
+        self.assertTrue(
+            frappe.db.exists(
+                "Error Log",
+                {
+                    "method": (
+                        "e-Waybill generation failed for Sales Invoice"
+                        " _Test Missing Sales Invoice"
+                    )
+                },
+            )
+        )
+
     @responses.activate
     def test_update_vehicle_info(self):
         """Test whitelisted function `update_vehicle_info`"""
@@ -827,6 +873,15 @@ class TestEWaybill(FrappeTestCase):
         if not docname and doctype == "Sales Invoice":
             docname = self.sales_invoice.name
 
+        self._mock_generate_e_waybill_response(test_data)
+
+        values = (
+            frappe._dict(test_data.get("values")) if test_data.get("values") else None
+        )
+
+        generate_e_waybill(doctype=doctype, docname=docname, values=values)
+
+    def _mock_generate_e_waybill_response(self, test_data):
         # Mock POST response for generate_e_waybill
         self._mock_e_waybill_response(
             data=test_data.get("response_data"),
@@ -850,12 +905,6 @@ class TestEWaybill(FrappeTestCase):
             api="getewaybill",
         )
 
-        values = (
-            frappe._dict(test_data.get("values")) if test_data.get("values") else None
-        )
-
-        generate_e_waybill(doctype=doctype, docname=docname, values=values)
-
     def _mock_e_waybill_response(self, data, match_list, method="POST", api=None):
         """Mock e-waybill response for given data and match_list"""
         base_api = "/test/ewb/ewayapi/"
@@ -873,6 +922,164 @@ class TestEWaybill(FrappeTestCase):
         )
 
 
+class TestEWaybillPDF(FrappeTestCase):
+    def setUp(self):
+        self.invoices = {}
+        for _ in range(3):
+            invoice = create_sales_invoice()
+            e_waybill = str(random.randint(10**11, 10**12 - 1))
+            invoice.db_set("ewaybill", e_waybill)
+            self.invoices[invoice.name] = e_waybill
+
+    def attach_e_waybill_pdfs(self, get_print, get_pdf=lambda html: html.encode()):
+        with patch("frappe.get_print", side_effect=get_print), patch(
+            "india_compliance.gst_india.utils.e_waybill.get_pdf", side_effect=get_pdf
+        ):
+            attach_e_waybill_pdfs("Sales Invoice", list(self.invoices))
+
+    def get_attached_pdfs(self, docname):
+        return [
+            (file.file_name, frappe.safe_decode(file.get_content()))
+            for file in (
+                frappe.get_doc("File", name)
+                for name in frappe.get_all(
+                    "File",
+                    filters={
+                        "attached_to_doctype": "Sales Invoice",
+                        "attached_to_name": docname,
+                    },
+                    pluck="name",
+                )
+            )
+        ]
+
+    def test_attach_e_waybill_pdfs(self):
+        self.attach_e_waybill_pdfs(lambda *args, **kwargs: f"{args[1]} v1")
+        self.attach_e_waybill_pdfs(lambda *args, **kwargs: f"{args[1]} v2")
+
+        # existing attachment is replaced
+        for docname, e_waybill in self.invoices.items():
+            self.assertListEqual(
+                self.get_attached_pdfs(docname),
+                [(get_pdf_filename(e_waybill), f"{e_waybill} v2")],
+            )
+
+    def test_attach_e_waybill_pdfs_with_errors(self):
+        """Failure of one PDF doesn't affect others in the batch"""
+        print_error, pdf_error, attached = self.invoices
+
+        def get_print(doctype, e_waybill, *args, **kwargs):
+            if e_waybill == self.invoices[print_error]:
+                raise frappe.ValidationError("Print could not be rendered")
+
+            return e_waybill
+
+        def get_pdf(html):
+            if html == self.invoices[pdf_error]:
+                raise OSError("PDF could not be rendered")
+
+            return html.encode()
+
+        self.attach_e_waybill_pdfs(get_print, get_pdf)
+
+        for docname in (print_error, pdf_error):
+            self.assertListEqual(self.get_attached_pdfs(docname), [])
+            self.assertTrue(
+                frappe.db.exists(
+                    "Error Log",
+                    {
+                        "method": (
+                            "e-Waybill PDF could not be attached for Sales Invoice"
+                            f" {docname}"
+                        )
+                    },
+                )
+            )
+
+        self.assertListEqual(
+            self.get_attached_pdfs(attached),
+            [(get_pdf_filename(self.invoices[attached]), self.invoices[attached])],
+        )
+
+
+class TestEWaybillLogRefresh(FrappeTestCase):
+    def setUp(self):
+        self.invoices = {}
+        for is_latest_data in (1, 0, 0):
+            invoice = create_sales_invoice()
+            e_waybill = str(random.randint(10**11, 10**12 - 1))
+            invoice.db_set("ewaybill", e_waybill)
+            self.invoices[invoice.name] = e_waybill
+
+            frappe.get_doc(
+                {
+                    "doctype": "e-Waybill Log",
+                    "e_waybill_number": e_waybill,
+                    "reference_doctype": "Sales Invoice",
+                    "reference_name": invoice.name,
+                    "is_latest_data": is_latest_data,
+                }
+            ).insert()
+
+    def test_stale_logs_are_refreshed(self):
+        latest, refreshed, failed = self.invoices
+
+        def get_e_waybill(e_waybill):
+            if e_waybill == self.invoices[failed]:
+                raise frappe.ValidationError("e-Waybill could not be fetched")
+
+            return {"ewbNo": e_waybill}
+
+        with patch(
+            "india_compliance.gst_india.utils.e_waybill.EWaybillAPI"
+        ) as e_waybill_api:
+            e_waybill_api.return_value.get_e_waybill.side_effect = get_e_waybill
+            result = get_valid_and_invalid_e_waybill_log(
+                "Sales Invoice", list(self.invoices)
+            )
+
+        # log with latest data is not fetched again
+        self.assertEqual(e_waybill_api.return_value.get_e_waybill.call_count, 2)
+
+        self.assertListEqual(
+            result["valid_log"], [self.invoices[latest], self.invoices[refreshed]]
+        )
+        self.assertListEqual(
+            [(log["link"], log["reason"]) for log in result["invalid_log"]],
+            [
+                (
+                    f"<strong>{get_link_to_form('Sales Invoice', failed)}</strong>",
+                    "Cannot fetch latest data",
+                )
+            ],
+        )
+
+        self.assertDocumentEqual(
+            {
+                "is_latest_data": 1,
+                "data": frappe.as_json({"ewbNo": self.invoices[refreshed]}, indent=4),
+            },
+            frappe.get_doc("e-Waybill Log", self.invoices[refreshed]),
+        )
+        self.assertEqual(
+            frappe.db.get_value(
+                "e-Waybill Log", self.invoices[failed], "is_latest_data"
+            ),
+            0,
+        )
+
+        error_log = frappe.get_last_doc(
+            "Error Log",
+            filters={
+                "method": (
+                    "Latest e-Waybill data could not be fetched for Sales Invoice"
+                    f" {failed}"
+                )
+            },
+        )
+        self.assertIn("e-Waybill could not be fetched", error_log.error)
+
+
 def update_dates_for_test_data(test_data):
     """Update dates in test data"""
 
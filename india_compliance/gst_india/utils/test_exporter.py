@@ -0,0 +1,206 @@
+from unittest.mock import patch
+
+import openpyxl
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date
+
+from india_compliance.gst_india.utils.exporter import (
+    EXPORT_FIELD,
+    ExcelExporter,
+    build_export,
+    clear_export_cache,
+    delete_expired_exports,
+    enqueue_export,
+    get_export_key,
+)
+
+BUILDER = "india_compliance.gst_india.utils.test_exporter.build_test_export"
+
+
+def build_test_export(rows):
+    if not rows:
+        frappe.throw("Nothing to export")
+
+    excel = ExcelExporter()
+    excel.create_sheet(
+        sheet_name="Export",
+        headers=[{"label": "Value", "fieldname": "value", "fieldtype": "Int"}],
+        data=({"value": value} for value in range(rows)),
+    )
+
+    return excel, "Test Export"
+
+
+class TestExcelExport(FrappeTestCase):
+    def setUp(self):
+        clear_export_cache(BUILDER)
+
+    def build_export(self, scope=None, data_version=None, **kwargs):
+        key = get_export_key(BUILDER, kwargs, scope, data_version)
+
+        with patch("frappe.publish_realtime") as publish_realtime:
+            build_export(key, BUILDER, kwargs)
+
+        return publish_realtime.call_args.args[1]
+
+    def enqueue_export(self, **kwargs):
+        with patch("frappe.enqueue") as enqueue:
+            response = enqueue_export(BUILDER, **kwargs)
+
+        return response, enqueue.call_args and enqueue.call_args.kwargs["job_id"]
+
+    def test_enqueue_export(self):
+        response, job_id = self.enqueue_export(rows=2)
+        self.assertDictEqual(response, {"queued": True})
+
+        # identical request is deduplicated with the same job
+        self.assertEqual(self.enqueue_export(rows=2)[1], job_id)
+        self.assertNotEqual(self.enqueue_export(rows=3)[1], job_id)
+
+        # built export is reused till the data version changes
+        message = self.build_export(rows=2, data_version=1)
+        self.assertTrue(frappe.db.exists("File", {"file_url": message["file_url"]}))
+        self.assertTupleEqual(
+            self.enqueue_export(rows=2, data_version=1),
+            ({"file_url": message["file_url"]}, None),
+        )
+        self.assertDictEqual(
+            self.enqueue_export(rows=2, data_version=2)[0], {"queued": True}
+        )
+
+    def test_clear_export_cache(self):
+        file_urls = {
+            scope: self.build_export(scope=scope, rows=2)["file_url"]
+            for scope in ("first", "second")
+        }
+
+        clear_export_cache(BUILDER, "first")
+        self.assertDictEqual(
+            self.enqueue_export(scope="first", rows=2)[0], {"queued": True}
+        )
+        self.assertDictEqual(
+            self.enqueue_export(scope="second", rows=2)[0],
+            {"file_url": file_urls["second"]},
+        )
+
+    def test_build_export_error(self):
+        error_logs = frappe.db.count("Error Log")
+
+        self.assertDictEqual(self.build_export(rows=0), {"error": True})
+        self.assertEqual(frappe.db.count("Error Log"), error_logs + 1)
+
+        # failed export is not reused
+        self.assertDictEqual(self.enqueue_export(rows=0)[0], {"queued": True})
+
+    def test_delete_expired_exports(self):
+        expired = self.build_export(rows=2)["file_url"]
+        current = self.build_export(rows=3)["file_url"]
+
+        frappe.db.set_value(
+            "File",
+            {"file_url": expired, "attached_to_field": EXPORT_FIELD},
+            "creation",
+            add_to_date(None, days=-2),
+            update_modified=False,
+        )
+        delete_expired_exports()
+
+        self.assertFalse(frappe.db.exists("File", {"file_url": expired}))
+        self.assertTrue(frappe.db.exists("File", {"file_url": current}))
+
+
+class TestWorksheet(FrappeTestCase):
+    HEADERS = [
+        {"label": "Bill No", "fieldname": "bill_no"},
+        {
+            "label": "Taxable Value",
+            "fieldname": "taxable_value",
+            "fieldtype": "Float",
+            "compare_with": "books_taxable_value",
+        },
+        {
+            "label": "Books Taxable Value",
+            "fieldname": "books_taxable_value",
+            "fieldtype": "Float",
+        },
+    ]
+
+    def get_sheet(self, data, **kwargs):
+        """Build worksheet and read it back from the saved workbook"""
+        excel = ExcelExporter()
+        excel.create_sheet(
+            sheet_name="Export",
+            filters={"Company": "_Test Indian Registered Company"},
+            merged_headers={"Values": ["taxable_value", "books_taxable_value"]},
+            headers=self.HEADERS,
+            data=data,
+            **kwargs,
+        )
+
+        return openpyxl.load_workbook(excel.save_workbook())["Export"]
+
+    def get_values(self, sheet):
+        return [list(row) for row in sheet.iter_rows(values_only=True)]
+
+    def test_worksheet(self):
+        sheet = self.get_sheet(
+            {
+                "bill_no": f"BILL-{i}",
+                "taxable_value": i * 100,
+                "books_taxable_value": 100,
+            }
+            for i in range(1, 4)
+        )
+
+        self.assertListEqual(
+            self.get_values(sheet),
+            [
+                ["Company", "_Test Indian Registered Company", None],
+                [None, "Values", None],
+                ["Bill No", "Taxable Value", "Books Taxable Value"],
+                ["BILL-1", 100, 100],
+                ["BILL-2", 200, 100],
+                ["BILL-3", 300, 100],
+                ["Totals", "=SUM(B4:B6)", "=SUM(C4:C6)"],
+            ],
+        )
+        self.assertListEqual([str(cells) for cells in sheet.merged_cells], ["B2:C2"])
+
+        # data rows are compared, but not totals
+        self.assertListEqual(
+            [
+                (str(formatting.sqref), [rule.formula for rule in formatting.rules])
+                for formatting in sheet.conditional_formatting
+            ],
+            [("B4:B6", [["IF(ISBLANK(B4), FALSE, B4<>C4)"]])],
+        )
+
+        self.assertEqual(sheet["B3"].font.b, True)
+        self.assertEqual(sheet["A4"].fill.fgColor.rgb, "00f2f2f2")
+        self.assertEqual(sheet.column_dimensions["B"].width, 20)
+
+    def test_worksheet_without_totals(self):
+        rows = [["BILL-1", 100, 200], ["BILL-2", 200, 200]]
+        sheet = self.get_sheet(rows, add_totals=False)
+
+        self.assertListEqual(self.get_values(sheet)[3:], rows)
+        self.assertListEqual(
+            [str(formatting.sqref) for formatting in sheet.conditional_formatting],
+            ["B4:B5"],
+        )
+
+    def test_worksheet_with_empty_data(self):
+        for data in ([], (row for row in ())):
+            sheet = self.get_sheet(data)
+
+            # totals are not formulas without data rows
+            self.assertListEqual(
+                self.get_values(sheet)[2:],
+                [
+                    ["Bill No", "Taxable Value", "Books Taxable Value"],
+                    ["Totals", None, None],
+                ],
+            )
+            self.assertListEqual(list(sheet.conditional_formatting), [])
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from india_compliance.gst_india.utils import jinja
+from india_compliance.gst_india.utils.jinja import get_ewaybill_barcode, get_qr_code
+
+
+class TestCachedImage(FrappeTestCase):
+    def test_get_qr_code(self):
+        qr_text = random_string(20)
+
+        with patch.object(
+            jinja.pyqrcode, "create", wraps=jinja.pyqrcode.create
+        ) as create:
+            image = get_qr_code(qr_text)
+            self.assertEqual(get_qr_code(qr_text), image)
+            create.assert_called_once_with(qr_text)
+
+            # image is cached for each scale
+            self.assertNotEqual(get_qr_code(qr_text, scale=2), image)
+            self.assertEqual(create.call_count, 2)
+
+    def test_get_ewaybill_barcode(self):
+        ewaybill = random_string(12)
+
+        with patch.object(
+            jinja, "_get_ewaybill_barcode", wraps=jinja._get_ewaybill_barcode
+        ) as generate:
+            image = get_ewaybill_barcode(ewaybill)
+            self.assertEqual(get_ewaybill_barcode(ewaybill), image)
+            generate.assert_called_once_with(ewaybill)
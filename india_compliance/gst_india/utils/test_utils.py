@@ -0,0 +1,59 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from india_compliance.gst_india.utils import (
+    clear_gstin_party_cache,
+    get_gstin_party_cache_key,
+    get_parties_for_gstins,
+    get_party_for_gstin,
+)
+
+
+class TestGetPartiesForGSTINs(FrappeTestCase):
+    def setUp(self):
+        clear_gstin_party_cache()
+
+    def test_get_parties_for_gstins(self):
+        gstins = ("24AABCR6898M1ZN", "24AAUPV7468F1ZW", None)
+        expected = {"24AABCR6898M1ZN": "_Test Registered Supplier"}
+
+        self.assertDictEqual(get_parties_for_gstins(gstins), expected)
+
+        # from cache
+        self.assertDictEqual(get_parties_for_gstins(gstins), expected)
+        self.assertIsNone(get_party_for_gstin("24AAUPV7468F1ZW"))
+
+    def test_get_party_for_gstin(self):
+        self.assertEqual(
+            get_party_for_gstin("24AABCR6898M1ZN"), "_Test Registered Supplier"
+        )
+        self.assertEqual(
+            get_party_for_gstin("24AABCR6898M1ZN"), "_Test Registered Supplier"
+        )
+
+    def test_cache_expiry(self):
+        get_parties_for_gstins(("24AABCR6898M1ZN",))
+        self.assertGreater(
+            frappe.cache.ttl(
+                frappe.cache.make_key(get_gstin_party_cache_key("Supplier"))
+            ),
+            0,
+        )
+
+    def test_cache_is_cleared_on_rename(self):
+        supplier = frappe.get_doc(
+            {
+                "doctype": "Supplier",
+                "supplier_name": "_Test Supplier for GSTIN Cache",
+                "gst_category": "Unregistered",
+            }
+        ).insert()
+
+        get_parties_for_gstins(("24AABCR6898M1ZN",))
+        frappe.rename_doc(
+            "Supplier", supplier.name, "_Test Renamed Supplier for GSTIN Cache"
+        )
+
+        self.assertDictEqual(
+            frappe.cache.hgetall(get_gstin_party_cache_key("Supplier")), {}
+        )
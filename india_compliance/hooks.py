@@ -75,20 +75,31 @@ doc_events = {
             "india_compliance.gst_india.overrides.address.validate",
             "india_compliance.gst_india.overrides.party.set_docs_with_previous_gstin",
         ],
+        "on_change": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "on_trash": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "after_rename": "india_compliance.gst_india.overrides.party.clear_party_cache",
     },
     "Company": {
-        "on_trash": "india_compliance.gst_india.overrides.company.delete_gst_settings_for_company",
+        "on_trash": [
+            "india_compliance.gst_india.overrides.company.delete_gst_settings_for_company",
+            "india_compliance.gst_india.overrides.party.clear_party_cache",
+        ],
         "on_update": [
             "india_compliance.income_tax_india.overrides.company.make_company_fixtures",
             "india_compliance.gst_india.overrides.company.make_company_fixtures",
         ],
         "validate": "india_compliance.gst_india.overrides.party.validate_party",
+        "on_change": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "after_rename": "india_compliance.gst_india.overrides.party.clear_party_cache",
     },
     "Customer": {
         "validate": "india_compliance.gst_india.overrides.party.validate_party",
         "after_insert": (
             "india_compliance.gst_india.overrides.party.create_primary_address"
         ),
+        "on_change": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "on_trash": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "after_rename": "india_compliance.gst_india.overrides.party.clear_party_cache",
     },
     "Delivery Note": {
         "onload": "india_compliance.gst_india.overrides.delivery_note.onload",
@@ -163,11 +174,15 @@ doc_events = {
         "validate": "india_compliance.gst_india.overrides.sales_invoice.validate",
         "before_save": "india_compliance.gst_india.overrides.transaction.update_gst_details",
         "before_submit": "india_compliance.gst_india.overrides.transaction.update_gst_details",
-        "on_submit": "india_compliance.gst_india.overrides.sales_invoice.on_submit",
+        "on_submit": [
+            "india_compliance.gst_india.overrides.sales_invoice.on_submit",
+            "india_compliance.gst_india.doctype.gst_period_summary.gst_period_summary.update_gst_period_summary",
+        ],
         "on_update_after_submit": (
             "india_compliance.gst_india.overrides.sales_invoice.on_update_after_submit"
         ),
         "before_cancel": "india_compliance.gst_india.overrides.sales_invoice.before_cancel",
+        "on_cancel": "india_compliance.gst_india.doctype.gst_period_summary.gst_period_summary.update_gst_period_summary",
         "after_mapping": "india_compliance.gst_india.overrides.transaction.after_mapping",
     },
     "Sales Order": {
@@ -185,6 +200,9 @@ doc_events = {
         "after_insert": (
             "india_compliance.gst_india.overrides.party.create_primary_address"
         ),
+        "on_change": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "on_trash": "india_compliance.gst_india.overrides.party.clear_party_cache",
+        "after_rename": "india_compliance.gst_india.overrides.party.clear_party_cache",
     },
     "Tax Category": {
         "validate": "india_compliance.gst_india.overrides.tax_category.validate"
@@ -347,7 +365,11 @@ scheduler_events = {
             "india_compliance.gst_india.utils.e_invoice.retry_e_invoice_generation",
             "india_compliance.gst_india.utils.gstr.download_queued_request",
         ],
-    }
+    },
+    "daily": [
+        "india_compliance.gst_india.doctype.gstin.gstin.refresh_stale_gstin_status",
+        "india_compliance.gst_india.utils.exporter.delete_expired_exports",
+    ],
 }
 
 
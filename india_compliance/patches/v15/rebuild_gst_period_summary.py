@@ -0,0 +1,15 @@
+import frappe
+
+
+def execute():
+    # all submitted invoices are read, so rebuilt in background for each company
+    for company in frappe.get_all(
+        "Company", filters={"country": "India"}, pluck="name"
+    ):
+        frappe.enqueue(
+            "india_compliance.gst_india.doctype.gst_period_summary.gst_period_summary.rebuild_gst_period_summary",
+            queue="long",
+            timeout=60 * 60,
+            enqueue_after_commit=True,
+            company=company,
+        )
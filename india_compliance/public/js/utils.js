@@ -264,6 +264,38 @@ Object.assign(india_compliance, {
         }, 0);
     },
 
+    async export_excel(method, args) {
+        // excel is built in background, user is notified when it's ready
+        if (!this._export_listener_set) {
+            frappe.realtime.on("excel_export", message => {
+                if (message.error) {
+                    frappe.msgprint({
+                        message: __("Excel export failed. Please check Error Log."),
+                        indicator: "red",
+                    });
+                    return;
+                }
+
+                frappe.msgprint({
+                    title: __("Export Ready"),
+                    message: __("Your file is ready: {0}", [
+                        `<a href="${message.file_url}" target="_blank">${message.file_name}</a>`,
+                    ]),
+                    indicator: "green",
+                });
+            });
+            this._export_listener_set = true;
+        }
+
+        const { message } = await frappe.call({ method, args });
+        if (message?.file_url) return window.open(message.file_url);
+
+        frappe.show_alert({
+            message: __("Export started. You will be notified when the file is ready."),
+            indicator: "blue",
+        });
+    },
+
     set_last_month_as_default_period(report) {
         report.filters.forEach(filter => {
             if (filter.fieldname === "from_date") {